@@ -0,0 +1,171 @@
+"""
+Micro-benchmark: destination catalog backends.
+
+Writes a synthetic catalog as destinations.json, converts it with
+services.catalog_store, and loads a DestinationSnapshot from each backend
+in a fresh subprocess (so RSS is per backend). Reports load time, RSS
+added by the load, id/name/tag lookups, building the derived indexes the
+app keeps per catalog (chat intents, planner filter), and the first scoring
+pass, which reads every destination. RSS columns are cumulative.
+
+Usage (from backend/):
+    python benchmarks/bench_catalog.py
+    python benchmarks/bench_catalog.py --sizes 10000,200000 --keep /tmp/catalogs
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.catalog_store import convert_json_catalog  # noqa: E402
+
+logging.getLogger("tripit").setLevel(logging.WARNING)
+
+TAGS = [f"tag-{i}" for i in range(60)] + ["beach", "mountains", "adventure", "culture", "food", "nature"]
+ACTIVITIES = [f"activity-{i}" for i in range(400)]
+BEST_FOR = ["couples", "friends", "solo", "family", "adventure", "honeymoon", "photography", "spiritual"]
+
+
+def make_catalog(size: int, rng: random.Random):
+    return [
+        {
+            "id": f"dest-{i}",
+            "name": f"Destination {i}",
+            "country": "India",
+            "image": f"https://images.example.com/{i}.jpg",
+            "tags": rng.sample(TAGS, rng.randint(2, 5)),
+            "base_cost_per_day": rng.randrange(1500, 15000, 250),
+            "description": " ".join(rng.sample(ACTIVITIES, 12)),
+            "best_for": rng.sample(BEST_FOR, rng.randint(1, 3)),
+            "activities": rng.sample(ACTIVITIES, rng.randint(3, 6)),
+        }
+        for i in range(size)
+    ]
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def measure(backend: str, path: str) -> dict:
+    """Runs in the child process: load one backend and time a few lookups."""
+    from services.catalog_store import SQLiteCatalog
+    from services.chat_intents import IntentIndex
+    from services.destination_cache import DestinationSnapshot
+    from services.destination_filter import DestinationFilterIndex
+    from services.scoring import score_destinations
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    if backend == "sqlite":
+        destinations = SQLiteCatalog(path)
+    else:
+        with open(path, "rb") as f:
+            destinations = json.loads(f.read())
+    snapshot = DestinationSnapshot(destinations, version=1)
+    load_ms = (time.perf_counter() - start) * 1000
+    rss_loaded = rss_mb()
+
+    rng = random.Random(1)
+    ids = [f"dest-{rng.randrange(len(destinations))}" for _ in range(2000)]
+    start = time.perf_counter()
+    for dest_id in ids:
+        snapshot.get(dest_id)
+    get_us = (time.perf_counter() - start) * 1e6 / len(ids)
+
+    names = [f"Destination {rng.randrange(len(destinations))}" for _ in range(2000)]
+    start = time.perf_counter()
+    for name in names:
+        snapshot.find(name)
+    find_us = (time.perf_counter() - start) * 1e6 / len(names)
+
+    start = time.perf_counter()
+    tagged = snapshot.with_tag("beach")
+    cheap = snapshot.in_cost_range(max_cost=2000)
+    query_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    IntentIndex(snapshot.directory(), {})
+    DestinationFilterIndex(destinations).query("domestic", "beach", "budget")
+    indexes_ms = (time.perf_counter() - start) * 1000
+    rss_indexes = rss_mb()
+
+    start = time.perf_counter()
+    score_destinations(destinations, budget=50000, days=5, travel_type="Couples", interest="Beach", limit=5)
+    score_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "load_ms": load_ms,
+        "rss_mb": rss_loaded - rss_before,
+        "get_us": get_us,
+        "find_us": find_us,
+        "query_ms": query_ms,
+        "query_rows": len(tagged) + len(cheap),
+        "indexes_ms": indexes_ms,
+        "rss_indexes_mb": rss_indexes - rss_before,
+        "score_ms": score_ms,
+        "rss_scored_mb": rss_mb() - rss_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--keep", help="Directory to write the generated catalogs to (default: a temp dir)")
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    rng = random.Random(args.seed)
+    workdir = args.keep or tempfile.mkdtemp()
+    os.makedirs(workdir, exist_ok=True)
+
+    print(
+        f"{'destinations':>12} {'backend':>8} {'file MB':>8} {'convert s':>10} {'load ms':>9} {'RSS MB':>7}"
+        f" {'get us':>7} {'find us':>8} {'query ms':>9} {'indexes ms':>11} {'RSS MB':>7}"
+        f" {'1st score ms':>13} {'RSS MB':>7}"
+    )
+    for size in (int(value) for value in args.sizes.split(",")):
+        json_path = os.path.join(workdir, f"destinations-{size}.json")
+        db_path = os.path.join(workdir, f"destinations-{size}.db")
+        with open(json_path, "w") as f:
+            json.dump(make_catalog(size, rng), f)
+        start = time.perf_counter()
+        convert_json_catalog(json_path, db_path)
+        convert_s = time.perf_counter() - start
+
+        for backend, path in (("json", json_path), ("sqlite", db_path)):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", backend, path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{size:>12} {backend:>8} {os.path.getsize(path) / 1e6:>8.1f}"
+                f" {convert_s if backend == 'sqlite' else 0:>10.2f} {result['load_ms']:>9.1f} {result['rss_mb']:>7.1f}"
+                f" {result['get_us']:>7.1f} {result['find_us']:>8.1f} {result['query_ms']:>9.2f}"
+                f" {result['indexes_ms']:>11.1f} {result['rss_indexes_mb']:>7.1f}"
+                f" {result['score_ms']:>13.1f} {result['rss_scored_mb']:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark: JSON extraction from LLM completions.
+
+Compares the linear extractor in services.json_extract with the previous
+greedy-regex clean_json_response on realistic 1-10 KB completions, both on
+its own and end to end (extract + json.loads against load_json, which
+parses a clean completion once).
+
+Usage (from backend/):
+    python benchmarks/bench_json_extract.py
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.json_extract import extract_json, load_json  # noqa: E402
+
+
+def legacy_clean_json_response(content: str) -> str:
+    """The regex-based extractor this benchmark compares against."""
+    content = content.strip()
+    if content.startswith("```"):
+        lines = content.split("\n")[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        content = "\n".join(lines)
+    json_match = re.search(r'(\{.*\}|\[.*\])', content, re.DOTALL)
+    if json_match:
+        content = json_match.group(1)
+    return content.strip()
+
+
+def make_itinerary(days: int) -> str:
+    """A completion shaped like a real itinerary response."""
+    return json.dumps({
+        "day_plans": [
+            {
+                "day": day,
+                "title": f"Day {day} - Exploring the old town and {{local}} markets",
+                "activities": [
+                    "Morning: Sunrise walk along the \"ghats\"",
+                    "Afternoon: Heritage tour of the fort, then lunch",
+                    "Evening: Street-food crawl near the clock tower",
+                ],
+                "meals": ["Poha at a local stall", "Thali at a family-run dhaba", "Dinner at a rooftop cafe"],
+                "accommodation": "Boutique haveli near the main bazaar",
+                "estimated_cost": 4500 + day * 100,
+                "tips": "Carry cash; many small vendors don't take cards.",
+            }
+            for day in range(1, days + 1)
+        ],
+        "travel_tips": ["Book trains early", "Respect dress codes", "Stay hydrated"],
+        "cost_breakdown": {"accommodation": 20000, "food": 9000, "activities": 6000, "transport": 4000},
+    }, indent=2)
+
+
+def make_cases():
+    cases = {}
+    for days in (3, 7, 14):
+        body = make_itinerary(days)
+        cases[f"clean {len(body) // 1024 + 1}KB"] = body
+        cases[f"fenced+prose {len(body) // 1024 + 1}KB"] = (
+            "Sure! Here's your plan {as requested}:\n```json\n" + body + "\n```\nEnjoy {your} trip!"
+        )
+        cases[f"truncated {len(body) // 1024 + 1}KB"] = body[: len(body) * 2 // 3]
+        cases[f"trailing comma {len(body) // 1024 + 1}KB"] = body.replace("]", ",]")
+        cases[f"commas in text {len(body) // 1024 + 1}KB"] = "Plan {draft}:\n" + body.replace("cash;", "cash, ]")
+    # Worst case for the greedy regex: many openers and no closer
+    cases["unclosed braces 8KB"] = "Note {" * 1365
+    return cases
+
+
+def legacy_load(content: str):
+    try:
+        return json.loads(legacy_clean_json_response(content))
+    except json.JSONDecodeError:
+        return None
+
+
+def try_load_json(content: str):
+    try:
+        return load_json(content)[0]
+    except json.JSONDecodeError:
+        return None
+
+
+def main(number: int = 50):
+    print(
+        f"{'case':<24}{'bytes':>8}{'legacy us':>12}{'linear us':>12}"
+        f"{'legacy+parse us':>17}{'load_json us':>14}{'legacy ok':>11}{'linear ok':>11}"
+    )
+    for name, content in make_cases().items():
+        legacy_us = timeit.timeit(lambda: legacy_clean_json_response(content), number=number) / number * 1e6
+        linear_us = timeit.timeit(lambda: extract_json(content), number=number) / number * 1e6
+        legacy_parse_us = timeit.timeit(lambda: legacy_load(content), number=number) / number * 1e6
+        load_us = timeit.timeit(lambda: try_load_json(content), number=number) / number * 1e6
+
+        print(
+            f"{name:<24}{len(content):>8}{legacy_us:>12.1f}{linear_us:>12.1f}{legacy_parse_us:>17.1f}{load_us:>14.1f}"
+            f"{str(legacy_load(content) is not None):>11}{str(try_load_json(content) is not None):>11}"
+        )
+
+if __name__ == "__main__":
+    main()
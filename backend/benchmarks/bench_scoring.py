@@ -0,0 +1,171 @@
+"""
+Micro-benchmark: destination scoring.
+
+Compares the vectorized scorer in services.scoring (compiled bitmask index
++ top-k partition) and its batch form (all queries in one matrix pass) with
+the previous per-destination loop on synthetic catalogs of 50 to 100k
+destinations, and checks that all of them produce the same ranking and scores.
+
+Usage (from backend/):
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --sizes 50,1000,100000 --limit 3
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.scoring import (  # noqa: E402
+    INTEREST_TAGS,
+    TRAVEL_TYPE_TAGS,
+    get_scoring_index,
+    score_destinations,
+    score_destinations_batch
+)
+
+logging.getLogger("tripit").setLevel(logging.WARNING)
+
+
+def legacy_score_destinations(
+    destinations: List[Dict[str, Any]],
+    budget: int,
+    days: int,
+    travel_type: str,
+    interest: str
+) -> List[Dict[str, Any]]:
+    """The loop-based scorer this benchmark compares against."""
+    scored = []
+    daily_budget = budget / days
+    travel_type_lower = travel_type.lower()
+    interest_lower = interest.lower()
+    user_type_tags = TRAVEL_TYPE_TAGS.get(travel_type_lower, set())
+    user_interest_tags = INTEREST_TAGS.get(interest_lower, set())
+
+    for dest in destinations:
+        score = 0.0
+        dest_tags = set(tag.lower() for tag in dest.get("tags", []))
+        dest_best_for = set(bf.lower() for bf in dest.get("best_for", []))
+        base_cost = dest.get("base_cost_per_day", 3000)
+
+        interest_overlap = len(dest_tags.intersection(user_interest_tags))
+        if interest_overlap > 0:
+            score += min(40, interest_overlap * 20)
+        if interest_lower in dest_tags:
+            score += 15
+        type_overlap = len(dest_tags.intersection(user_type_tags))
+        if type_overlap > 0:
+            score += min(35, type_overlap * 15)
+        if travel_type_lower in dest_best_for:
+            score += 10
+
+        if base_cost <= daily_budget:
+            ratio = base_cost / daily_budget
+            if 0.5 <= ratio <= 0.8:
+                score += 25
+            elif ratio < 0.5:
+                score += 15
+            else:
+                score += 20
+        else:
+            over_ratio = base_cost / daily_budget
+            if over_ratio <= 1.2:
+                score += 5
+
+        score = max(0, min(100, score))
+        scored.append({**dest, "score": round(score, 1)})
+
+    scored.sort(key=lambda x: x["score"], reverse=True)
+    return scored
+
+
+TAG_POOL = sorted(set().union(*TRAVEL_TYPE_TAGS.values(), *INTEREST_TAGS.values(), {"budget", "luxury", "offbeat"}))
+BEST_FOR_POOL = ["couples", "friends", "solo", "family", "adventure", "romantic", "spiritual", "culture"]
+
+
+def make_catalog(size: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"dest-{i}",
+            "name": f"Destination {i}",
+            "tags": rng.sample(TAG_POOL, rng.randint(2, 6)),
+            "best_for": rng.sample(BEST_FOR_POOL, rng.randint(1, 3)),
+            "base_cost_per_day": rng.randrange(1500, 15000, 250),
+        }
+        for i in range(size)
+    ]
+
+
+def make_queries(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "budget": rng.choice([10000, 25000, 50000, 100000, 250000]),
+            "days": rng.randint(1, 14),
+            "travel_type": rng.choice(list(TRAVEL_TYPE_TAGS) + ["Unknown"]),
+            "interest": rng.choice(list(INTEREST_TAGS) + ["wildlife", "Beach"]),
+        }
+        for _ in range(count)
+    ]
+
+
+def per_call_ms(fn, queries: List[Dict[str, Any]], min_seconds: float = 0.3) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for query in queries:
+            fn(**query)
+        calls += len(queries)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="50,1000,10000,100000")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'destinations':>12} {'compile ms':>11} {'legacy ms':>10} {'vector ms':>10} {'batch ms':>9} {'speedup':>8}  parity")
+    for size in (int(value) for value in args.sizes.split(",")):
+        catalog = make_catalog(size, rng)
+        queries = make_queries(20, rng)
+
+        start = time.perf_counter()
+        get_scoring_index(catalog)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # Full ranking must match the legacy order and scores exactly
+        parity = all(
+            [(d["id"], d["score"]) for d in score_destinations(catalog, **query)]
+            == [(d["id"], d["score"]) for d in legacy_score_destinations(catalog, **query)]
+            for query in queries
+        )
+        parity = parity and all(
+            [d["id"] for d in score_destinations(catalog, **query, limit=args.limit)]
+            == [d["id"] for d in legacy_score_destinations(catalog, **query)[:args.limit]]
+            for query in queries
+        )
+        parity = parity and score_destinations_batch(catalog, queries, limit=args.limit) == [
+            score_destinations(catalog, **query, limit=args.limit) for query in queries
+        ]
+
+        legacy = per_call_ms(lambda **q: legacy_score_destinations(catalog, **q)[:args.limit], queries)
+        vector = per_call_ms(lambda **q: score_destinations(catalog, **q, limit=args.limit), queries)
+        # Per query, all 20 queries scored in one call
+        batch = per_call_ms(lambda: score_destinations_batch(catalog, queries, limit=args.limit), [{}]) / len(queries)
+        print(
+            f"{size:>12} {compile_ms:>11.2f} {legacy:>10.3f} {vector:>10.3f} {batch:>9.3f} {legacy / vector:>7.1f}x"
+            f"  {'ok' if parity else 'MISMATCH'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: similar-destinations index.
+
+Builds services.similarity.SimilarityIndex over synthetic catalogs and
+reports build time (including precomputed neighbours below the precompute
+limit), the first lookup of a destination and repeat lookups.
+
+Usage (from backend/):
+    python benchmarks/bench_similarity.py
+    python benchmarks/bench_similarity.py --sizes 1000,50000 --precompute-limit 2000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.similarity import SimilarityIndex  # noqa: E402
+
+logging.getLogger("tripit").setLevel(logging.WARNING)
+
+TAGS = [f"tag-{i}" for i in range(60)]
+ACTIVITIES = [f"activity-{i}" for i in range(400)]
+BEST_FOR = ["couples", "friends", "solo", "family", "adventure", "honeymoon", "photography", "spiritual"]
+
+
+def make_catalog(size: int, rng: random.Random):
+    return [
+        {
+            "id": f"dest-{i}",
+            "tags": rng.sample(TAGS, rng.randint(2, 5)),
+            "activities": rng.sample(ACTIVITIES, rng.randint(3, 6)),
+            "best_for": rng.sample(BEST_FOR, rng.randint(1, 3)),
+            "base_cost_per_day": rng.randrange(1500, 15000, 250),
+        }
+        for i in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,5000,20000,50000")
+    parser.add_argument("--precompute-limit", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'destinations':>12} {'build ms':>10} {'first lookup ms':>16} {'repeat lookup us':>17}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        catalog = make_catalog(size, rng)
+        start = time.perf_counter()
+        index = SimilarityIndex(catalog, precompute_limit=args.precompute_limit)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        ids = [dest["id"] for dest in rng.sample(catalog, min(50, size))]
+        start = time.perf_counter()
+        for dest_id in ids:
+            index.similar(dest_id)
+        first_ms = (time.perf_counter() - start) * 1000 / len(ids)
+
+        repeats = 20
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for dest_id in ids:
+                index.similar(dest_id)
+        repeat_us = (time.perf_counter() - start) * 1e6 / (repeats * len(ids))
+        print(f"{size:>12} {build_ms:>10.1f} {first_ms:>16.3f} {repeat_us:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Load test: end-to-end latency and throughput for the public API routes.
+
+Drives /recommendations, /itinerary/generate, /chat, /suggestions and
+/destinations with closed-loop workers through one or more concurrency
+stages. By default the app runs in-process (ASGI, lifespan included) with
+the Groq client wired to benchmarks/mock_groq.py and Supabase replaced by
+an in-memory store, so no network or tokens are used. Reports throughput,
+p50/p95/p99 latency per route, event-loop lag and RSS, and writes the
+results as JSON for comparison between commits.
+
+Usage (from backend/):
+    python benchmarks/load_test.py --profile smoke
+    python benchmarks/load_test.py --profile ramp --llm-rpm-limit 0 --llm-tpm-limit 0
+    python benchmarks/load_test.py --profile spike --llm-latency-ms 800 --llm-rate-limit-rate 0.05
+    python benchmarks/load_test.py --concurrency 64 --duration 20 --routes chat,destinations
+    python benchmarks/load_test.py --profile steady --compare benchmarks/results/<baseline>.json
+
+    # Against a running server (client-side loop lag / memory only):
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --token <supabase jwt>
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Stages of (concurrency, duration_seconds)
+PROFILES: Dict[str, List[Tuple[int, float]]] = {
+    "smoke": [(4, 5)],
+    "steady": [(32, 30)],
+    "ramp": [(8, 10), (32, 10), (128, 10)],
+    "spike": [(8, 10), (256, 10), (8, 10)],
+}
+
+DESTINATIONS = ["Goa", "Manali", "Jaipur", "Kerala", "Rishikesh", "Ladakh", "Udaipur", "Varanasi"]
+TRAVEL_TYPES = ["adventure", "relaxation", "culture", "romantic", "family", "spiritual"]
+INTERESTS = ["mountains", "beach", "heritage", "nature", "spiritual", "city"]
+CHAT_MESSAGES = [
+    "What is the best time to visit Goa?",
+    "How much does a trip to Manali cost per day?",
+    "Is my payment information secure?",
+    "Plan me something fun for a rainy weekend with friends",
+    "Which is better for a honeymoon in December, Udaipur or Kerala?",
+    "Tell me about offbeat places near Rishikesh for a solo traveler",
+]
+SUGGESTION_VALUES = {
+    "tripType": ["spiritual", "adventure", "relaxation", "cultural"],
+    "terrain": ["mountain", "beach", "city", "countryside"],
+    "budget": ["budget", "moderate", "luxury"],
+    "duration": ["weekend", "week", "twoweeks"],
+    "locationPref": ["domestic", "nearby", "international"],
+}
+
+
+def _recommendations(rng: random.Random) -> Tuple[str, str, Optional[Dict]]:
+    return "POST", "/api/v1/recommendations", {
+        "budget": rng.choice([15000, 30000, 60000, 120000]),
+        "days": rng.randint(2, 10),
+        "travel_type": rng.choice(TRAVEL_TYPES),
+        "interest": rng.choice(INTERESTS),
+    }
+
+
+def _itinerary(rng: random.Random) -> Tuple[str, str, Optional[Dict]]:
+    return "POST", "/api/v1/itinerary/generate", {
+        "destination": rng.choice(DESTINATIONS),
+        "days": rng.randint(2, 8),
+        "budget": rng.choice([20000, 40000, 80000]),
+        "travel_type": rng.choice(TRAVEL_TYPES),
+        "interest": rng.choice(INTERESTS),
+        "travelers": rng.randint(1, 4),
+    }
+
+
+def _chat(rng: random.Random) -> Tuple[str, str, Optional[Dict]]:
+    return "POST", "/api/v1/chat", {"message": rng.choice(CHAT_MESSAGES)}
+
+
+def _suggestions(rng: random.Random) -> Tuple[str, str, Optional[Dict]]:
+    body = {field: rng.choice(values) for field, values in SUGGESTION_VALUES.items() if rng.random() < 0.6}
+    if rng.random() < 0.1:
+        body["specificLocation"] = rng.choice(DESTINATIONS)
+    return "POST", "/api/v1/suggestions", body
+
+
+def _destinations(rng: random.Random) -> Tuple[str, str, Optional[Dict]]:
+    return "GET", "/api/v1/destinations", None
+
+
+# route -> (weight, request factory)
+ROUTES: Dict[str, Tuple[float, Callable[[random.Random], Tuple[str, str, Optional[Dict]]]]] = {
+    "recommendations": (3, _recommendations),
+    "itinerary": (1, _itinerary),
+    "chat": (3, _chat),
+    "suggestions": (2, _suggestions),
+    "destinations": (3, _destinations),
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 2)
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(max(latencies, default=0.0), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+    }
+
+
+class LoopMonitor:
+    """Samples event-loop lag (sleep overshoot) and RSS while a stage runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags_ms: List[float] = []
+        self.rss: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        samples = 0
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags_ms.append(max(0.0, (loop.time() - start - self.interval) * 1000))
+            samples += 1
+            if samples % 10 == 0:
+                self.rss.append(rss_mb())
+
+    def __enter__(self) -> "LoopMonitor":
+        self.rss.append(rss_mb())
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._task.cancel()
+        self.rss.append(rss_mb())
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "loop_lag_p50_ms": percentile(self.lags_ms, 50),
+            "loop_lag_p99_ms": percentile(self.lags_ms, 99),
+            "loop_lag_max_ms": round(max(self.lags_ms, default=0.0), 2),
+            "rss_start_mb": round(self.rss[0], 1),
+            "rss_peak_mb": round(max(self.rss), 1),
+            "rss_end_mb": round(self.rss[-1], 1),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+async def run_stage(
+    client,
+    concurrency: int,
+    duration: float,
+    routes: Dict[str, Tuple[float, Callable]],
+    seed: int
+) -> Dict[str, Any]:
+    """Run closed-loop workers for `duration` seconds and summarize."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    names = list(routes)
+    weights = [routes[name][0] for name in names]
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 10007 + worker_id)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, body = routes[name][1](rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            statuses[name][status] += 1
+
+    started = time.perf_counter()
+    with LoopMonitor() as monitor:
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    ok = sum(count for counter in statuses.values() for status, count in counter.items() if status.startswith("2"))
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests": len(all_latencies),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        "success_rate": round(ok / len(all_latencies), 4) if all_latencies else 0.0,
+        **latency_summary(all_latencies),
+        **monitor.summary(),
+        "routes": {
+            name: {
+                "requests": len(latencies[name]),
+                "throughput_rps": round(len(latencies[name]) / elapsed, 1),
+                **latency_summary(latencies[name]),
+                "status": dict(statuses[name]),
+            }
+            for name in names if latencies[name]
+        },
+    }
+
+
+def configure_in_process(args) -> None:
+    """Environment for the in-process app; must run before the app is imported."""
+    os.environ.setdefault("GROQ_API_KEY", "mock")
+    os.environ["GROQ_BASE_URL"] = "http://mock-groq"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["SUGGESTION_TABLE_PATH"] = os.path.join(tempfile.mkdtemp(), "suggestion_table.json")
+    # The scheduler's Groq tier limits otherwise dominate every LLM-backed route
+    if args.llm_rpm_limit is not None:
+        os.environ["LLM_RPM_LIMIT"] = str(args.llm_rpm_limit)
+    if args.llm_tpm_limit is not None:
+        os.environ["LLM_TPM_LIMIT"] = str(args.llm_tpm_limit)
+
+
+def install_stubs(app, mock_config) -> None:
+    """Point the Groq client at the in-process mock and replace Supabase."""
+    import httpx
+    from groq import AsyncGroq
+
+    from benchmarks.mock_groq import create_app
+    from core.security import get_current_user
+    from services import groq_client
+    from services.db_service import SupabaseService
+
+    groq_client._groq_client = AsyncGroq(
+        api_key="mock",
+        base_url="http://mock-groq",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(mock_config)), timeout=60)
+    )
+
+    store: Dict[str, Dict[str, Any]] = {}
+    SupabaseService.save_itinerary = classmethod(
+        lambda cls, itinerary_id, data, user_id: store.__setitem__(itinerary_id, {**data, "_user": user_id}) or True)
+    SupabaseService.get_itinerary = classmethod(lambda cls, itinerary_id: store.get(itinerary_id))
+    SupabaseService.get_user_itineraries = classmethod(
+        lambda cls, user_id: [data for data in store.values() if data["_user"] == user_id])
+    SupabaseService.delete_itinerary = classmethod(
+        lambda cls, itinerary_id, user_id: store.pop(itinerary_id, None) is not None)
+    app.dependency_overrides[get_current_user] = lambda: "load-test-user"
+
+
+async def run(args) -> Dict[str, Any]:
+    import httpx
+
+    stages = [(args.concurrency, args.duration)] if args.concurrency else PROFILES[args.profile]
+    routes = {name: ROUTES[name] for name in args.routes.split(",")} if args.routes else ROUTES
+    results: Dict[str, Any] = {
+        "profile": "custom" if args.concurrency else args.profile,
+        "mode": "url" if args.url else "in-process",
+        "git_commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "routes": list(routes),
+        "stages": [],
+    }
+
+    if args.url:
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=120) as client:
+            for index, (concurrency, duration) in enumerate(stages):
+                results["stages"].append(await run_stage(client, concurrency, duration, routes, args.seed + index))
+            results["health"] = (await client.get("/health")).json()
+        return results
+
+    from benchmarks.mock_groq import MockConfig
+    from core.config import get_settings
+    from main import app
+
+    logging.getLogger("tripit").setLevel(args.log_level)
+    mock_config = MockConfig(
+        latency_median_ms=args.llm_latency_ms,
+        latency_sigma=args.llm_latency_sigma,
+        error_rate=args.llm_error_rate,
+        rate_limit_rate=args.llm_rate_limit_rate,
+        malformed_rate=args.llm_malformed_rate,
+        truncate_rate=args.llm_truncate_rate,
+        seed=args.seed,
+    )
+    results["llm_mock"] = mock_config.model_dump()
+    settings = get_settings()
+    results["llm_limits"] = {"rpm": settings.LLM_RPM_LIMIT, "tpm": settings.LLM_TPM_LIMIT,
+                             "max_concurrency": settings.LLM_MAX_CONCURRENCY}
+
+    async with app.router.lifespan_context(app):
+        install_stubs(app, mock_config)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://tripit", timeout=120) as client:
+            for index, (concurrency, duration) in enumerate(stages):
+                results["stages"].append(await run_stage(client, concurrency, duration, routes, args.seed + index))
+            results["health"] = (await client.get("/health")).json()
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"\nprofile={results['profile']} mode={results['mode']} commit={results['git_commit']}")
+    for stage in results["stages"]:
+        print(
+            f"\n  concurrency={stage['concurrency']:<4} {stage['requests']} requests in {stage['duration_s']}s "
+            f"= {stage['throughput_rps']} req/s, success {stage['success_rate']:.1%}"
+        )
+        print(
+            f"  loop lag p50/p99/max {stage['loop_lag_p50_ms']}/{stage['loop_lag_p99_ms']}/{stage['loop_lag_max_ms']} ms, "
+            f"RSS {stage['rss_start_mb']} -> {stage['rss_end_mb']} MB (peak {stage['rss_peak_mb']})"
+        )
+        print(f"  {'route':<16}{'req/s':>8}{'p50':>10}{'p95':>10}{'p99':>10}  status")
+        for name, route in stage["routes"].items():
+            print(
+                f"  {name:<16}{route['throughput_rps']:>8}{route['p50_ms']:>10}{route['p95_ms']:>10}"
+                f"{route['p99_ms']:>10}  {route['status']}"
+            )
+
+
+def print_comparison(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Per-stage, per-route deltas against a previous results file."""
+    print(f"\ncompared with {baseline.get('git_commit')} ({baseline.get('timestamp')}):")
+
+    def delta(new: float, old: float) -> str:
+        return f"{(new - old) / old:+.1%}" if old else "n/a"
+
+    for stage, old_stage in zip(results["stages"], baseline.get("stages", [])):
+        print(
+            f"\n  concurrency={stage['concurrency']:<4} throughput {delta(stage['throughput_rps'], old_stage['throughput_rps'])}, "
+            f"p95 {delta(stage['p95_ms'], old_stage['p95_ms'])}, p99 {delta(stage['p99_ms'], old_stage['p99_ms'])}, "
+            f"peak RSS {delta(stage['rss_peak_mb'], old_stage['rss_peak_mb'])}"
+        )
+        for name, route in stage["routes"].items():
+            old_route = old_stage["routes"].get(name)
+            if old_route:
+                print(
+                    f"  {name:<16} req/s {delta(route['throughput_rps'], old_route['throughput_rps']):>8}"
+                    f"  p95 {delta(route['p95_ms'], old_route['p95_ms']):>8}"
+                    f"  p99 {delta(route['p99_ms'], old_route['p99_ms']):>8}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="smoke")
+    parser.add_argument("--concurrency", type=int, help="Run a single stage instead of a profile")
+    parser.add_argument("--duration", type=float, default=10, help="Stage duration with --concurrency")
+    parser.add_argument("--routes", help=f"Comma-separated subset of: {','.join(ROUTES)}")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", help="Load-test a running server instead of the in-process app")
+    parser.add_argument("--token", help="Bearer token for /itinerary/generate with --url")
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-latency-sigma", type=float, default=0.5)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--llm-malformed-rate", type=float, default=0.0)
+    parser.add_argument("--llm-truncate-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rpm-limit", type=int, help="Override LLM_RPM_LIMIT (0 = unlimited)")
+    parser.add_argument("--llm-tpm-limit", type=int, help="Override LLM_TPM_LIMIT (0 = unlimited)")
+    parser.add_argument("--log-level", default="WARNING", help="App log level for in-process runs")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<profile>-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Previous results file to diff against")
+    args = parser.parse_args()
+
+    if not args.url:
+        configure_in_process(args)
+    results = asyncio.run(run(args))
+
+    print_report(results)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(results, json.load(f))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR, f"{results['profile']}-{results['git_commit'] or 'nogit'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Offline stand-in for the Groq (OpenAI-compatible) chat completions API.
+
+Answers every TripIT prompt type with plausible content (itinerary JSON in
+the compact schema, explanation batches, suggestion arrays, chat text),
+including SSE streaming and token usage, with injectable latency, 5xx/429
+errors, hangs, malformed JSON and truncated output.
+
+Usage (from backend/):
+    python benchmarks/mock_groq.py --port 8090 --latency-median-ms 400 --rate-limit-rate 0.05
+
+    GROQ_API_KEY=mock GROQ_BASE_URL=http://127.0.0.1:8090 uvicorn main:app
+
+Fault settings can be changed at runtime with POST /mock/config (partial
+JSON body); GET /mock/stats returns request counts by kind and outcome.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+class MockConfig(BaseModel):
+    """Latency and fault injection settings."""
+    latency_median_ms: float = 300  # Time to first token (lognormal median)
+    latency_sigma: float = 0.5  # Lognormal shape; 0 = fixed latency
+    token_interval_ms: float = 2  # Delay per streamed chunk (also added to non-streamed calls)
+    chars_per_chunk: int = 12
+    error_rate: float = 0.0  # 500 responses
+    rate_limit_rate: float = 0.0  # 429 responses with retry-after
+    retry_after_seconds: float = 1
+    timeout_rate: float = 0.0  # Hang for hang_seconds before answering
+    hang_seconds: float = 60
+    malformed_rate: float = 0.0  # Broken JSON for JSON-producing prompts
+    truncate_rate: float = 0.0  # Cut output short with finish_reason "length"
+    seed: Optional[int] = None
+
+
+# ---------------------------------------------------------------------------
+# Content generation
+# ---------------------------------------------------------------------------
+
+_ACTIVITIES = [
+    "Sunrise walk through the old quarter", "Guided heritage tour", "Local market food crawl",
+    "Boat ride at sunset", "Museum visit", "Scenic viewpoint hike", "Cooking class with a local family",
+    "Temple and ghat visit", "Cycling tour of the countryside", "Evening cultural show"
+]
+_MEALS = ["Breakfast at a local cafe", "Thali lunch at a family-run dhaba", "Dinner at a rooftop restaurant"]
+_TIPS = ["Carry cash for small vendors", "Book popular sights a day ahead", "Start early to beat the crowds",
+         "Use app cabs for fair fares", "Keep a reusable water bottle"]
+
+
+def classify(messages: List[Dict[str, str]]) -> str:
+    """Identify which TripIT prompt a request came from."""
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    if "professional travel planner" in system:
+        return "itinerary"
+    if "JSON array of strings" in system:
+        return "suggestions"
+    if "mapping each destination id" in user:
+        return "explanation_batch"
+    if "friendly travel expert" in system:
+        return "explanation"
+    if system.startswith("Summarize"):
+        return "summary"
+    return "chat"
+
+
+def _itinerary(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    destination = re.search(r"itinerary for ([^.\n]+)\.", prompt)
+    destination = destination.group(1) if destination else "your destination"
+    budget_match = re.search(r"₹([\d,]+)", prompt)
+    budget = int(budget_match.group(1).replace(",", "")) if budget_match else 30000
+
+    # Repair prompts name the missing pieces: Provide ONLY: "dp" with ONLY days 2, 3; "cb" ...
+    fragment = re.search(r"Provide ONLY: ([^\n]*)", prompt)
+    wanted = fragment.group(1) if fragment else None
+    span = re.search(r"Create days (\d+)-(\d+)", prompt)
+    total = re.search(r"(\d+)-day itinerary", prompt)
+    if wanted is not None:
+        listed = re.search(r"ONLY days ([\d, ]+)", wanted)
+        days = [int(day) for day in listed.group(1).split(",") if day.strip()] if listed else []
+    elif span:
+        days = list(range(int(span.group(1)), int(span.group(2)) + 1))
+    else:
+        days = list(range(1, (int(total.group(1)) if total else 3) + 1))
+
+    per_day = budget // max(1, len(days))
+    result: Dict[str, Any] = {}
+    if days:
+        result["dp"] = [
+            {
+                "d": day,
+                "t": f"Day {day}: Exploring {destination}",
+                "a": rng.sample(_ACTIVITIES, 3),
+                "m": list(_MEALS),
+                "h": f"Boutique stay in central {destination}",
+                "c": per_day,
+                "tip": rng.choice(_TIPS)
+            }
+            for day in days
+        ]
+    if wanted is None or '"tt"' in wanted:
+        result["tt"] = rng.sample(_TIPS, 3)
+    if wanted is None or '"cb"' in wanted:
+        result["cb"] = {"acc": budget * 4 // 10, "food": budget * 25 // 100,
+                        "act": budget * 2 // 10, "tr": budget * 15 // 100}
+    return result
+
+
+def generate_content(kind: str, messages: List[Dict[str, str]], rng: random.Random) -> Tuple[str, bool]:
+    """Return (content, is_json) for a request kind."""
+    user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    if kind == "itinerary":
+        return json.dumps(_itinerary(user, rng), ensure_ascii=False, separators=(",", ":")), True
+    if kind == "explanation_batch":
+        ids = re.findall(r"^- ([\w-]+): (.+)$", user, re.MULTILINE)
+        return json.dumps({
+            dest_id: f"{name} fits this trip well, with easy-paced days and plenty of local food. "
+                     f"Its highlights are close together, so little of the budget goes on transfers."
+            for dest_id, name in ids
+        }, ensure_ascii=False), True
+    if kind == "suggestions":
+        return json.dumps([
+            "🏔️ Manali in May-June: paragliding and cafes, budget ₹3000/day",
+            "💡 Book stays 2 weeks ahead for up to 30% savings",
+            "🚆 Overnight trains save a hotel night on long hops"
+        ], ensure_ascii=False), True
+    if kind == "explanation":
+        return ("It matches your interests with a good mix of sights and downtime, "
+                "and daily costs sit comfortably inside your budget."), False
+    if kind == "summary":
+        return "The traveler is planning a trip in India and has shared their budget and interests.", False
+    return ("Great question! Goa is lovely from October to March, and Manali is best from March to June. "
+            "Try our Trip Planner for a personalized itinerary!"), False
+
+
+def malform(content: str, rng: random.Random) -> str:
+    """Break JSON the way models do."""
+    choice = rng.randrange(4)
+    if choice == 0:
+        return f"Sure! Here is the JSON you asked for:\n```json\n{content}\n```\nEnjoy your trip!"
+    if choice == 1:
+        return re.sub(r"\]", ",]", content, count=1)
+    if choice == 2:
+        # Drop a required field from the first object
+        return re.sub(r'"(a|t)":\[?"[^"]*"[^,]*,', "", content, count=1)
+    return "I'm sorry, I can't produce that itinerary right now."
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / 4))
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """Build the mock API (can also be mounted in-process via httpx.ASGITransport)."""
+    app = FastAPI(title="Mock Groq API")
+    state = {"config": config or MockConfig(), "stats": Counter()}
+    state["rng"] = random.Random(state["config"].seed)
+    ids = itertools.count(1)
+
+    def latency_seconds() -> float:
+        cfg: MockConfig = state["config"]
+        if cfg.latency_sigma <= 0:
+            return cfg.latency_median_ms / 1000
+        return state["rng"].lognormvariate(math.log(max(cfg.latency_median_ms, 0.001)), cfg.latency_sigma) / 1000
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        cfg: MockConfig = state["config"]
+        rng: random.Random = state["rng"]
+        body = await request.json()
+        messages = body.get("messages", [])
+        kind = classify(messages)
+        stats = state["stats"]
+        stats[f"requests:{kind}"] += 1
+
+        roll = rng.random()
+        if roll < cfg.rate_limit_rate:
+            stats["injected:429"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(cfg.retry_after_seconds)},
+                content={"error": {"message": "Rate limit reached (mock)", "type": "tokens",
+                                   "code": "rate_limit_exceeded"}}
+            )
+        roll -= cfg.rate_limit_rate
+        if roll < cfg.error_rate:
+            stats["injected:500"] += 1
+            await asyncio.sleep(latency_seconds())
+            return JSONResponse(status_code=500, content={"error": {"message": "Internal server error (mock)",
+                                                                     "type": "internal_server_error"}})
+        roll -= cfg.error_rate
+        if roll < cfg.timeout_rate:
+            stats["injected:hang"] += 1
+            await asyncio.sleep(cfg.hang_seconds)
+
+        content, is_json = generate_content(kind, messages, rng)
+        finish_reason = "stop"
+        if is_json and rng.random() < cfg.malformed_rate:
+            stats["injected:malformed"] += 1
+            content = malform(content, rng)
+        if rng.random() < cfg.truncate_rate:
+            stats["injected:truncated"] += 1
+            content = content[: len(content) * 3 // 5]
+            finish_reason = "length"
+
+        max_tokens = body.get("max_tokens")
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            stats["max_tokens_cut"] += 1
+            content = content[: max_tokens * 4]
+            finish_reason = "length"
+
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        completion_tokens = estimate_tokens(content)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        completion_id = f"chatcmpl-mock-{next(ids)}"
+        model = body.get("model", "mock-model")
+        created = int(time.time())
+        chunks = [content[i:i + cfg.chars_per_chunk] for i in range(0, len(content), cfg.chars_per_chunk)]
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency_seconds() + len(chunks) * cfg.token_interval_ms / 1000)
+            stats["completed"] += 1
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": finish_reason, "logprobs": None}],
+                "usage": usage,
+                "system_fingerprint": None,
+                "x_groq": {"id": completion_id}
+            }
+
+        async def events():
+            await asyncio.sleep(latency_seconds())
+
+            def chunk(delta: Dict[str, Any], finish: Optional[str] = None, extra: Optional[Dict] = None) -> str:
+                payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                           "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish,
+                                                        "logprobs": None}]}
+                if extra:
+                    payload.update(extra)
+                return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in chunks:
+                if cfg.token_interval_ms:
+                    await asyncio.sleep(cfg.token_interval_ms / 1000)
+                yield chunk({"content": piece})
+            yield chunk({}, finish_reason, {"x_groq": {"id": completion_id, "usage": usage}})
+            yield "data: [DONE]\n\n"
+            stats["completed"] += 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/mock/config")
+    async def get_config():
+        return state["config"]
+
+    @app.post("/mock/config")
+    async def update_config(request: Request):
+        changes = await request.json()
+        state["config"] = state["config"].model_copy(update=changes)
+        if "seed" in changes:
+            state["rng"] = random.Random(state["config"].seed)
+        return state["config"]
+
+    @app.get("/mock/stats")
+    async def get_stats():
+        return dict(state["stats"])
+
+    @app.post("/mock/reset")
+    async def reset_stats():
+        state["stats"].clear()
+        return {"reset": True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    for name, field in MockConfig.model_fields.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=type(field.default) if field.default is not None else int,
+                            default=field.default)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = MockConfig(**{name: getattr(args, name) for name in MockConfig.model_fields})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,22 @@ TripIT Configuration Management
 Centralized configuration using Pydantic Settings with validation.
 """
 
+import os
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class ModelRoute(BaseModel):
+    """Primary and fallback model for one LLM call type, with its SLO."""
+    primary: str
+    fallback: str
+    timeout_seconds: float = 15
+    slo_p95_ms: float = 5000
+    max_failure_rate: float = 0.2
+
+
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
     
@@ -21,6 +32,7 @@ class Settings(BaseSettings):
     
     # API Keys
     GROQ_API_KEY: str = ""
+    GROQ_BASE_URL: str = ""  # Override the API host, e.g. benchmarks/mock_groq.py at http://127.0.0.1:8090
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     
@@ -37,11 +49,114 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     
     # AI Settings
-    AI_MODEL: str = "llama-3.1-8b-instant"
+    AI_MODEL: str = "llama-3.1-8b-instant"  # Used for call types missing from AI_MODEL_ROUTES
     AI_MAX_RETRIES: int = 3
     AI_TEMPERATURE_STRUCTURED: float = 0.3
     AI_TEMPERATURE_CREATIVE: float = 0.7
     
+    # Model routing per call type (itinerary, chat, explanation, suggestion).
+    # The fallback model is used while the primary breaches its SLO.
+    AI_MODEL_ROUTES: Dict[str, ModelRoute] = {
+        "itinerary": ModelRoute(
+            primary="llama-3.3-70b-versatile", fallback="llama-3.1-8b-instant",
+            timeout_seconds=30, slo_p95_ms=20000
+        ),
+        "chat": ModelRoute(
+            primary="llama-3.1-8b-instant", fallback="llama-3.3-70b-versatile",
+            timeout_seconds=8, slo_p95_ms=3000
+        ),
+        "explanation": ModelRoute(
+            primary="llama-3.1-8b-instant", fallback="llama-3.3-70b-versatile",
+            timeout_seconds=6, slo_p95_ms=2500
+        ),
+        "suggestion": ModelRoute(
+            primary="llama-3.1-8b-instant", fallback="llama-3.3-70b-versatile",
+            timeout_seconds=5, slo_p95_ms=2000
+        ),
+    }
+    AI_ROUTER_WINDOW_SECONDS: float = 120
+    AI_ROUTER_MIN_SAMPLES: int = 5
+    AI_BATCH_EXPLANATIONS: bool = True  # One completion for all top-N explanations
+    ITINERARY_CHUNK_DAYS: int = 4  # Longer trips are generated as concurrent day ranges
+    # Itinerary max_tokens = BASE + PER_DAY * days (+ PER_DAY_GROUP for 3+ travelers), capped
+    ITINERARY_TOKENS_BASE: int = 200
+    ITINERARY_TOKENS_PER_DAY: int = 180
+    ITINERARY_TOKENS_PER_DAY_GROUP: int = 20
+    ITINERARY_MAX_TOKENS: int = 4000
+    
+    # LLM Scheduler (match RPM/TPM to your Groq tier; 0 disables a limit).
+    # Defaults are Groq's Developer tier for the routed models (1K RPM; 250K TPM for
+    # llama-3.1-8b-instant, the lower of the two). On the free tier set 30 / 6000: calls
+    # reserve prompt + max_tokens (~1.1k per 4-day itinerary chunk) until usage is known,
+    # so there a few concurrent itineraries already queue for refill.
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_RPM_LIMIT: int = 1000
+    LLM_TPM_LIMIT: int = 250000
+    # Max seconds a call may wait in queue before falling back (0 = wait indefinitely)
+    LLM_QUEUE_DEADLINE_ITINERARY: float = 0
+    LLM_QUEUE_DEADLINE_CHAT: float = 8.0
+    LLM_QUEUE_DEADLINE_EXPLANATION: float = 3.0
+    LLM_QUEUE_DEADLINE_SUGGESTION: float = 1.0
+    
+    # Circuit Breaker (around Groq)
+    BREAKER_ENABLED: bool = True
+    BREAKER_WINDOW_SECONDS: float = 60
+    BREAKER_MIN_CALLS: int = 5
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_SECONDS: float = 10
+    BREAKER_SLOW_CALL_RATE: float = 0.8
+    BREAKER_OPEN_SECONDS: float = 30
+    BREAKER_HALF_OPEN_CALLS: int = 1
+    
+    # Chat Sessions
+    CHAT_SESSION_STORE: str = "memory"
+    CHAT_SESSION_MAX_SESSIONS: int = 1000
+    CHAT_SESSION_TTL_SECONDS: int = 1800  # Idle time before a session is forgotten
+    CHAT_SESSION_MAX_BYTES: int = 16384
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 1200  # Prompt tokens per turn (system + summary + history)
+    CHAT_SUMMARY_MAX_TOKENS: int = 150
+    # Answer common catalog questions (best time, budget, activities, FAQ) without the LLM
+    CHAT_LOCAL_ANSWERS: bool = True
+    CHAT_LOCAL_MIN_CONFIDENCE: float = 0.8
+    CHAT_LOCAL_MAX_TOKENS: int = 16  # Longer messages are treated as lower confidence
+    
+    # Planner Suggestion Table
+    SUGGESTION_TABLE_ENABLED: bool = True
+    SUGGESTION_TABLE_PATH: str = os.path.join(os.path.dirname(__file__), "..", "data", "suggestion_table.json")
+    SUGGESTION_TABLE_TTL_SECONDS: int = 86400  # Older entries are served, then refreshed
+    SUGGESTION_TABLE_REFRESH_INTERVAL: float = 2.0  # Seconds between background LLM refreshes
+    SUGGESTION_TABLE_PREWARM: bool = False  # Refresh every stale combination at startup, not just requested ones
+    
+    # Itinerary Response Cache
+    ITINERARY_CACHE_ENABLED: bool = True
+    ITINERARY_CACHE_MAX_ENTRIES: int = 256
+    ITINERARY_CACHE_TTL_SECONDS: int = 3600
+    ITINERARY_CACHE_BUDGET_STEP: float = 0.1  # Budgets within ~10% share a bucket
+    
+    # Recommendation Cache (ranked top-N + explanations per preference bucket)
+    RECOMMENDATION_CACHE_ENABLED: bool = True
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 512
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 3600
+    RECOMMENDATION_CACHE_BUDGET_STEP: float = 0.15  # Total budgets within ~15% (same trip length) share a band
+    RECOMMENDATION_BATCH_MAX_REQUESTS: int = 50  # Preference sets per /recommendations/batch call
+    
+    # Destination Catalog
+    DESTINATION_CATALOG_BACKEND: str = "json"  # "json" (destinations.json in memory) or "sqlite" (converted catalog, read on demand)
+    DESTINATION_CATALOG_DB_PATH: str = os.path.join(os.path.dirname(__file__), "..", "data", "destinations.db")
+    DESTINATION_WATCH_ENABLED: bool = False  # Hot-reload destinations.json when it changes
+    DESTINATION_WATCH_INTERVAL: float = 2.0  # Seconds between file checks
+    DESTINATIONS_ENCODED_VIEWS: int = 64  # Pre-encoded canonical /destinations views (whole catalog, pages) per catalog version
+    DESTINATIONS_GZIP_LEVEL: int = 9  # Compression runs once per canonical view and catalog version
+    DESTINATIONS_BROTLI_QUALITY: int = 11  # Used when the optional brotli package is installed
+    DESTINATIONS_PAGE_SIZES: List[int] = [20, 50, 100]  # Canonical page sizes (offset a multiple of the size)
+    DESTINATIONS_ADHOC_VIEWS: int = 16  # Field projections / other pages kept, encoded with cheap gzip only
+    DESTINATIONS_ADHOC_GZIP_LEVEL: int = 1
+    
+    # Similar Destinations
+    SIMILAR_DESTINATIONS_NEIGHBOURS: int = 20  # Neighbours stored per destination (max results per lookup)
+    SIMILAR_DESTINATIONS_COST_WEIGHT: float = 0.2  # Share of similarity from daily cost vs. tags/activities
+    SIMILAR_DESTINATIONS_PRECOMPUTE_LIMIT: int = 2000  # Larger catalogs compute neighbours on first lookup
+    
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_REQUESTS: int = 100
@@ -43,6 +43,20 @@ class AIValidationError(TripITException):
         super().__init__(message, status_code=422, details=details)
 
 
+class AIUnavailableError(TripITException):
+    """Raised when an AI call is not attempted (circuit open); use a fallback."""
+    
+    def __init__(self, message: str = "AI service is unavailable"):
+        super().__init__(message, status_code=503)
+
+
+class AIOverloadedError(AIUnavailableError):
+    """Raised when an AI call is shed because the LLM queue is saturated."""
+    
+    def __init__(self, message: str = "AI service is busy"):
+        super().__init__(message)
+
+
 class RateLimitError(TripITException):
     """Raised when rate limit is exceeded."""
     
@@ -27,6 +27,12 @@ class StructuredFormatter(logging.Formatter):
             extra += f" model={record.model}"
         if hasattr(record, "tokens"):
             extra += f" tokens={record.tokens}"
+        if hasattr(record, "prompt_tokens"):
+            extra += f" prompt_tokens={record.prompt_tokens}"
+        if hasattr(record, "completion_tokens"):
+            extra += f" completion_tokens={record.completion_tokens}"
+        if hasattr(record, "ttft_ms"):
+            extra += f" ttft_ms={record.ttft_ms:.2f}"
         
         # Format: timestamp [level] logger - message extra_fields
         timestamp = self.formatTime(record, self.datefmt)
@@ -73,7 +79,10 @@ def log_ai_call(
     tokens: int,
     duration_ms: float,
     success: bool,
-    error: str = None
+    error: str = None,
+    prompt_tokens: int = None,
+    completion_tokens: int = None,
+    ttft_ms: float = None
 ):
     """Log an AI API call with structured data."""
     ai_logger = get_logger("ai")
@@ -82,6 +91,13 @@ def log_ai_call(
         "tokens": tokens,
         "duration_ms": duration_ms
     }
+    if prompt_tokens is not None:
+        extra["prompt_tokens"] = prompt_tokens
+    if completion_tokens is not None:
+        extra["completion_tokens"] = completion_tokens
+    if ttft_ms is not None:
+        # Time to first token for streamed calls; duration_ms is the full stream
+        extra["ttft_ms"] = ttft_ms
     
     if success:
         ai_logger.info("AI call completed", extra=extra)
@@ -40,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count"],
 )
 
 # Register custom exception handler
@@ -69,6 +70,25 @@ async def startup_event():
     from services.destination_cache import get_destination_cache
     cache = get_destination_cache()
     logger.info(f"Loaded {len(cache.get_all())} destinations into cache")
+    if settings.DESTINATION_WATCH_ENABLED:
+        cache.start_watching(settings.DESTINATION_WATCH_INTERVAL)
+    
+    # Build the chat intent index from the catalog and FAQ table
+    from services.chat_intents import get_intent_index
+    get_intent_index()
+    
+    # Load the planner suggestion table and start background refreshes
+    from services.groq_client import start_background_tasks
+    await start_background_tasks()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and persist their state."""
+    from services.destination_cache import get_destination_cache
+    from services.groq_client import stop_background_tasks
+    await get_destination_cache().stop_watching()
+    await stop_background_tasks()
 
 
 @app.get("/")
@@ -85,8 +105,16 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
+    from services.groq_client import get_ai_stats
+    from services.recommendation_cache import get_recommendation_cache
+    from services.destination_cache import get_destination_cache
+    ai_stats = get_ai_stats()
     return {
-        "status": "healthy",
+        # Degraded: serving rule-based fallbacks while the Groq circuit is open
+        "status": "degraded" if ai_stats["circuit_breaker"]["state"] == "open" else "healthy",
         "service": settings.APP_NAME,
-        "version": settings.APP_VERSION
+        "version": settings.APP_VERSION,
+        "ai": ai_stats,
+        "recommendation_cache": get_recommendation_cache().stats(),
+        "destinations": get_destination_cache().snapshot.stats()
     }
@@ -4,10 +4,19 @@ TripIT Chat Router
 Endpoints for AI chat assistant.
 """
 
-from fastapi import APIRouter
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from services.groq_client import generate_chat_response
+from services.groq_client import (
+    end_chat_session,
+    generate_chat_response,
+    resolve_chat_session,
+    stream_chat_response
+)
 from core.logging_config import get_logger
 
 router = APIRouter()
@@ -17,25 +26,75 @@ logger = get_logger("chat")
 class ChatRequest(BaseModel):
     """Request schema for chat."""
     message: str = Field(min_length=1, max_length=1000)
+    session_id: Optional[str] = Field(default=None, max_length=64)
 
 
 class ChatResponse(BaseModel):
     """Response schema for chat."""
     response: str
+    session_id: str
 
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
     Chat with TripIT AI assistant about travel.
+    
+    Pass back the returned session_id to continue the conversation;
+    omit it to start a new one. An unknown or expired session_id starts a
+    new conversation under a new id.
     """
     logger.info(f"Chat message received: {request.message[:50]}...")
+    session_id = await resolve_chat_session(request.session_id)
     
     try:
-        response = await generate_chat_response(request.message)
-        return ChatResponse(response=response)
+        response = await generate_chat_response(request.message, session_id)
+        return ChatResponse(response=response, session_id=session_id)
     except Exception as e:
         logger.error(f"Chat error: {e}")
         return ChatResponse(
-            response="I'd love to help you plan your trip! Try our Trip Planner for personalized recommendations."
+            response="I'd love to help you plan your trip! Try our Trip Planner for personalized recommendations.",
+            session_id=session_id
         )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Chat with TripIT AI assistant, streaming the reply as Server-Sent Events.
+    Emits `delta` events with text as it is generated, then a `done` event
+    carrying the session_id (a new one if the given id was unknown or
+    expired). Disconnecting cancels the upstream completion.
+    """
+    logger.info(f"Streaming chat message received: {request.message[:50]}...")
+    session_id = await resolve_chat_session(request.session_id)
+    
+    async def event_source():
+        deltas = stream_chat_response(request.message, session_id)
+        try:
+            async for delta in deltas:
+                if await http_request.is_disconnected():
+                    logger.info("Chat client disconnected, cancelling stream")
+                    break
+                yield f"event: delta\ndata: {json.dumps({'text': delta})}\n\n"
+            else:
+                yield f"event: done\ndata: {json.dumps({'session_id': session_id})}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream failed: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'Chat failed'})}\n\n"
+        finally:
+            await deltas.aclose()
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete("/chat/{session_id}", status_code=204)
+async def end_chat(session_id: str):
+    """
+    Forget a chat session's history.
+    """
+    await end_chat_session(session_id)
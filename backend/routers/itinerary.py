@@ -4,11 +4,14 @@ TripIT Itinerary Router
 Endpoints for itinerary generation and management.
 """
 
+import json
+
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
-from services.groq_client import generate_itinerary
+from services.groq_client import generate_itinerary, stream_itinerary
 from services.db_service import db
 from core.logging_config import get_logger
 from core.exceptions import NotFoundError
@@ -84,6 +87,40 @@ async def create_itinerary(
         raise HTTPException(status_code=500, detail="Failed to generate itinerary")
 
 
+@router.post("/itinerary/generate/stream")
+async def stream_itinerary_events(
+    request: ItineraryRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Generate an itinerary as Server-Sent Events.
+    Emits a `day` event per validated day plan, then a `complete` event
+    carrying the full itinerary with its cost breakdown.
+    """
+    logger.info(f"Streaming itinerary for {request.destination}, {request.days} days")
+    
+    async def event_source():
+        try:
+            async for event in stream_itinerary(
+                destination=request.destination,
+                days=request.days,
+                budget=request.budget,
+                travel_type=request.travel_type,
+                interest=request.interest,
+                travelers=request.travelers
+            ):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            logger.error(f"Itinerary stream failed: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'Failed to generate itinerary'})}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/itinerary/save")
 async def save_itinerary(
     request: SaveItineraryRequest,
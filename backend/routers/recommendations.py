@@ -4,17 +4,29 @@ TripIT Recommendations Router
 Endpoints for AI-powered destination recommendations.
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from services.scoring import score_destinations
-from services.groq_client import generate_explanations_parallel
+from services.scoring import score_destinations, score_destinations_batch
+from services.groq_client import (
+    fallback_explanation,
+    fill_budget,
+    generate_explanations_batch,
+    generate_explanations_parallel
+)
 from services.destination_cache import get_destination_cache
+from services.catalog_encoding import negotiate_encoding, view_key
+from services.recommendation_cache import get_recommendation_cache
+from core.config import get_settings
+from core.exceptions import NotFoundError
 from core.logging_config import get_logger
 
 router = APIRouter()
 logger = get_logger("recommendations")
+settings = get_settings()
 
 
 class RecommendationRequest(BaseModel):
@@ -44,21 +56,43 @@ class RecommendationResponse(BaseModel):
     query: RecommendationRequest
 
 
-@router.post("/recommendations", response_model=RecommendationResponse)
-async def get_recommendations(request: RecommendationRequest):
-    """
-    Get AI-powered destination recommendations based on user preferences.
-    Uses rule-based scoring + parallel AI explanations.
-    """
-    logger.info(f"Recommendations request: travel_type={request.travel_type}, interest={request.interest}, budget={request.budget}, days={request.days}")
-    
-    # Get destinations from cache (not file read)
-    cache = get_destination_cache()
-    destinations = cache.get_all()
-    
-    if not destinations:
-        raise HTTPException(status_code=500, detail="No destinations available")
-    
+class BatchRecommendationRequest(BaseModel):
+    """Request schema for scoring many preference sets in one call."""
+    requests: List[RecommendationRequest] = Field(min_length=1, max_length=settings.RECOMMENDATION_BATCH_MAX_REQUESTS)
+    explanations: Literal["ai", "none"] = Field(
+        default="ai",
+        description="ai: LLM explanations (deduplicated per preference bucket); none: rule-based text, no LLM calls"
+    )
+
+
+class BatchRecommendationResponse(BaseModel):
+    """Response schema for batch recommendations, in request order."""
+    results: List[RecommendationResponse]
+
+
+class SimilarDestination(BaseModel):
+    """Response schema for a destination similar to another."""
+    id: str
+    name: str
+    country: str
+    image: str
+    similarity: float
+    base_cost_per_day: int
+    tags: List[str]
+    description: str
+
+
+class SimilarDestinationsResponse(BaseModel):
+    """Response schema for similar destinations."""
+    destination_id: str
+    destinations: List[SimilarDestination]
+
+
+async def _rank_and_explain(
+    destinations: List[Dict[str, Any]],
+    request: RecommendationRequest
+) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """Score and explain the top 3. Returns (destinations, explanations, cacheable)."""
     logger.info(f"Scoring {len(destinations)} destinations...")
     
     # Score destinations using rule-based logic
@@ -67,18 +101,26 @@ async def get_recommendations(request: RecommendationRequest):
         budget=request.budget,
         days=request.days,
         travel_type=request.travel_type,
-        interest=request.interest
+        interest=request.interest,
+        limit=5
     )
     
     # Log top 5 scores for debugging
-    for i, dest in enumerate(scored[:5]):
+    for i, dest in enumerate(scored):
         logger.info(f"  #{i+1} {dest['name']}: score={dest['score']}, tags={dest['tags']}")
     
-    # Get top 3 destinations
-    top_destinations = scored[:3]
-    
-    # Generate AI explanations in parallel (not sequential!)
-    explanations = await generate_explanations_parallel(
+    # Explain the top 3 destinations
+    return await _explain(scored[:3], request)
+
+
+async def _explain(
+    top_destinations: List[Dict[str, Any]],
+    request: RecommendationRequest
+) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """Explain ranked destinations. Returns (destinations, explanations, cacheable)."""
+    # One batched completion for all explanations, or one call each in parallel
+    explain = generate_explanations_batch if settings.AI_BATCH_EXPLANATIONS else generate_explanations_parallel
+    explanations = await explain(
         destinations=top_destinations,
         days=request.days,
         budget=request.budget,
@@ -86,7 +128,20 @@ async def get_recommendations(request: RecommendationRequest):
         interest=request.interest
     )
     
-    # Build response
+    # Rule-based fallbacks (LLM down or shed) are served but not memoized
+    cacheable = not any(
+        text.startswith(fallback_explanation(dest["name"], request.days, request.travel_type, request.interest))
+        for dest, text in zip(top_destinations, explanations)
+    )
+    return top_destinations, explanations, cacheable
+
+
+def _build_results(
+    top_destinations: List[Dict[str, Any]],
+    explanations: List[str],
+    request: RecommendationRequest
+) -> List[DestinationScore]:
+    """Response items for ranked destinations and their explanations (budget filled in per request)."""
     results = []
     for dest, explanation in zip(top_destinations, explanations):
         results.append(DestinationScore(
@@ -95,18 +150,150 @@ async def get_recommendations(request: RecommendationRequest):
             country=dest["country"],
             image=dest["image"],
             score=dest["score"],
-            reason=explanation,
+            reason=fill_budget(explanation, request.budget),
             estimated_cost=dest["base_cost_per_day"] * request.days,
             tags=dest["tags"],
             description=dest["description"]
         ))
     
+    return results
+
+
+@router.post("/recommendations", response_model=RecommendationResponse)
+async def get_recommendations(request: RecommendationRequest):
+    """
+    Get AI-powered destination recommendations based on user preferences.
+    Uses rule-based scoring + batched (or parallel) AI explanations.
+    """
+    logger.info(f"Recommendations request: travel_type={request.travel_type}, interest={request.interest}, budget={request.budget}, days={request.days}")
+    
+    # Get destinations from cache (not file read)
+    cache = get_destination_cache()
+    destinations = cache.get_all()
+    
+    if not destinations:
+        raise HTTPException(status_code=500, detail="No destinations available")
+    
+    # Memoized per preference bucket; misses score and call Groq
+    if settings.RECOMMENDATION_CACHE_ENABLED:
+        recommendation_cache = get_recommendation_cache()
+        top_destinations, explanations = await recommendation_cache.get_or_compute(
+            recommendation_cache.key(request.travel_type, request.interest, request.budget, request.days),
+            lambda: _rank_and_explain(destinations, request)
+        )
+    else:
+        top_destinations, explanations, _ = await _rank_and_explain(destinations, request)
+    
+    results = _build_results(top_destinations, explanations, request)
+    
     logger.info(f"Returning {len(results)} recommendations for {request.interest}")
     return RecommendationResponse(destinations=results, query=request)
 
 
+@router.post("/recommendations/batch", response_model=BatchRecommendationResponse)
+async def get_recommendations_batch(request: BatchRecommendationRequest):
+    """
+    Rank destinations for many preference sets at once. All sets are scored
+    in one matrix pass; AI explanations go through the recommendation cache,
+    so repeated preference buckets share one LLM call.
+    """
+    destinations = get_destination_cache().get_all()
+    if not destinations:
+        raise HTTPException(status_code=500, detail="No destinations available")
+    
+    ranked = score_destinations_batch(
+        destinations,
+        [query.model_dump() for query in request.requests],
+        limit=3
+    )
+    
+    async def explain(query: RecommendationRequest, top: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        if request.explanations == "none":
+            return top, [fallback_explanation(dest["name"], query.days, query.travel_type, query.interest) for dest in top]
+        if settings.RECOMMENDATION_CACHE_ENABLED:
+            recommendation_cache = get_recommendation_cache()
+            computed = []
+
+            async def compute():
+                result = await _explain(top, query)
+                computed.append(result)
+                return result
+
+            cached_top, cached_explanations = await recommendation_cache.get_or_compute(
+                recommendation_cache.key(query.travel_type, query.interest, query.budget, query.days),
+                compute
+            )
+            # Keep this query's fresh ranking; reuse only the cached explanation texts
+            by_id = {dest["id"]: text for dest, text in zip(cached_top, cached_explanations)}
+            if all(dest["id"] in by_id for dest in top):
+                return top, [by_id[dest["id"]] for dest in top]
+            if computed:
+                # Explained for this ranking already; don't ask the LLM twice
+                return top, computed[0][1]
+        _, explanations, _ = await _explain(top, query)
+        return top, explanations
+    
+    explained = await asyncio.gather(*(explain(query, top) for query, top in zip(request.requests, ranked)))
+    
+    logger.info(f"Returning batch recommendations for {len(request.requests)} preference sets")
+    return BatchRecommendationResponse(results=[
+        RecommendationResponse(destinations=_build_results(top, explanations, query), query=query)
+        for query, (top, explanations) in zip(request.requests, explained)
+    ])
+
+
 @router.get("/destinations")
-async def list_destinations():
-    """Get all available destinations from cache."""
-    cache = get_destination_cache()
-    return cache.get_all()
+async def list_destinations(
+    request: Request,
+    fields: Optional[str] = Query(default=None, max_length=200, description="Comma-separated fields to include"),
+    offset: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1)
+):
+    """
+    Get all available destinations from cache. The whole catalog and pages
+    of the configured sizes are served from bytes encoded once per catalog
+    version (gzip/brotli by Accept-Encoding); field projections and other
+    pages get cheap gzip. Strong ETags allow If-None-Match revalidation;
+    X-Total-Count gives the catalog size.
+    """
+    encoded = get_destination_cache().snapshot.encoded
+    key = view_key(fields, offset, limit)
+    view = encoded.cached(key) or await asyncio.to_thread(encoded.view, key)
+    
+    coding, body = view.select(negotiate_encoding(request.headers.get("accept-encoding", "")))
+    headers = {
+        "ETag": view.etags[coding],
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Total-Count": str(view.total)
+    }
+    if view.not_modified(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/destinations/{destination_id}/similar", response_model=SimilarDestinationsResponse)
+async def get_similar_destinations(
+    destination_id: str,
+    limit: int = Query(default=5, ge=1, le=settings.SIMILAR_DESTINATIONS_NEIGHBOURS),
+    cheaper: bool = Query(default=False, description="Only destinations with a lower daily cost"),
+    max_cost_per_day: Optional[int] = Query(default=None, gt=0)
+):
+    """Destinations most like the given one (tags, activities, best-for, cost); no LLM call."""
+    # One snapshot for both lookups, so a concurrent reload can't mix versions
+    snapshot = get_destination_cache().snapshot
+    source = snapshot.get(destination_id)
+    if source is None:
+        raise NotFoundError("Destination", destination_id)
+    
+    if cheaper:
+        cheaper_than = source.get("base_cost_per_day", 3000) - 1
+        max_cost_per_day = min(max_cost_per_day, cheaper_than) if max_cost_per_day else cheaper_than
+    
+    similar = snapshot.similarity.similar(destination_id, limit=limit, max_cost_per_day=max_cost_per_day)
+    return SimilarDestinationsResponse(
+        destination_id=destination_id,
+        destinations=[SimilarDestination(**dest) for dest in similar or []]
+    )
@@ -85,6 +85,22 @@ class ItinerarySchema(BaseModel):
         )
 
 
+class ExplanationBatchSchema(BaseModel):
+    """Schema for batched destination explanations (destination id -> text)."""
+    
+    explanations: Dict[str, str] = Field(default_factory=dict)
+    
+    @field_validator("explanations", mode="before")
+    @classmethod
+    def filter_empty_explanations(cls, v):
+        if isinstance(v, dict):
+            return {
+                str(k): t.strip() for k, t in v.items()
+                if isinstance(t, str) and t.strip()
+            }
+        return v
+
+
 class SuggestionResponseSchema(BaseModel):
     """Schema for contextual suggestions from LLM."""
     
@@ -0,0 +1,206 @@
+"""
+TripIT Catalog Encoding
+
+Pre-encoded /destinations responses. Each catalog snapshot keeps the JSON
+bytes of the canonical views it has served (the whole catalog and pages of
+the configured sizes), compressed once at high levels with gzip and, if the
+optional brotli package is installed, brotli, plus a strong ETag from the
+content hash. Field projections and other pages are client-chosen, so they
+get cheap gzip only, are built one at a time and are kept in a small
+separate cache. Serving a view is a lookup and a header comparison; a new
+snapshot starts with no views, so encodings are rebuilt only when the
+catalog changes.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from core.logging_config import get_logger
+
+logger = get_logger("catalog_encoding")
+
+# Try to import brotli
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# (fields, offset, limit); empty fields = whole destination objects, limit None = to the end
+ViewKey = Tuple[Tuple[str, ...], int, Optional[int]]
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip") if HAS_BROTLI else ("gzip",)
+
+
+def view_key(fields: Optional[str], offset: int = 0, limit: Optional[int] = None) -> ViewKey:
+    """Key for a comma-separated field list and page (fields deduplicated and sorted)."""
+    names = tuple(sorted({name.strip() for name in (fields or "").split(",") if name.strip()}))
+    return names, offset, limit
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Best supported content coding for an Accept-Encoding header ("identity" if none)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    for coding in ENCODINGS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+class EncodedView:
+    """JSON body of one view with its compressed variants and ETags."""
+
+    __slots__ = ("total", "variants", "etags")
+
+    def __init__(self, body: bytes, total: int, gzip_level: int, brotli_quality: Optional[int]):
+        self.total = total
+        self.variants: Dict[str, bytes] = {"identity": body}
+        compressed = {"gzip": lambda: gzip.compress(body, compresslevel=gzip_level, mtime=0)}
+        if HAS_BROTLI and brotli_quality is not None:
+            compressed["br"] = lambda: brotli.compress(body, quality=brotli_quality)
+        for coding, compress in compressed.items():
+            data = compress()
+            # Tiny bodies can grow when compressed; serve those uncompressed
+            if len(data) < len(body):
+                self.variants[coding] = data
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Strong ETags differ per content coding (the bytes on the wire differ)
+        self.etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in self.variants
+        }
+
+    def select(self, encoding: str) -> Tuple[str, bytes]:
+        """(coding, bytes) to send for a negotiated encoding."""
+        coding = encoding if encoding in self.variants else "identity"
+        return coding, self.variants[coding]
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header matches any variant of this view."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or any(etag in tags for etag in self.etags.values())
+
+
+class EncodedCatalog:
+    """
+    Bounded caches of encoded views over one catalog snapshot (oldest view
+    evicted first): canonical views at full compression, ad-hoc views at a
+    cheap gzip level. Builds of each kind are serialized by their own lock,
+    so ad-hoc requests can't hold up canonical ones; lookups from the event
+    loop never take either.
+    """
+
+    def __init__(
+        self,
+        destinations: Sequence[Dict[str, Any]],
+        max_views: int = 64,
+        gzip_level: int = 9,
+        brotli_quality: int = 11,
+        page_sizes: Sequence[int] = (20, 50, 100),
+        max_adhoc_views: int = 16,
+        adhoc_gzip_level: int = 1
+    ):
+        self.destinations = destinations
+        self.max_views = max_views
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.page_sizes = frozenset(page_sizes)
+        self.max_adhoc_views = max_adhoc_views
+        self.adhoc_gzip_level = adhoc_gzip_level
+        self._views: "OrderedDict[ViewKey, EncodedView]" = OrderedDict()
+        self._adhoc: "OrderedDict[ViewKey, EncodedView]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._adhoc_lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.adhoc_builds = 0
+
+    def is_canonical(self, key: ViewKey) -> bool:
+        """Whole catalog, or a page of a configured size aligned to it, with no projection."""
+        fields, offset, limit = key
+        if fields:
+            return False
+        if limit is None:
+            return offset == 0
+        return limit in self.page_sizes and offset % limit == 0 and offset < len(self.destinations)
+
+    def cached(self, key: ViewKey) -> Optional[EncodedView]:
+        """Already-encoded view, or None."""
+        view = self._views.get(key) or self._adhoc.get(key)
+        if view is not None:
+            self.hits += 1
+        return view
+
+    def view(self, key: ViewKey) -> EncodedView:
+        """Encoded view, building it on first use (CPU-bound: call from a thread for large catalogs)."""
+        if self.is_canonical(key):
+            return self._get_or_build(key, self._views, self._lock, self.max_views, self.gzip_level, self.brotli_quality)
+        return self._get_or_build(key, self._adhoc, self._adhoc_lock, self.max_adhoc_views, self.adhoc_gzip_level, None)
+
+    def _get_or_build(
+        self,
+        key: ViewKey,
+        views: "OrderedDict[ViewKey, EncodedView]",
+        lock: threading.Lock,
+        max_views: int,
+        gzip_level: int,
+        brotli_quality: Optional[int]
+    ) -> EncodedView:
+        with lock:
+            view = views.get(key)
+            if view is not None:
+                # Built by a concurrent caller while this one waited
+                self.hits += 1
+                return view
+            view = self._build(key, gzip_level, brotli_quality)
+            if views is self._views:
+                self.builds += 1
+            else:
+                self.adhoc_builds += 1
+            views[key] = view
+            if len(views) > max_views:
+                views.popitem(last=False)
+            return view
+
+    def _build(self, key: ViewKey, gzip_level: int, brotli_quality: Optional[int]) -> EncodedView:
+        fields, offset, limit = key
+        total = len(self.destinations)
+        end = total if limit is None else min(total, offset + limit)
+        rows = self.destinations[offset:end]
+        if fields:
+            rows = [{name: dest[name] for name in fields if name in dest} for dest in rows]
+        # Same encoding as FastAPI's JSONResponse
+        body = json.dumps(list(rows), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        view = EncodedView(body, total, gzip_level, brotli_quality)
+        logger.info(
+            f"Encoded destinations view (fields={','.join(fields) or '*'}, offset={offset}, limit={limit}): "
+            + ", ".join(f"{coding} {len(data)}B" for coding, data in view.variants.items())
+        )
+        return view
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "views": len(self._views),
+            "adhoc_views": len(self._adhoc),
+            "hits": self.hits,
+            "builds": self.builds,
+            "adhoc_builds": self.adhoc_builds,
+            "encodings": ["identity", *ENCODINGS]
+        }
@@ -0,0 +1,233 @@
+"""
+TripIT Catalog Store
+
+Compact on-disk destination catalog in SQLite, for catalogs too large to
+hold as a list of dicts in every worker. Each destination is one row
+(JSON document plus id/name/cost columns, with tag and best-for label
+tables), opened read-only so all uvicorn workers share it through the OS
+page cache. Documents are decoded on access.
+
+Convert the JSON source (from backend/):
+    python -m services.catalog_store data/destinations.json data/destinations.db
+"""
+
+import hashlib
+import json
+import operator
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from core.logging_config import get_logger
+
+logger = get_logger("catalog_store")
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE destinations (
+    pos INTEGER PRIMARY KEY,
+    id TEXT,
+    name TEXT,
+    base_cost_per_day INTEGER,
+    doc TEXT NOT NULL
+);
+CREATE TABLE labels (
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    pos INTEGER NOT NULL
+);
+"""
+
+# Created after the bulk insert (faster than maintaining them row by row)
+_INDEXES = """
+CREATE INDEX destinations_cost ON destinations (base_cost_per_day, pos);
+CREATE INDEX labels_kind_label ON labels (kind, label, pos);
+"""
+
+# Destination fields stored as label rows, by kind
+LABEL_FIELDS = {"tag": "tags", "best_for": "best_for"}
+
+
+def convert_json_catalog(json_path: str, db_path: str) -> int:
+    """
+    Write the JSON catalog to a new SQLite file and atomically replace
+    db_path with it. Returns the number of destinations.
+    """
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    destinations = json.loads(raw)
+
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.executemany(
+            "INSERT INTO destinations (pos, id, name, base_cost_per_day, doc) VALUES (?, ?, ?, ?, ?)",
+            (
+                (pos, dest.get("id"), dest.get("name"), dest.get("base_cost_per_day", 3000),
+                 json.dumps(dest, ensure_ascii=False, separators=(",", ":")))
+                for pos, dest in enumerate(destinations)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO labels (kind, label, pos) VALUES (?, ?, ?)",
+            (
+                (kind, label, pos)
+                for pos, dest in enumerate(destinations)
+                for kind, field in LABEL_FIELDS.items()
+                for label in sorted({value.lower() for value in dest.get(field, [])})
+            )
+        )
+        conn.executescript(_INDEXES)
+        conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+            ("schema_version", str(SCHEMA_VERSION)),
+            ("count", str(len(destinations))),
+            ("checksum", hashlib.sha256(raw).hexdigest()),
+        ])
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    logger.info(f"Wrote {len(destinations)} destinations to {db_path}")
+    return len(destinations)
+
+
+class SQLiteCatalog(Sequence):
+    """
+    Read-only sequence of destination dicts backed by a converted catalog.
+    Recently used documents are kept decoded (the same dict is returned
+    while cached); one connection per thread until close().
+    """
+
+    def __init__(self, path: str, cache_size: int = 4096):
+        self.path = path
+        self.cache_size = cache_size
+        self._local = threading.local()
+        # Shared by every thread's reads; the lock guards its ordering changes
+        self._docs: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._docs_lock = threading.Lock()
+        # Every thread's connection, so close() can reach them all
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._closed = False
+        try:
+            meta = dict(self._conn().execute("SELECT key, value FROM meta").fetchall())
+            if int(meta.get("schema_version", 0)) != SCHEMA_VERSION:
+                raise ValueError(f"Unsupported catalog schema in {path}: {meta.get('schema_version')}")
+            self._count = int(meta["count"])
+            self.checksum = meta["checksum"]
+        except Exception:
+            self.close()
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._closed:
+            # A reader still holding a replaced snapshot: one-off connection, closed when dropped
+            return self._connect()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            with self._conns_lock:
+                if self._closed:
+                    return conn
+                self._conns.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close every thread's connection (called once the catalog is replaced or discarded)."""
+        with self._conns_lock:
+            self._closed = True
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        # Plain int: numpy integers would bind as blobs
+        index = operator.index(index)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("catalog index out of range")
+
+        with self._docs_lock:
+            doc = self._docs.get(index)
+            if doc is not None:
+                self._docs.move_to_end(index)
+                return doc
+        row = self._conn().execute("SELECT doc FROM destinations WHERE pos = ?", (index,)).fetchone()
+        doc = json.loads(row[0])
+        with self._docs_lock:
+            # Another thread may have decoded it meanwhile; keep one dict per document
+            doc = self._docs.setdefault(index, doc)
+            self._docs.move_to_end(index)
+            if len(self._docs) > self.cache_size:
+                self._docs.popitem(last=False)
+        return doc
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Streams rows without filling the document cache
+        for (doc,) in self._conn().execute("SELECT doc FROM destinations ORDER BY pos"):
+            yield json.loads(doc)
+
+    def positions(self) -> Dict[str, int]:
+        """Position of each destination id (first occurrence wins)."""
+        positions: Dict[str, int] = {}
+        for dest_id, pos in self._conn().execute(
+            "SELECT id, pos FROM destinations WHERE id IS NOT NULL ORDER BY pos"
+        ):
+            positions.setdefault(dest_id, pos)
+        return positions
+
+    def names(self) -> List[Tuple[str, int]]:
+        """(name, position) for every destination with a name, in catalog order."""
+        return self._conn().execute(
+            "SELECT name, pos FROM destinations WHERE name IS NOT NULL ORDER BY pos"
+        ).fetchall()
+
+    def cost_order(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(daily costs, positions), cheapest first."""
+        rows = np.fromiter(
+            self._conn().execute("SELECT base_cost_per_day, pos FROM destinations ORDER BY base_cost_per_day, pos"),
+            dtype=[("cost", np.int64), ("pos", np.int32)],
+            count=self._count
+        )
+        return rows["cost"].copy(), rows["pos"].copy()
+
+    def postings(self, kind: str) -> Dict[str, np.ndarray]:
+        """Positions carrying each label of one kind (lowercased), in catalog order."""
+        conn = self._conn()
+        labels = [label for (label,) in conn.execute("SELECT DISTINCT label FROM labels WHERE kind = ?", (kind,))]
+        return {
+            label: np.fromiter(
+                (pos for (pos,) in conn.execute(
+                    "SELECT pos FROM labels WHERE kind = ? AND label = ? ORDER BY pos", (kind, label)
+                )),
+                dtype=np.int32
+            )
+            for label in labels
+        }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m services.catalog_store <destinations.json> <destinations.db>")
+    convert_json_catalog(sys.argv[1], sys.argv[2])
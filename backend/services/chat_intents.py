@@ -0,0 +1,254 @@
+"""
+TripIT Chat Intents
+
+Token index over destination names and question patterns, built from the
+destination catalog and the curated FAQ table. Short, unambiguous questions
+("best time to visit Goa", "budget for Manali") whose content words are all
+explained by matched phrases are answered from the catalog without an LLM
+call; anything more specific ("flight to Goa cost") goes to the LLM.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.config import get_settings
+from core.logging_config import get_logger
+from services.destination_cache import DestinationCache, get_destination_cache
+
+logger = get_logger("intents")
+
+FAQ_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "chat_faq.json")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Question patterns for intents answered from the destination catalog
+DESTINATION_INTENTS: Dict[str, List[str]] = {
+    "best_time": [
+        "best time", "good time", "ideal time", "right time", "best season", "best month",
+        "when to visit", "when to go", "when should i visit", "when should i go",
+        "which month", "what month", "which season", "weather", "climate"
+    ],
+    "budget": [
+        "budget", "cost", "costs", "how much", "expensive", "price", "prices",
+        "per day", "daily cost", "spend"
+    ],
+    "activities": [
+        "things to do", "what to do", "what can i do", "activities", "attractions",
+        "places to see", "famous for", "known for"
+    ]
+}
+
+
+# Words that carry no question content of their own; every other token
+# must be covered by a matched phrase for a confident local answer
+FILLER_WORDS = frozenset("""
+a an the is are was be do does did can could would should will i me my we you your it its this that
+there what which when where who how why to in on at of for from with about and or any some please
+thanks thank hi hello hey tell know want like suggest visit visiting go going trip travel place here
+s t m ll re ve d
+""".split())
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class IntentMatch:
+    """Result of matching a chat message against the index."""
+
+    __slots__ = ("intent", "destination_id", "confidence")
+
+    def __init__(self, intent: str, destination_id: Optional[str], confidence: float):
+        self.intent = intent
+        self.destination_id = destination_id
+        self.confidence = confidence
+
+
+class IntentIndex:
+    """
+    Phrase index keyed by token tuples. Matching looks up every n-gram of
+    the message (up to the longest phrase), so cost is linear in message
+    length regardless of how many phrases are indexed.
+    """
+
+    def __init__(
+        self,
+        directory: Sequence[Tuple[str, Optional[str]]],
+        faq: Dict[str, Any],
+        max_tokens: int = 16,
+        metrics: Optional[Dict[str, int]] = None
+    ):
+        self.max_tokens = max_tokens
+        self._phrases: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+        self._max_phrase = 1
+        self._notes: Dict[str, Dict[str, Any]] = faq.get("destinations", {})
+        self._faq_answers: Dict[str, str] = {}
+        # Shared with the index this one replaces, so a catalog reload keeps the counts
+        self.metrics = metrics if metrics is not None else {"queries": 0, "local_answers": 0}
+
+        # (id, name) pairs only: full records are read from the current snapshot when answering
+        for dest_id, name in directory:
+            self._add(name or dest_id, "destination", dest_id)
+            self._add(dest_id, "destination", dest_id)
+            for alias in self._notes.get(dest_id, {}).get("aliases", []):
+                self._add(alias, "destination", dest_id)
+
+        for intent, patterns in DESTINATION_INTENTS.items():
+            for pattern in patterns:
+                self._add(pattern, "intent", intent)
+
+        for entry in faq.get("faq", []):
+            intent = f"faq:{entry['id']}"
+            self._faq_answers[intent] = entry["answer"]
+            for pattern in entry["patterns"]:
+                self._add(pattern, "intent", intent)
+
+    def _add(self, phrase: str, kind: str, value: str) -> None:
+        tokens = tuple(_tokenize(phrase))
+        if not tokens:
+            return
+        self._phrases[tokens] = (kind, value)
+        self._max_phrase = max(self._max_phrase, len(tokens))
+
+    def match(self, message: str) -> Optional[IntentMatch]:
+        """Find the intent and destination in a message, with a confidence score."""
+        tokens = _tokenize(message)
+        intents: List[str] = []
+        destinations: List[str] = []
+        covered = [token in FILLER_WORDS for token in tokens]
+
+        i = 0
+        while i < len(tokens):
+            # Longest phrase starting here wins ("when should i go" over "go")
+            for size in range(min(self._max_phrase, len(tokens) - i), 0, -1):
+                hit = self._phrases.get(tuple(tokens[i:i + size]))
+                if hit is None:
+                    continue
+                kind, value = hit
+                found = intents if kind == "intent" else destinations
+                if value not in found:
+                    found.append(value)
+                covered[i:i + size] = [True] * size
+                i += size - 1
+                break
+            i += 1
+
+        if not intents:
+            return None
+
+        intent = intents[0]
+        # Share of content words the matched phrases explain: "flight to Goa
+        # cost" or "weather in Manali in July" ask more than the canned answer says
+        content = sum(token not in FILLER_WORDS for token in tokens)
+        explained = sum(flag and token not in FILLER_WORDS for flag, token in zip(covered, tokens))
+        confidence = (explained / content) ** 2 if content else 1.0
+        confidence -= 0.4 * (len(intents) - 1)
+        if len(tokens) > self.max_tokens:
+            confidence -= 0.3
+
+        if intent.startswith("faq:"):
+            destination_id = None
+            if destinations:
+                # A destination in an FAQ question usually means a trip-specific ask
+                confidence -= 0.4
+        else:
+            if not destinations:
+                return IntentMatch(intent, None, 0.0)
+            destination_id = destinations[0]
+            confidence -= 0.4 * (len(destinations) - 1)
+
+        return IntentMatch(intent, destination_id, max(0.0, confidence))
+
+    def answer(self, message: str, min_confidence: float) -> Optional[str]:
+        """Local answer for the message, or None if it should go to the LLM."""
+        self.metrics["queries"] += 1
+        match = self.match(message)
+        if match is None or match.confidence < min_confidence:
+            return None
+
+        reply = self._render(match)
+        if reply is not None:
+            self.metrics["local_answers"] += 1
+        return reply
+
+    def lookup(self, message: str) -> Optional[str]:
+        """Best-effort answer at any confidence (used when the LLM is unavailable)."""
+        match = self.match(message)
+        return self._render(match) if match is not None else None
+
+    def _render(self, match: IntentMatch) -> Optional[str]:
+        if match.intent in self._faq_answers:
+            return self._faq_answers[match.intent]
+
+        dest = get_destination_cache().get_by_id(match.destination_id)
+        if dest is None:
+            return None
+        name = dest.get("name", match.destination_id)
+        notes = self._notes.get(match.destination_id, {})
+
+        if match.intent == "best_time":
+            if not notes.get("best_time"):
+                return None
+            note = f" {notes['season_note']}" if notes.get("season_note") else ""
+            return f"The best time to visit {name} is {notes['best_time']}.{note}"
+
+        if match.intent == "budget":
+            cost = dest.get("base_cost_per_day")
+            if not cost:
+                return None
+            return (
+                f"Plan on about ₹{cost:,}-{round(cost * 1.6, -2):,.0f} per person per day in {name} "
+                f"for stays, food and local travel. Try our Trip Planner for a day-wise budget!"
+            )
+
+        if match.intent == "activities":
+            activities = dest.get("activities", [])
+            if not activities:
+                return None
+            listed = ", ".join(activities[:-1]) + f" and {activities[-1]}" if len(activities) > 1 else activities[0]
+            return f"{name} is great for {listed}. {dest.get('description', '')}".strip()
+
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the local-answer rate for /health."""
+        queries, local_answers = self.metrics["queries"], self.metrics["local_answers"]
+        return {
+            "phrases": len(self._phrases),
+            "queries": queries,
+            "local_answers": local_answers,
+            "local_answer_rate": round(local_answers / queries, 3) if queries else 0.0
+        }
+
+
+def _load_faq() -> Dict[str, Any]:
+    try:
+        with open(FAQ_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.error(f"Could not load chat FAQ table: {e}")
+        return {}
+
+
+# Local-answer counters for /health, across index rebuilds
+_answer_metrics = {"queries": 0, "local_answers": 0}
+
+
+@lru_cache()
+def get_intent_index() -> IntentIndex:
+    """Build the intent index from the destination catalog and FAQ table (again after a catalog reload)."""
+    index = IntentIndex(
+        get_destination_cache().snapshot.directory(),
+        _load_faq(),
+        max_tokens=get_settings().CHAT_LOCAL_MAX_TOKENS,
+        metrics=_answer_metrics
+    )
+    logger.info(f"Built chat intent index with {index.stats()['phrases']} phrases")
+    return index
+
+
+# Rebuild on next use when the catalog reloads (names and aliases may have changed); the counters stay
+DestinationCache().add_reload_listener(get_intent_index.cache_clear)
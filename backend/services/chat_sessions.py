@@ -0,0 +1,108 @@
+"""
+TripIT Chat Sessions
+
+Server-side chat history keyed by session id. Sessions hold a rolling
+summary plus the most recent turns; stores are pluggable so the in-memory
+default can be swapped for a shared backend. Session ids are issued by the
+server and unguessable; whoever holds one owns the conversation.
+"""
+
+import secrets
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from services.ttl_cache import TTLCache
+
+
+def new_session_id() -> str:
+    """Unguessable session id (192 random bits)."""
+    return secrets.token_urlsafe(24)
+
+
+class ChatSession(BaseModel):
+    """Summary of older turns plus recent messages for one conversation."""
+
+    session_id: str
+    summary: str = ""
+    turns: List[Dict[str, str]] = Field(default_factory=list)
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by the session's text."""
+        return len(self.summary.encode()) + sum(len(turn["content"].encode()) for turn in self.turns)
+
+    def enforce_limit(self, max_bytes: int) -> int:
+        """
+        Drop the oldest turns (then trim the summary) until the session fits
+        in max_bytes. Returns the number of turns dropped.
+        """
+        dropped = 0
+        while self.turns and self.size_bytes() > max_bytes:
+            self.turns.pop(0)
+            dropped += 1
+        if self.size_bytes() > max_bytes:
+            self.summary = self.summary.encode()[-max_bytes:].decode(errors="ignore")
+        return dropped
+
+
+class SessionStore(ABC):
+    """Storage backend for chat sessions."""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        """Return a private copy of the session, or None if unknown or expired."""
+
+    @abstractmethod
+    async def save(self, session: ChatSession) -> None:
+        """Store a copy of the session (refreshing its expiry); the last save wins."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Forget a session."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for /health."""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store with idle TTL, LRU eviction and a per-session size cap.
+    Copy-on-write: concurrent requests on one session each work on their own
+    copy (as they would with a shared backend), never on the stored object.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float, max_session_bytes: int):
+        self.max_session_bytes = max_session_bytes
+        self._cache = TTLCache(max_entries=max_sessions, ttl_seconds=ttl_seconds)
+        self.trimmed_turns = 0
+
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        session = self._cache.get(session_id)
+        return None if session is None else session.model_copy(deep=True)
+
+    async def save(self, session: ChatSession) -> None:
+        stored = session.model_copy(deep=True)
+        self.trimmed_turns += stored.enforce_limit(self.max_session_bytes)
+        self._cache.set(stored.session_id, stored)
+
+    async def delete(self, session_id: str) -> None:
+        self._cache.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = [session.size_bytes() for session in self._cache.values()]
+        return {
+            **self._cache.stats(),
+            "max_session_bytes": self.max_session_bytes,
+            "total_bytes": sum(sizes),
+            "largest_session_bytes": max(sizes, default=0),
+            "trimmed_turns": self.trimmed_turns
+        }
+
+
+def create_session_store(backend: str, **options: Any) -> SessionStore:
+    """Build the session store named by the CHAT_SESSION_STORE setting."""
+    if backend == "memory":
+        return InMemorySessionStore(**options)
+    raise ValueError(f"Unknown chat session store: {backend}")
@@ -0,0 +1,144 @@
+"""
+TripIT Circuit Breaker
+
+Stops calling Groq while it is failing or slow so requests go straight to
+the rule-based fallbacks instead of waiting out timeouts and retries.
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict
+
+from core.logging_config import get_logger
+
+logger = get_logger("breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker driven by error rate and slow-call rate
+    over a rolling time window.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 10,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30,
+        half_open_calls: int = 1
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        # (timestamp, failed, slow)
+        self._outcomes: deque = deque()
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an expired open period reads as half-open."""
+        now = time.monotonic()
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._half_open(now)
+        elif self._state == HALF_OPEN and now - self._opened_at >= self.open_seconds:
+            # Probes never reported back (cancelled or shed); allow fresh ones
+            self._half_open(now)
+        return self._state
+
+    def _half_open(self, now: float) -> None:
+        self._state = HALF_OPEN
+        self._opened_at = now
+        self._probes = 0
+        self._probe_successes = 0
+
+    def is_open(self) -> bool:
+        """True while calls are being rejected (does not consume a probe)."""
+        return self.state == OPEN
+
+    def allow_request(self) -> bool:
+        """Check before each call. In half-open, admits a limited number of probes."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, latency_seconds: float) -> None:
+        slow = latency_seconds >= self.slow_call_seconds
+        if self._state == HALF_OPEN:
+            if slow:
+                self._trip("slow probe")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._close()
+            return
+        self._record(failed=False, slow=slow)
+
+    def record_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._trip("failed probe")
+            return
+        self._record(failed=True, slow=False)
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, failed, slow))
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+        if self._state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+
+        total = len(self._outcomes)
+        failures = sum(1 for _, f, _ in self._outcomes if f)
+        slow_calls = sum(1 for _, _, s in self._outcomes if s)
+        if failures / total >= self.error_rate:
+            self._trip(f"error rate {failures}/{total}")
+        elif slow_calls / total >= self.slow_call_rate:
+            self._trip(f"slow calls {slow_calls}/{total}")
+
+    def _trip(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.times_opened += 1
+        logger.warning(f"Circuit opened ({reason}); using fallbacks for {self.open_seconds:.0f}s")
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._outcomes.clear()
+        logger.info("Circuit closed; LLM calls resumed")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state and counters for /health."""
+        total = len(self._outcomes)
+        failures = sum(1 for _, f, _ in self._outcomes if f)
+        return {
+            "state": self.state,
+            "window_calls": total,
+            "window_error_rate": round(failures / total, 3) if total else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
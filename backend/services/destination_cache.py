@@ -2,14 +2,34 @@
 TripIT Destination Cache
 
 Caches destination data in memory instead of reading JSON every request.
+
+Each load builds an immutable, versioned snapshot (catalog plus id, tag,
+best-for and cost indexes) and publishes it with a single reference swap,
+so readers never block and never see a half-loaded catalog. Optional file
+watching reloads the catalog when its source file changes.
+
+The catalog comes from destinations.json (held in memory) or, with
+DESTINATION_CATALOG_BACKEND=sqlite, from a converted SQLite catalog that is
+read on demand (see services.catalog_store).
 """
 
+import asyncio
+import hashlib
 import json
 import os
+import sqlite3
+import threading
+import time
 from functools import lru_cache
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
 
+import numpy as np
+
+from core.config import get_settings
 from core.logging_config import get_logger
+from services.catalog_encoding import EncodedCatalog
+from services.catalog_store import LABEL_FIELDS, SQLiteCatalog
+from services.similarity import SimilarityIndex
 
 logger = get_logger("cache")
 
@@ -17,53 +37,307 @@ logger = get_logger("cache")
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "destinations.json")
 
 
+def _source_path() -> str:
+    """Catalog file for the configured backend."""
+    settings = get_settings()
+    return settings.DESTINATION_CATALOG_DB_PATH if settings.DESTINATION_CATALOG_BACKEND == "sqlite" else DATA_PATH
+
+
+def name_key(name: str) -> str:
+    """Lookup key for a destination name (lowercased, whitespace collapsed)."""
+    return " ".join(name.lower().split())
+
+
+def _catalog_indexes(destinations: Sequence[Dict[str, Any]]):
+    """Id and name positions, (costs, positions) cheapest first, and label postings per label kind."""
+    names: Dict[str, int] = {}
+    if isinstance(destinations, SQLiteCatalog):
+        # Straight from the indexed columns; no documents are decoded
+        for name, pos in destinations.names():
+            names.setdefault(name_key(name), pos)
+        return (
+            destinations.positions(),
+            names,
+            destinations.cost_order(),
+            {kind: destinations.postings(kind) for kind in LABEL_FIELDS}
+        )
+
+    positions: Dict[str, int] = {}
+    postings: Dict[str, Dict[str, List[int]]] = {kind: {} for kind in LABEL_FIELDS}
+    for pos, dest in enumerate(destinations):
+        if dest.get("id"):
+            positions.setdefault(dest["id"], pos)
+        if dest.get("name"):
+            names.setdefault(name_key(dest["name"]), pos)
+        for kind, field in LABEL_FIELDS.items():
+            for label in {value.lower() for value in dest.get(field, [])}:
+                postings[kind].setdefault(label, []).append(pos)
+
+    costs = np.array([dest.get("base_cost_per_day", 3000) for dest in destinations], dtype=np.int64)
+    order = np.argsort(costs, kind="stable").astype(np.int32)
+    return (
+        positions,
+        names,
+        (costs[order], order),
+        {
+            kind: {label: np.array(rows, dtype=np.int32) for label, rows in labels.items()}
+            for kind, labels in postings.items()
+        }
+    )
+
+
+class DestinationSnapshot:
+    """
+    One published version of the catalog with its lookup indexes.
+    Never mutated after construction; treat the destination dicts as read-only.
+
+    `destinations` is a list (JSON backend) or a SQLiteCatalog; indexes hold
+    catalog positions, so only the destinations a lookup returns are touched.
+    """
+
+    def __init__(self, destinations: Sequence[Dict[str, Any]], version: int, checksum: str = ""):
+        self.destinations = destinations
+        self.version = version
+        self.checksum = checksum
+        self.loaded_at = time.time()
+
+        # Indexes hold catalog positions (numpy arrays), not destination dicts
+        self._positions, self._names, (self._cost_keys, self._by_cost), postings = _catalog_indexes(destinations)
+        self._by_tag: Dict[str, np.ndarray] = postings["tag"]
+        self._by_best_for: Dict[str, np.ndarray] = postings["best_for"]
+
+        # Pre-encoded /destinations responses for this version, encoded on first request
+        settings = get_settings()
+        self.encoded = EncodedCatalog(
+            destinations,
+            max_views=settings.DESTINATIONS_ENCODED_VIEWS,
+            gzip_level=settings.DESTINATIONS_GZIP_LEVEL,
+            brotli_quality=settings.DESTINATIONS_BROTLI_QUALITY,
+            page_sizes=settings.DESTINATIONS_PAGE_SIZES,
+            max_adhoc_views=settings.DESTINATIONS_ADHOC_VIEWS,
+            adhoc_gzip_level=settings.DESTINATIONS_ADHOC_GZIP_LEVEL
+        )
+
+        # Built before an in-memory catalog is published; a disk-backed catalog builds it on
+        # first use, since it reads every document
+        self._similarity: Optional[SimilarityIndex] = None
+        self._similarity_lock = threading.Lock()
+
+    def _at(self, positions) -> List[Dict[str, Any]]:
+        return [self.destinations[int(pos)] for pos in positions]
+
+    def get(self, destination_id: str) -> Optional[Dict[str, Any]]:
+        """Destination by ID, or None."""
+        pos = self._positions.get(destination_id)
+        return None if pos is None else self.destinations[pos]
+
+    def find(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """Destination by ID or name (case- and whitespace-insensitive), or None."""
+        pos = self._positions.get(name_or_id)
+        if pos is None:
+            pos = self._names.get(name_key(name_or_id))
+        return None if pos is None else self.destinations[pos]
+
+    def directory(self) -> List[Tuple[str, Optional[str]]]:
+        """(id, name key) of every destination with an id, without reading the documents."""
+        names = {pos: name for name, pos in self._names.items()}
+        return [(dest_id, names.get(pos)) for dest_id, pos in self._positions.items()]
+
+    def with_tag(self, tag: str) -> List[Dict[str, Any]]:
+        """Destinations carrying a tag (case-insensitive), in catalog order."""
+        return self._at(self._by_tag.get(tag.lower(), ()))
+
+    def best_for(self, group: str) -> List[Dict[str, Any]]:
+        """Destinations recommended for a traveller group (case-insensitive), in catalog order."""
+        return self._at(self._by_best_for.get(group.lower(), ()))
+
+    def in_cost_range(self, min_cost: Optional[int] = None, max_cost: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Destinations whose daily cost is within [min_cost, max_cost], cheapest first."""
+        start = int(np.searchsorted(self._cost_keys, min_cost, side="left")) if min_cost is not None else 0
+        end = int(np.searchsorted(self._cost_keys, max_cost, side="right")) if max_cost is not None else len(self._cost_keys)
+        return self._at(self._by_cost[start:end])
+
+    @property
+    def similarity(self) -> SimilarityIndex:
+        """Nearest-neighbour index for this snapshot."""
+        if self._similarity is None:
+            with self._similarity_lock:
+                if self._similarity is None:
+                    settings = get_settings()
+                    self._similarity = SimilarityIndex(
+                        self.destinations,
+                        neighbours=settings.SIMILAR_DESTINATIONS_NEIGHBOURS,
+                        cost_weight=settings.SIMILAR_DESTINATIONS_COST_WEIGHT,
+                        precompute_limit=settings.SIMILAR_DESTINATIONS_PRECOMPUTE_LIMIT
+                    )
+        return self._similarity
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "backend": "sqlite" if isinstance(self.destinations, SQLiteCatalog) else "json",
+            "destinations": len(self.destinations),
+            "tags": len(self._by_tag),
+            "best_for_groups": len(self._by_best_for),
+            "checksum": self.checksum[:12],
+            "loaded_at": self.loaded_at,
+            "encoded": self.encoded.stats()
+        }
+
+
 class DestinationCache:
     """Singleton cache for destination data."""
-    
+
     _instance = None
-    _destinations: List[Dict[str, Any]] = []
-    _loaded = False
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._snapshot = DestinationSnapshot([], version=0)
+            cls._instance._loaded = False
+            cls._instance._reload_lock = threading.Lock()
+            cls._instance._reload_listeners = []
+            cls._instance._watcher = None
+            cls._instance._file_state = None  # (mtime, size) of the last file read
         return cls._instance
-    
+
+    @property
+    def snapshot(self) -> DestinationSnapshot:
+        """Current published snapshot (hold on to it for a consistent view)."""
+        if not self._loaded:
+            self.load()
+        return self._snapshot
+
     def load(self) -> None:
-        """Load destinations from JSON file once."""
+        """Load the catalog once."""
         if self._loaded:
             return
-            
+        self._reload_from_disk()
+
+    def _read(self) -> Optional[Tuple[Sequence[Dict[str, Any]], str]]:
+        """Open the catalog file; None (logged) if unreadable."""
+        path = _source_path()
         try:
-            with open(DATA_PATH, "r", encoding="utf-8") as f:
-                self._destinations = json.load(f)
-            self._loaded = True
-            logger.info(f"Loaded {len(self._destinations)} destinations into cache")
+            stat = os.stat(path)
+            # Remember what was seen even if it fails to parse, so the watcher waits for the next edit
+            self._file_state = (stat.st_mtime, stat.st_size)
+            if get_settings().DESTINATION_CATALOG_BACKEND == "sqlite":
+                catalog = SQLiteCatalog(path)
+                return catalog, catalog.checksum
+            with open(path, "rb") as f:
+                raw = f.read()
+            destinations = json.loads(raw)
+            if not isinstance(destinations, list):
+                raise ValueError("expected a JSON list of destinations")
+            return destinations, hashlib.sha256(raw).hexdigest()
         except FileNotFoundError:
-            logger.error(f"Destinations file not found: {DATA_PATH}")
-            self._destinations = []
-        except json.JSONDecodeError as e:
+            logger.error(f"Destinations file not found: {path}")
+        except (json.JSONDecodeError, UnicodeDecodeError, ValueError) as e:
             logger.error(f"Invalid JSON in destinations file: {e}")
-            self._destinations = []
-    
-    def get_all(self) -> List[Dict[str, Any]]:
-        """Get all destinations."""
-        if not self._loaded:
-            self.load()
-        return self._destinations
-    
+        except (sqlite3.Error, KeyError) as e:
+            logger.error(f"Invalid destination catalog {path}: {e}")
+        return None
+
+    def _build(self) -> Optional[DestinationSnapshot]:
+        """Build the next snapshot off to the side; None if unreadable or unchanged."""
+        result = self._read()
+        if result is None:
+            return None
+        destinations, checksum = result
+        if self._loaded and checksum == self._snapshot.checksum:
+            if isinstance(destinations, SQLiteCatalog):
+                destinations.close()
+            return None
+        snapshot = DestinationSnapshot(destinations, version=self._snapshot.version + 1, checksum=checksum)
+        if not isinstance(destinations, SQLiteCatalog):
+            # Warm the similarity index off to the side so no request pays for it
+            snapshot.similarity
+        return snapshot
+
+    def _publish(self, snapshot: DestinationSnapshot) -> None:
+        # Single reference swap: readers see either the old or the new snapshot
+        previous, self._snapshot = self._snapshot, snapshot
+        self._loaded = True
+        logger.info(f"Loaded {len(snapshot.destinations)} destinations into cache (version {snapshot.version})")
+        if isinstance(previous.destinations, SQLiteCatalog):
+            # Its per-thread connections would otherwise stay open as long as anything references it
+            previous.destinations.close()
+
+    def _reload_from_disk(self) -> bool:
+        with self._reload_lock:
+            snapshot = self._build()
+            if snapshot is None:
+                # Keep serving the previous snapshot; an unreadable first load serves an empty catalog
+                self._loaded = True
+                return False
+            self._publish(snapshot)
+            return True
+
+    def get_all(self) -> Sequence[Dict[str, Any]]:
+        """Get all destinations (a list, or a read-on-demand SQLiteCatalog)."""
+        return self.snapshot.destinations
+
     def get_by_id(self, destination_id: str) -> Dict[str, Any] | None:
         """Get destination by ID."""
-        destinations = self.get_all()
-        for dest in destinations:
-            if dest.get("id") == destination_id:
-                return dest
-        return None
-    
+        return self.snapshot.get(destination_id)
+
+    def find(self, name_or_id: str) -> Dict[str, Any] | None:
+        """Get destination by ID or name."""
+        return self.snapshot.find(name_or_id)
+
+    def get_similarity_index(self) -> SimilarityIndex:
+        """Nearest-neighbour index for the loaded catalog."""
+        return self.snapshot.similarity
+
     def reload(self) -> None:
-        """Force reload of destinations data."""
-        self._loaded = False
-        self.load()
+        """Force reload of destinations data and notify listeners if it changed."""
+        if self._reload_from_disk():
+            self._notify()
+
+    async def reload_async(self) -> bool:
+        """Reload without blocking the event loop (indexes are built in a thread)."""
+        changed = await asyncio.to_thread(self._reload_from_disk)
+        if changed:
+            self._notify()
+        return changed
+
+    def _notify(self) -> None:
+        for listener in self._reload_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Destination reload listener failed: {e}")
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener` after every reload (e.g. to drop derived caches)."""
+        self._reload_listeners.append(listener)
+
+    def start_watching(self, interval: float) -> None:
+        """Poll the catalog file and hot-reload it when it changes."""
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch(interval))
+            logger.info(f"Watching {_source_path()} for changes every {interval}s")
+
+    async def stop_watching(self) -> None:
+        """Stop the file watcher (app shutdown)."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                stat = os.stat(_source_path())
+            except OSError:
+                continue
+            if (stat.st_mtime, stat.st_size) != self._file_state:
+                if await self.reload_async():
+                    logger.info(f"Hot-reloaded destinations (version {self._snapshot.version})")
 
 
 @lru_cache()
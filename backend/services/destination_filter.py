@@ -0,0 +1,178 @@
+"""
+TripIT Destination Filter
+
+Inverted index over the destination catalog for the planner's filters:
+region (domestic / nearby / international, or a country), interest (trip
+type or terrain) and budget tier. Each value maps to a boolean posting
+over the catalog, so a query is an intersection of a few postings, ranked
+by how many of the interest's tags a destination carries. Results are
+memoized per query; the index is rebuilt when the catalog reloads.
+"""
+
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.logging_config import get_logger
+from services.destination_cache import get_destination_cache
+from services.scoring import INTEREST_TAGS, TRAVEL_TYPE_TAGS
+
+logger = get_logger("destination_filter")
+
+HOME_COUNTRY = "india"
+REGIONS = ("domestic", "nearby", "international")
+
+# Same split as the planner's frontend filter (AITripPlanner location preference)
+NEARBY_COUNTRIES = frozenset({
+    "nepal", "bhutan", "sri lanka", "maldives", "thailand", "singapore", "uae",
+    "united arab emirates", "vietnam", "malaysia", "indonesia", "oman", "cambodia", "laos", "myanmar"
+})
+
+# Budget tier → daily cost range [min, max) in INR
+BUDGET_TIERS: Dict[str, Tuple[int, Optional[int]]] = {
+    "budget": (0, 2500),
+    "moderate": (2500, 4500),
+    "luxury": (4500, None)
+}
+
+# Planner option names → keys of the scoring tag maps
+INTEREST_ALIASES = {
+    "mountain": "mountains",
+    "cultural": "culture",
+    "countryside": "nature"
+}
+
+# Memoized query results per index
+_MAX_CACHED_QUERIES = 1024
+
+
+def destination_region(dest: Dict[str, Any]) -> str:
+    """Region of a destination: its own `region` field, else derived from its country."""
+    if dest.get("region"):
+        return str(dest["region"]).lower()
+    country = str(dest.get("country", "")).lower()
+    if country == HOME_COUNTRY:
+        return "domestic"
+    return "nearby" if country in NEARBY_COUNTRIES else "international"
+
+
+def budget_tier(daily_cost: float) -> Optional[str]:
+    """Budget tier whose range contains a daily cost."""
+    for tier, (low, high) in BUDGET_TIERS.items():
+        if daily_cost >= low and (high is None or daily_cost < high):
+            return tier
+    return None
+
+
+def interest_tags(interest: str) -> FrozenSet[str]:
+    """Tags that satisfy an interest (unknown interests match their own name as a tag)."""
+    key = INTEREST_ALIASES.get(interest, interest)
+    return frozenset(INTEREST_TAGS.get(key) or TRAVEL_TYPE_TAGS.get(key) or {key})
+
+
+class DestinationFilterIndex:
+    """Boolean postings per region, country, tag and budget tier over one catalog."""
+
+    def __init__(self, destinations: Sequence[Dict[str, Any]]):
+        self.source = destinations
+        self.names: List[str] = []
+        regions: Dict[str, List[int]] = {}
+        tags: Dict[str, List[int]] = {}
+        tiers: Dict[str, List[int]] = {}
+        for pos, dest in enumerate(destinations):
+            self.names.append(dest.get("name") or dest.get("id", ""))
+            regions.setdefault(destination_region(dest), []).append(pos)
+            if dest.get("country"):
+                regions.setdefault(str(dest["country"]).lower(), []).append(pos)
+            for tag in {tag.lower() for tag in dest.get("tags", [])}:
+                tags.setdefault(tag, []).append(pos)
+            tier = budget_tier(dest.get("base_cost_per_day", 3000))
+            if tier:
+                tiers.setdefault(tier, []).append(pos)
+
+        self.regions = {value: self._posting(rows) for value, rows in regions.items()}
+        self.tags = {value: self._posting(rows) for value, rows in tags.items()}
+        self.tiers = {value: self._posting(rows) for value, rows in tiers.items()}
+        self._results: Dict[Tuple[Optional[str], ...], Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _posting(self, rows: List[int]) -> np.ndarray:
+        posting = np.zeros(len(self.names), dtype=bool)
+        posting[rows] = True
+        return posting
+
+    def _interest_matches(self, interest: str) -> Optional[np.ndarray]:
+        """Per-destination count of the interest's tags; None if no destination has any of them."""
+        postings = [self.tags[tag] for tag in interest_tags(interest) if tag in self.tags]
+        if not postings:
+            return None
+        return np.sum(postings, axis=0, dtype=np.int32)
+
+    def query(
+        self,
+        location: Optional[str] = None,
+        interest: Optional[str] = None,
+        budget: Optional[str] = None
+    ) -> Tuple[str, ...]:
+        """
+        Names of destinations matching every given filter, best interest
+        match first (catalog order within ties). A free-text location or
+        interest the catalog knows nothing about doesn't filter.
+        """
+        key = (location, interest, budget)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        mask = np.ones(len(self.names), dtype=bool)
+        matches = None
+        empty = np.zeros(len(self.names), dtype=bool)
+        if location in self.regions or location in REGIONS:
+            mask &= self.regions.get(location, empty)
+        if budget in BUDGET_TIERS:
+            mask &= self.tiers.get(budget, empty)
+        if interest:
+            matches = self._interest_matches(interest)
+            if matches is not None:
+                mask &= matches > 0
+
+        rows = np.flatnonzero(mask)
+        if matches is not None:
+            rows = rows[np.argsort(-matches[rows], kind="stable")]
+        result = tuple(self.names[row] for row in rows)
+
+        if len(self._results) >= _MAX_CACHED_QUERIES:
+            self._results.clear()
+        self._results[key] = result
+        return result
+
+
+_index: Optional[DestinationFilterIndex] = None
+
+
+def get_filter_index(destinations: Sequence[Dict[str, Any]]) -> DestinationFilterIndex:
+    """Filter index for a destination list (rebuilt when the cache reloads)."""
+    global _index
+    if _index is None or _index.source is not destinations:
+        _index = DestinationFilterIndex(destinations)
+        logger.info(
+            f"Built destination filter index: {len(_index)} destinations, "
+            f"{len(_index.regions)} regions, {len(_index.tags)} tags, {len(_index.tiers)} budget tiers"
+        )
+    return _index
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() or None if value else None
+
+
+def get_filtered_destinations(
+    location_pref: Optional[str] = None,
+    interest_pref: Optional[str] = None,
+    budget_pref: Optional[str] = None
+) -> List[str]:
+    """Ranked names of catalog destinations matching the planner's location, interest and budget."""
+    index = get_filter_index(get_destination_cache().get_all())
+    return list(index.query(_normalize(location_pref), _normalize(interest_pref), _normalize(budget_pref)))
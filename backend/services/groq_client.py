@@ -6,22 +6,39 @@ AI integration layer with proper logging, validation, and error handling.
 
 import json
 import time
-import re
+import copy
+import math
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
+from contextlib import asynccontextmanager
 from functools import lru_cache
 
+from pydantic import ValidationError as PydanticValidationError
+
 from core.config import get_settings
 from core.logging_config import get_logger, log_ai_call
-from core.exceptions import AIGenerationError, AIValidationError
-from services.ai_schemas import ItinerarySchema, DayPlanSchema, CostBreakdownSchema
-
-# Import curated data
-try:
-    from data.curated_destinations import get_filtered_destinations
-except ImportError:
-    def get_filtered_destinations(*args, **kwargs):
-        return []
+from core.exceptions import AIGenerationError, AIValidationError, AIUnavailableError
+from services.ai_schemas import ItinerarySchema, DayPlanSchema, CostBreakdownSchema, ExplanationBatchSchema
+from services.json_extract import extract_json, load_json
+from services.ttl_cache import TTLCache
+from services.single_flight import SingleFlight
+from services.destination_cache import DestinationCache, get_destination_cache
+from services.destination_filter import budget_tier, get_filtered_destinations
+from services.llm_scheduler import LLMScheduler, CallType
+from services.circuit_breaker import CircuitBreaker
+from services.model_router import ModelRouter
+from services.chat_sessions import ChatSession, create_session_store, new_session_id
+from services.chat_intents import get_intent_index
+from services.suggestion_table import SuggestionTable, suggestion_key
+from services.itinerary_prompt import (
+    DAY_PLANS_KEY,
+    FORMAT_MARKER,
+    FRAGMENT_PROMPT,
+    ITINERARY_CHUNK_PROMPT,
+    ITINERARY_PROMPT,
+    expand_day_plan,
+    expand_itinerary
+)
 
 logger = get_logger("groq")
 settings = get_settings()
@@ -45,30 +62,270 @@ def get_groq_client() -> Optional[AsyncGroq]:
     if not HAS_GROQ or not settings.GROQ_API_KEY:
         return None
     if _groq_client is None:
-        _groq_client = AsyncGroq(api_key=settings.GROQ_API_KEY)
+        _groq_client = AsyncGroq(api_key=settings.GROQ_API_KEY, base_url=settings.GROQ_BASE_URL or None)
     return _groq_client
 
 
-def clean_json_response(content: str) -> str:
-    """Extract and clean JSON from LLM response."""
-    content = content.strip()
+# All outbound LLM calls go through one priority scheduler
+_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    requests_per_minute=settings.LLM_RPM_LIMIT,
+    tokens_per_minute=settings.LLM_TPM_LIMIT,
+    deadlines={
+        CallType.ITINERARY: settings.LLM_QUEUE_DEADLINE_ITINERARY,
+        CallType.CHAT: settings.LLM_QUEUE_DEADLINE_CHAT,
+        CallType.EXPLANATION: settings.LLM_QUEUE_DEADLINE_EXPLANATION,
+        CallType.SUGGESTION: settings.LLM_QUEUE_DEADLINE_SUGGESTION,
+    }
+)
+
+
+# Per-call-type model routing with SLO-based fallback
+_router = ModelRouter(
+    routes=settings.AI_MODEL_ROUTES,
+    default_model=settings.AI_MODEL,
+    window_seconds=settings.AI_ROUTER_WINDOW_SECONDS,
+    min_samples=settings.AI_ROUTER_MIN_SAMPLES
+)
+
+
+# Shared breaker: while open, every call type goes straight to its fallback
+_breaker = CircuitBreaker(
+    window_seconds=settings.BREAKER_WINDOW_SECONDS,
+    min_calls=settings.BREAKER_MIN_CALLS,
+    error_rate=settings.BREAKER_ERROR_RATE,
+    slow_call_seconds=settings.BREAKER_SLOW_CALL_SECONDS,
+    slow_call_rate=settings.BREAKER_SLOW_CALL_RATE,
+    open_seconds=settings.BREAKER_OPEN_SECONDS,
+    half_open_calls=settings.BREAKER_HALF_OPEN_CALLS
+)
+
+
+def _breaker_allows() -> bool:
+    """Consult the breaker before an LLM call (consumes a half-open probe)."""
+    return not settings.BREAKER_ENABLED or _breaker.allow_request()
+
+
+def _breaker_is_open() -> bool:
+    """True while the breaker rejects calls (does not consume a probe)."""
+    return settings.BREAKER_ENABLED and _breaker.is_open()
+
+
+def _record_llm_failure(error: Exception) -> None:
+    """Count provider failures; our own bad requests (4xx other than 429) don't trip the breaker."""
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int) and 400 <= status_code < 500 and status_code != 429:
+        return
+    _breaker.record_failure()
+
+
+def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Rough token estimate (~4 chars per token) used for TPM budgeting."""
+    return sum(len(message["content"]) for message in messages) // 4 + max_tokens
+
+
+async def _create_completion(client: AsyncGroq, call_type: CallType, **kwargs) -> Any:
+    """
+    Send a (non-streaming) completion through the circuit breaker, scheduler
+    and model router. Raises AIUnavailableError if the circuit is open or
+    the call is shed.
+    """
+    if not _breaker_allows():
+        raise AIUnavailableError("Circuit open")
     
-    # Remove markdown code blocks
-    if content.startswith("```"):
-        lines = content.split("\n")
-        # Remove first line (```json or ```)
-        lines = lines[1:]
-        # Remove last line if it's just ```)
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines)
+    estimated = _estimate_tokens(kwargs["messages"], kwargs.get("max_tokens", 0))
+    async with _scheduler.slot(call_type, estimated) as ticket:
+        model, timeout = _router.select(call_type)
+        start_time = time.monotonic()
+        try:
+            response = await client.chat.completions.create(model=model, timeout=timeout, **kwargs)
+        except Exception as e:
+            _record_llm_failure(e)
+            _router.record(model, (time.monotonic() - start_time) * 1000, ok=False)
+            raise
+        latency = time.monotonic() - start_time
+        _breaker.record_success(latency)
+        _router.record(model, latency * 1000, ok=True)
+        if response.usage:
+            ticket.used_tokens = response.usage.total_tokens
+        return response
+
+
+@asynccontextmanager
+async def _stream_completion(client: AsyncGroq, call_type: CallType, **kwargs) -> AsyncIterator[tuple]:
+    """
+    Open a streamed completion through the circuit breaker, scheduler and
+    model router. Yields (stream, ticket, model); the scheduler slot is held
+    and the upstream response stays open until the block exits, so leaving
+    early (e.g. on client disconnect) cancels the upstream request. The
+    breaker hears about the call once the stream has been read to the end
+    (success, with the time to open) or broke off with an error.
+    """
+    if not _breaker_allows():
+        raise AIUnavailableError("Circuit open")
     
-    # Try to find JSON object or array
-    json_match = re.search(r'(\{.*\}|\[.*\])', content, re.DOTALL)
-    if json_match:
-        content = json_match.group(1)
+    estimated = _estimate_tokens(kwargs["messages"], kwargs.get("max_tokens", 0))
+    async with _scheduler.slot(call_type, estimated) as ticket:
+        model, timeout = _router.select(call_type)
+        start_time = time.monotonic()
+        try:
+            stream = await client.chat.completions.create(model=model, timeout=timeout, stream=True, **kwargs)
+        except Exception as e:
+            _record_llm_failure(e)
+            _router.record(model, (time.monotonic() - start_time) * 1000, ok=False)
+            raise
+        open_latency = time.monotonic() - start_time
+        
+        try:
+            yield stream, ticket, model
+        except Exception as e:
+            _record_llm_failure(e)
+            _router.record(model, (time.monotonic() - start_time) * 1000, ok=False)
+            raise
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                await close()
+        _breaker.record_success(open_latency)
+        _router.record(model, (time.monotonic() - start_time) * 1000, ok=True)
+
+
+def _current_model(call_type: CallType) -> str:
+    """Model currently routed for a call type (for logging)."""
+    return _router.select(call_type)[0]
+
+
+# Itinerary responses cached on normalized trip parameters
+_itinerary_cache = TTLCache(
+    max_entries=settings.ITINERARY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ITINERARY_CACHE_TTL_SECONDS
+)
+
+# Identical LLM calls that are already in flight share one result
+_inflight = SingleFlight()
+
+# Itinerary validation retry/repair counters
+_itinerary_metrics = {
+    "retries": 0,
+    "repairs": 0,
+    "repaired": 0,
+    "repair_failures": 0,
+    "exhausted": 0
+}
+
+# Prompt/completion tokens across itinerary calls (incl. repairs and streams)
+_itinerary_tokens = {
+    "calls": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "max_tokens": 0
+}
+
+
+def _normalize_text(value: str) -> str:
+    """Lowercase and collapse whitespace for cache keys."""
+    return " ".join(value.lower().split())
+
+
+def _budget_bucket(budget: int) -> int:
+    """Bucket budgets on a log scale so nearby budgets share a cache entry."""
+    step = settings.ITINERARY_CACHE_BUDGET_STEP
+    if budget <= 0 or step <= 0:
+        return budget
+    return round(math.log(budget) / math.log1p(step))
+
+
+def _itinerary_cache_key(
+    destination: str,
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str,
+    travelers: int
+) -> tuple:
+    """Build the cache key for an itinerary request."""
+    return (
+        _normalize_text(destination),
+        days,
+        _budget_bucket(budget),
+        _normalize_text(travel_type),
+        _normalize_text(interest),
+        travelers
+    )
+
+
+def _rescale_itinerary(entry: Dict[str, Any], destination: str, budget: int) -> Dict[str, Any]:
+    """Copy a shared itinerary entry with a fresh ID and costs scaled to the exact budget."""
+    import uuid
+    
+    result = copy.deepcopy(entry["itinerary"])
+    result["id"] = str(uuid.uuid4())
+    result["destination"] = destination
     
-    return content.strip()
+    factor = budget / entry["budget"] if entry["budget"] else 1.0
+    if factor != 1.0:
+        for plan in result["day_plans"]:
+            plan["estimated_cost"] = round(plan["estimated_cost"] * factor)
+        result["cost_breakdown"] = {
+            key: round(value * factor) for key, value in result["cost_breakdown"].items()
+        }
+        result["total_cost"] = sum(result["cost_breakdown"].values())
+    
+    return result
+
+
+def get_ai_stats() -> Dict[str, Any]:
+    """Return counters for the AI layer (exposed on /health)."""
+    return {
+        "itinerary_cache": _itinerary_cache.stats(),
+        "single_flight": _inflight.stats(),
+        "itinerary_generation": dict(_itinerary_metrics),
+        "itinerary_tokens": _itinerary_token_stats(),
+        "scheduler": _scheduler.stats(),
+        "circuit_breaker": _breaker.stats(),
+        "model_router": _router.stats(),
+        "chat_sessions": {**_chat_sessions.stats(), **_chat_metrics},
+        "chat_streaming": _chat_stream_stats(),
+        "chat_intents": get_intent_index().stats(),
+        "suggestion_table": _suggestion_table.stats()
+    }
+
+
+def _itinerary_token_stats() -> Dict[str, Any]:
+    calls = _itinerary_tokens["calls"]
+    stats: Dict[str, Any] = dict(_itinerary_tokens)
+    for key in ("prompt_tokens", "completion_tokens", "max_tokens"):
+        stats[f"avg_{key}"] = round(_itinerary_tokens[key] / calls) if calls else 0
+    return stats
+
+
+def clean_json_response(content: str) -> str:
+    """Extract and clean JSON from LLM response."""
+    return extract_json(content)[0]
+
+
+def fallback_explanation(destination: str, days: int, travel_type: str, interest: str) -> str:
+    """Rule-based explanation; every text served without the LLM starts with this."""
+    return f"{destination} is perfect for your {days}-day {travel_type} trip with a focus on {interest}."
+
+
+# Explanations are shared across budgets in a band, so they name the budget only through
+# this placeholder; fill_budget() puts each request's own amount in
+BUDGET_PLACEHOLDER = "[BUDGET]"
+
+
+def fill_budget(explanation: str, budget: int) -> str:
+    """Explanation text with the request's budget in place of BUDGET_PLACEHOLDER."""
+    return explanation.replace(BUDGET_PLACEHOLDER, f"₹{budget:,}")
+
+
+def _budget_prompt(budget: int, days: int) -> str:
+    """Budget context for explanation prompts: a tier, not an amount the model could quote."""
+    tier = budget_tier(budget / max(1, days)) or "moderate"
+    return (
+        f"a {tier} budget (if you mention the traveller's budget amount, write it exactly as "
+        f"{BUDGET_PLACEHOLDER})"
+    )
 
 
 async def generate_explanation(
@@ -78,20 +335,41 @@ async def generate_explanation(
     travel_type: str,
     interest: str
 ) -> str:
-    """Generate AI explanation for why a destination is recommended."""
+    """
+    Generate AI explanation for why a destination is recommended. The budget
+    appears only as BUDGET_PLACEHOLDER (see fill_budget).
+    """
     client = get_groq_client()
     
     if not client:
-        return f"{destination} is perfect for your {days}-day {travel_type} trip with a focus on {interest}. Great value within your ₹{budget:,} budget."
+        return f"{fallback_explanation(destination, days, travel_type, interest)} Great value within your {BUDGET_PLACEHOLDER} budget."
     
+    key = ("explanation", destination, days, budget, _normalize_text(travel_type), _normalize_text(interest))
+    explanation, _ = await _inflight.do(
+        key,
+        lambda: _generate_explanation_llm(client, destination, days, budget, travel_type, interest)
+    )
+    return explanation
+
+
+async def _generate_explanation_llm(
+    client: AsyncGroq,
+    destination: str,
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str
+) -> str:
+    """Call Groq for a single destination explanation."""
     start_time = time.time()
     try:
         prompt = f"""Explain why {destination} is suitable for a {days}-day {travel_type} trip 
-with a budget of ₹{budget:,} and interest in {interest}.
+on {_budget_prompt(budget, days)} and interest in {interest}.
 Keep it concise (2-3 sentences max) and practical. Focus on unique experiences."""
 
-        response = await client.chat.completions.create(
-            model=settings.AI_MODEL,
+        response = await _create_completion(
+            client,
+            CallType.EXPLANATION,
             messages=[
                 {"role": "system", "content": "You are a friendly travel expert. Give concise, practical recommendations."},
                 {"role": "user", "content": prompt}
@@ -102,15 +380,18 @@ Keep it concise (2-3 sentences max) and practical. Focus on unique experiences."
         
         duration_ms = (time.time() - start_time) * 1000
         tokens = response.usage.total_tokens if response.usage else 0
-        log_ai_call(settings.AI_MODEL, tokens, duration_ms, success=True)
+        log_ai_call(response.model, tokens, duration_ms, success=True)
         
         return response.choices[0].message.content.strip()
         
+    except AIUnavailableError:
+        return fallback_explanation(destination, days, travel_type, interest)
+        
     except Exception as e:
         duration_ms = (time.time() - start_time) * 1000
-        log_ai_call(settings.AI_MODEL, 0, duration_ms, success=False, error=str(e))
+        log_ai_call(_current_model(CallType.EXPLANATION), 0, duration_ms, success=False, error=str(e))
         logger.error(f"Failed to generate explanation: {e}")
-        return f"{destination} is perfect for your {days}-day {travel_type} trip with a focus on {interest}."
+        return fallback_explanation(destination, days, travel_type, interest)
 
 
 async def generate_explanations_parallel(
@@ -134,6 +415,171 @@ async def generate_explanations_parallel(
     return await asyncio.gather(*tasks)
 
 
+async def generate_explanations_batch(
+    destinations: List[Dict[str, Any]],
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str
+) -> List[str]:
+    """
+    Generate explanations for multiple destinations in one completion.
+    Destinations missing from the response fall back to individual calls.
+    """
+    client = get_groq_client()
+    
+    if not client or len(destinations) <= 1:
+        return await generate_explanations_parallel(destinations, days, budget, travel_type, interest)
+    
+    key = (
+        "explanations",
+        tuple(dest["id"] for dest in destinations),
+        days,
+        budget,
+        _normalize_text(travel_type),
+        _normalize_text(interest)
+    )
+    try:
+        batch, _ = await _inflight.do(
+            key,
+            lambda: _generate_explanations_batch_llm(client, destinations, days, budget, travel_type, interest)
+        )
+    except AIUnavailableError:
+        # Shed: don't queue per-destination calls behind the same backlog
+        return [fallback_explanation(dest["name"], days, travel_type, interest) for dest in destinations]
+    
+    missing = [dest for dest in destinations if dest["id"] not in batch]
+    if missing:
+        logger.info(f"Batched explanations missing {len(missing)} of {len(destinations)}, falling back per destination")
+        fallback = await generate_explanations_parallel(missing, days, budget, travel_type, interest)
+        batch = {**batch, **{dest["id"]: text for dest, text in zip(missing, fallback)}}
+    
+    return [batch[dest["id"]] for dest in destinations]
+
+
+async def _generate_explanations_batch_llm(
+    client: AsyncGroq,
+    destinations: List[Dict[str, Any]],
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str
+) -> Dict[str, str]:
+    """Call Groq once for all explanations. Returns only the ids it got back."""
+    start_time = time.time()
+    try:
+        listing = "\n".join(f"- {dest['id']}: {dest['name']}" for dest in destinations)
+        prompt = f"""For a {days}-day {travel_type} trip on {_budget_prompt(budget, days)} and interest in {interest},
+explain why each destination below is suitable.
+{listing}
+
+Keep each explanation concise (2-3 sentences max) and practical. Focus on unique experiences.
+Return ONLY a JSON object mapping each destination id to its explanation, e.g. {{"goa": "..."}}"""
+
+        response = await _create_completion(
+            client,
+            CallType.EXPLANATION,
+            messages=[
+                {"role": "system", "content": "You are a friendly travel expert. Give concise, practical recommendations. Return ONLY valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=120 * len(destinations) + 30,
+            temperature=settings.AI_TEMPERATURE_CREATIVE
+        )
+        
+        duration_ms = (time.time() - start_time) * 1000
+        tokens = response.usage.total_tokens if response.usage else 0
+        log_ai_call(response.model, tokens, duration_ms, success=True)
+        
+        explanations, _ = load_json(response.choices[0].message.content.strip())
+        validated = ExplanationBatchSchema.model_validate({"explanations": explanations})
+        
+        wanted = {dest["id"] for dest in destinations}
+        return {dest_id: text for dest_id, text in validated.explanations.items() if dest_id in wanted}
+        
+    except AIUnavailableError:
+        raise
+        
+    except Exception as e:
+        duration_ms = (time.time() - start_time) * 1000
+        log_ai_call(_current_model(CallType.EXPLANATION), 0, duration_ms, success=False, error=str(e))
+        logger.error(f"Failed to generate batched explanations: {e}")
+        return {}
+
+
+ITINERARY_SYSTEM_PROMPT = "You are a professional travel planner. Generate realistic, budget-aware itineraries. Return ONLY valid JSON, no markdown."
+
+
+def _itinerary_max_tokens(days: int, travelers: int = 1) -> int:
+    """Output token budget for an itinerary (or fragment) covering `days` days."""
+    per_day = settings.ITINERARY_TOKENS_PER_DAY
+    if travelers > 2:
+        # Group trips get room/transport splits in accommodation and tips
+        per_day += settings.ITINERARY_TOKENS_PER_DAY_GROUP
+    return min(settings.ITINERARY_MAX_TOKENS, settings.ITINERARY_TOKENS_BASE + per_day * days)
+
+
+def _build_itinerary_prompt(
+    destination: str,
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str,
+    travelers: int
+) -> str:
+    """Build the user prompt for itinerary generation."""
+    return ITINERARY_PROMPT.format(
+        days=days, destination=destination, budget=budget, travelers=travelers,
+        travel_type=travel_type, interest=interest
+    )
+
+
+def _build_itinerary_chunk_prompt(
+    destination: str,
+    days: int,
+    start_day: int,
+    end_day: int,
+    chunk_budget: int,
+    travel_type: str,
+    interest: str,
+    travelers: int,
+    focus_activities: List[str],
+    used_activities: List[str]
+) -> str:
+    """Build the user prompt for one day range of a long itinerary."""
+    focus = f"\nFocus activities for these days: {', '.join(focus_activities)}" if focus_activities else ""
+    avoid = f"\nOther days of the trip already cover: {', '.join(used_activities)}. Do not repeat them." if used_activities else ""
+    return ITINERARY_CHUNK_PROMPT.format(
+        start_day=start_day, end_day=end_day, days=days, destination=destination,
+        span=end_day - start_day + 1, budget=chunk_budget, travelers=travelers,
+        travel_type=travel_type, interest=interest, focus=focus, avoid=avoid
+    )
+
+
+def _record_itinerary_usage(usage: Any, max_tokens: int) -> None:
+    """Accumulate prompt/completion tokens for itinerary calls."""
+    _itinerary_tokens["calls"] += 1
+    _itinerary_tokens["max_tokens"] += max_tokens
+    if usage is not None:
+        _itinerary_tokens["prompt_tokens"] += usage.prompt_tokens or 0
+        _itinerary_tokens["completion_tokens"] += usage.completion_tokens or 0
+
+
+def _build_itinerary_result(destination: str, days: int, validated: ItinerarySchema) -> Dict[str, Any]:
+    """Convert a validated LLM itinerary into the API response shape."""
+    import uuid
+    
+    return {
+        "id": str(uuid.uuid4()),
+        "destination": destination,
+        "days": days,
+        "total_cost": validated.total_cost,
+        "day_plans": [plan.model_dump() for plan in validated.day_plans],
+        "travel_tips": validated.travel_tips,
+        "cost_breakdown": validated.cost_breakdown.model_dump()
+    }
+
+
 async def generate_itinerary(
     destination: str,
     days: int,
@@ -143,96 +589,683 @@ async def generate_itinerary(
     travelers: int
 ) -> Dict[str, Any]:
     """Generate a complete day-wise itinerary using Groq LLM with validation."""
-    import uuid
-    
     client = get_groq_client()
     
     if not client:
         logger.info("No Groq client available, using fallback itinerary")
         return _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
     
+    cache_key = _itinerary_cache_key(destination, days, budget, travel_type, interest, travelers)
+    if settings.ITINERARY_CACHE_ENABLED:
+        cached = _itinerary_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Itinerary cache hit for {destination} ({days} days)")
+            return _rescale_itinerary(cached, destination, budget)
+    
+    if _breaker_is_open():
+        logger.info("Circuit open, using fallback itinerary")
+        return _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
+    
+    entry, shared = await _inflight.do(
+        ("itinerary",) + cache_key,
+        lambda: _generate_itinerary_llm(client, destination, days, budget, travel_type, interest, travelers, cache_key)
+    )
+    if shared:
+        # Coalesced callers get their own copy (fresh ID, own budget)
+        return _rescale_itinerary(entry, destination, budget)
+    return entry["itinerary"]
+
+
+async def _generate_itinerary_llm(
+    client: AsyncGroq,
+    destination: str,
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str,
+    travelers: int,
+    cache_key: tuple
+) -> Dict[str, Any]:
+    """
+    Call Groq with validation retries (chunked for long trips).
+    Returns {"budget", "itinerary"} so coalesced callers can rescale costs.
+    """
+    if days > settings.ITINERARY_CHUNK_DAYS:
+        validated = await _generate_itinerary_chunked(
+            client, destination, days, budget, travel_type, interest, travelers
+        )
+    else:
+        prompt = _build_itinerary_prompt(destination, days, budget, travel_type, interest, travelers)
+        validated = await _request_validated_itinerary(
+            client, prompt, destination, list(range(1, days + 1)),
+            max_tokens=_itinerary_max_tokens(days, travelers)
+        )
+    
+    if validated is None:
+        return {
+            "budget": budget,
+            "itinerary": _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
+        }
+    
+    itinerary = _build_itinerary_result(destination, days, validated)
+    entry = {"budget": budget, "itinerary": itinerary}
+    if settings.ITINERARY_CACHE_ENABLED:
+        _itinerary_cache.set(cache_key, copy.deepcopy(entry))
+    
+    return entry
+
+
+async def _request_validated_itinerary(
+    client: AsyncGroq,
+    prompt: str,
+    label: str,
+    expected_days: List[int],
+    max_tokens: int
+) -> Optional[ItinerarySchema]:
+    """
+    Request an itinerary JSON completion, retrying until it validates.
+    
+    When only some day plans or the cost breakdown are broken (or the
+    output was truncated after some complete days), the valid parts are
+    kept and only the broken fragments are re-requested.
+    """
     # Retry loop for LLM output validation
     last_error = None
     for attempt in range(settings.AI_MAX_RETRIES):
+        if attempt > 0:
+            _itinerary_metrics["retries"] += 1
         start_time = time.time()
         try:
-            prompt = f"""Create a realistic {days}-day travel itinerary for {destination}.
-Budget: ₹{budget:,} total for {travelers} travelers
-Travel style: {travel_type}
-Main interest: {interest}
-
-Return ONLY valid JSON in this exact format (no markdown, no explanation):
-{{
-  "day_plans": [
-    {{
-      "day": 1,
-      "title": "Day title",
-      "activities": ["Activity 1", "Activity 2", "Activity 3"],
-      "meals": ["Breakfast suggestion", "Lunch suggestion", "Dinner suggestion"],
-      "accommodation": "Hotel recommendation",
-      "estimated_cost": 5000,
-      "tips": "Helpful tip for this day"
-    }}
-  ],
-  "travel_tips": ["Tip 1", "Tip 2", "Tip 3"],
-  "cost_breakdown": {{
-    "accommodation": 10000,
-    "food": 8000,
-    "activities": 5000,
-    "transport": 3000
-  }}
-}}"""
-
-            response = await client.chat.completions.create(
-                model=settings.AI_MODEL,
+            response = await _create_completion(
+                client,
+                CallType.ITINERARY,
                 messages=[
-                    {"role": "system", "content": "You are a professional travel planner. Generate realistic, budget-aware itineraries. Return ONLY valid JSON, no markdown."},
+                    {"role": "system", "content": ITINERARY_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=1500,
+                max_tokens=max_tokens,
                 temperature=settings.AI_TEMPERATURE_STRUCTURED  # Lower temp for structured output
             )
             
             duration_ms = (time.time() - start_time) * 1000
             tokens = response.usage.total_tokens if response.usage else 0
+            _record_itinerary_usage(response.usage, max_tokens)
             
             content = response.choices[0].message.content.strip()
-            content = clean_json_response(content)
+            validated = await _validate_itinerary_output(client, prompt, content, expected_days, label)
             
-            # Parse and validate with Pydantic
-            raw_data = json.loads(content)
-            validated = ItinerarySchema.model_validate(raw_data)
-            
-            log_ai_call(settings.AI_MODEL, tokens, duration_ms, success=True)
-            logger.info(f"Generated itinerary for {destination} on attempt {attempt + 1}")
+            log_ai_call(
+                response.model, tokens, duration_ms, success=True,
+                prompt_tokens=response.usage.prompt_tokens if response.usage else None,
+                completion_tokens=response.usage.completion_tokens if response.usage else None
+            )
+            logger.info(f"Generated itinerary for {label} on attempt {attempt + 1}")
+            return validated
             
-            return {
-                "id": str(uuid.uuid4()),
-                "destination": destination,
-                "days": days,
-                "total_cost": validated.total_cost,
-                "day_plans": [plan.model_dump() for plan in validated.day_plans],
-                "travel_tips": validated.travel_tips,
-                "cost_breakdown": validated.cost_breakdown.model_dump()
-            }
+        except AIUnavailableError as e:
+            # Circuit open: retrying would only fail again
+            last_error = e
+            break
             
         except json.JSONDecodeError as e:
             duration_ms = (time.time() - start_time) * 1000
-            log_ai_call(settings.AI_MODEL, 0, duration_ms, success=False, error=f"JSON parse error: {e}")
+            log_ai_call(_current_model(CallType.ITINERARY), 0, duration_ms, success=False, error=f"JSON parse error: {e}")
             logger.warning(f"Invalid JSON from LLM (attempt {attempt + 1}): {e}")
             last_error = e
             continue
             
         except Exception as e:
             duration_ms = (time.time() - start_time) * 1000
-            log_ai_call(settings.AI_MODEL, 0, duration_ms, success=False, error=str(e))
+            log_ai_call(_current_model(CallType.ITINERARY), 0, duration_ms, success=False, error=str(e))
             logger.warning(f"Error generating itinerary (attempt {attempt + 1}): {e}")
             last_error = e
             continue
     
     # All retries failed
-    logger.error(f"Failed to generate itinerary after {settings.AI_MAX_RETRIES} attempts: {last_error}")
-    return _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
+    _itinerary_metrics["exhausted"] += 1
+    logger.error(f"Failed to generate itinerary for {label} after {settings.AI_MAX_RETRIES} attempts: {last_error}")
+    return None
+
+
+async def _validate_itinerary_output(
+    client: AsyncGroq,
+    prompt: str,
+    content: str,
+    expected_days: List[int],
+    label: str
+) -> ItinerarySchema:
+    """
+    Parse and validate an itinerary completion (whole or cut off), repairing
+    broken or missing parts. Raises json.JSONDecodeError when no complete day
+    came through and AIValidationError when the repair fails.
+    """
+    # Parse, map compact keys to schema names, validate with Pydantic
+    try:
+        parsed, truncated = load_json(content)
+        raw_data = expand_itinerary(parsed)
+    except json.JSONDecodeError:
+        raw_data = None
+        truncated = True
+    
+    if truncated:
+        # Keep only the day objects that closed before the output broke off
+        closed_days = DayPlanStreamParser().feed(content)
+        if not closed_days:
+            raise json.JSONDecodeError("Truncated itinerary with no complete days", content, len(content))
+        if not isinstance(raw_data, dict):
+            raw_data = {}
+        raw_data["day_plans"] = [expand_day_plan(day) for day in closed_days]
+    
+    if isinstance(raw_data, dict):
+        _shift_chunk_days(raw_data.get("day_plans"), expected_days)
+    
+    validated = None
+    # A missing or empty cost breakdown is repaired like a broken day
+    if not truncated and isinstance(raw_data, dict) and _parse_cost_breakdown(raw_data.get("cost_breakdown")):
+        try:
+            validated = ItinerarySchema.model_validate(raw_data)
+        except PydanticValidationError:
+            pass
+        # Missing, repeated or extra days go through the repair too (it only calls the LLM for missing ones)
+        if validated is not None and [plan.day for plan in validated.day_plans] != expected_days:
+            validated = None
+    if validated is None:
+        validated = await _repair_itinerary(client, prompt, raw_data, expected_days, truncated, label)
+        if validated is None:
+            raise AIValidationError(f"Unrepairable itinerary output for {label}")
+    return validated
+
+
+def _shift_chunk_days(day_plans: Any, expected_days: List[int]) -> None:
+    """
+    A chunk asked for e.g. days 5-8 often comes back numbered 1-4. Shift
+    such day numbers onto the expected range (in place) so the days are
+    kept instead of being re-requested as missing.
+    """
+    offset = expected_days[0] - 1 if expected_days else 0
+    if offset <= 0 or not isinstance(day_plans, list):
+        return
+    numbered = [plan for plan in day_plans if isinstance(plan, dict) and type(plan.get("day")) is int]
+    numbers = [plan["day"] for plan in numbered]
+    if not numbers or min(numbers) != 1 or max(numbers) > len(expected_days):
+        return
+    for plan in numbered:
+        plan["day"] += offset
+
+
+async def _repair_itinerary(
+    client: AsyncGroq,
+    prompt: str,
+    raw_data: Any,
+    expected_days: List[int],
+    truncated: bool,
+    label: str
+) -> Optional[ItinerarySchema]:
+    """
+    Keep the valid parts of a broken itinerary and re-request only the
+    missing or invalid day plans and cost breakdown.
+    Returns None when nothing is worth keeping or the repair fails.
+    """
+    if not isinstance(raw_data, dict) or not isinstance(raw_data.get("day_plans"), list):
+        return None
+    
+    valid_days: Dict[int, Dict[str, Any]] = {}
+    for entry in raw_data["day_plans"]:
+        try:
+            plan = DayPlanSchema.model_validate(entry)
+        except PydanticValidationError:
+            continue
+        if plan.day in expected_days and plan.day not in valid_days:
+            valid_days[plan.day] = plan.model_dump()
+    
+    if not valid_days:
+        return None
+    
+    missing_days = [day for day in expected_days if day not in valid_days]
+    
+    cost_breakdown = None if truncated else _parse_cost_breakdown(raw_data.get("cost_breakdown"))
+    
+    travel_tips = raw_data.get("travel_tips")
+    if not isinstance(travel_tips, list):
+        travel_tips = []
+    
+    if missing_days or cost_breakdown is None:
+        _itinerary_metrics["repairs"] += 1
+        logger.info(
+            f"Repairing itinerary for {label}: days={missing_days}, "
+            f"cost_breakdown={cost_breakdown is None}"
+        )
+        
+        fragment = await _request_itinerary_fragment(
+            client, prompt, missing_days, need_costs=cost_breakdown is None, need_tips=not travel_tips
+        )
+        if fragment is None:
+            _itinerary_metrics["repair_failures"] += 1
+            return None
+        
+        for entry in fragment.get("day_plans") or []:
+            try:
+                plan = DayPlanSchema.model_validate(entry)
+            except PydanticValidationError:
+                continue
+            if plan.day in missing_days and plan.day not in valid_days:
+                valid_days[plan.day] = plan.model_dump()
+        
+        if cost_breakdown is None:
+            cost_breakdown = _parse_cost_breakdown(fragment.get("cost_breakdown"))
+        if not travel_tips and isinstance(fragment.get("travel_tips"), list):
+            travel_tips = fragment["travel_tips"]
+        
+        if any(day not in valid_days for day in expected_days) or cost_breakdown is None:
+            _itinerary_metrics["repair_failures"] += 1
+            return None
+    
+    try:
+        validated = ItinerarySchema.model_validate({
+            "day_plans": [valid_days[day] for day in sorted(valid_days)],
+            "travel_tips": travel_tips,
+            "cost_breakdown": cost_breakdown
+        })
+    except PydanticValidationError:
+        _itinerary_metrics["repair_failures"] += 1
+        return None
+    
+    _itinerary_metrics["repaired"] += 1
+    return validated
+
+
+def _parse_cost_breakdown(value: Any) -> Optional[Dict[str, int]]:
+    """Validated cost breakdown, or None if it is missing, invalid or all zero."""
+    if not isinstance(value, dict):
+        return None
+    try:
+        cost_breakdown = CostBreakdownSchema.model_validate(value).model_dump()
+    except PydanticValidationError:
+        return None
+    return cost_breakdown if any(cost_breakdown.values()) else None
+
+
+async def _request_itinerary_fragment(
+    client: AsyncGroq,
+    prompt: str,
+    missing_days: List[int],
+    need_costs: bool,
+    need_tips: bool
+) -> Optional[Dict[str, Any]]:
+    """Ask Groq for just the listed fragments of an itinerary."""
+    context = prompt.split(FORMAT_MARKER)[0].strip()
+    
+    wanted = []
+    if missing_days:
+        wanted.append(f'"dp" with ONLY days {", ".join(str(day) for day in missing_days)}')
+    if need_costs:
+        wanted.append('"cb" for the whole plan')
+    if need_tips:
+        wanted.append('"tt"')
+    
+    repair_prompt = FRAGMENT_PROMPT.format(context=context, wanted="; ".join(wanted))
+    max_tokens = _itinerary_max_tokens(len(missing_days))
+    
+    start_time = time.time()
+    try:
+        response = await _create_completion(
+            client,
+            CallType.ITINERARY,
+            messages=[
+                {"role": "system", "content": ITINERARY_SYSTEM_PROMPT},
+                {"role": "user", "content": repair_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=settings.AI_TEMPERATURE_STRUCTURED
+        )
+        
+        duration_ms = (time.time() - start_time) * 1000
+        tokens = response.usage.total_tokens if response.usage else 0
+        _record_itinerary_usage(response.usage, max_tokens)
+        log_ai_call(response.model, tokens, duration_ms, success=True)
+        
+        fragment = expand_itinerary(load_json(response.choices[0].message.content.strip())[0])
+        return fragment if isinstance(fragment, dict) else None
+        
+    except AIUnavailableError:
+        return None
+        
+    except Exception as e:
+        duration_ms = (time.time() - start_time) * 1000
+        log_ai_call(_current_model(CallType.ITINERARY), 0, duration_ms, success=False, error=str(e))
+        logger.warning(f"Itinerary repair request failed: {e}")
+        return None
+
+
+def _plan_itinerary_chunks(days: int) -> List[tuple]:
+    """Split a trip into (start_day, end_day) ranges of at most ITINERARY_CHUNK_DAYS."""
+    size = max(1, settings.ITINERARY_CHUNK_DAYS)
+    return [(start, min(start + size - 1, days)) for start in range(1, days + 1, size)]
+
+
+def _catalog_activities(destination: str) -> List[str]:
+    """Known activities for a destination from the catalog (empty if unknown)."""
+    dest = get_destination_cache().find(_normalize_text(destination))
+    return list(dest.get("activities", [])) if dest else []
+
+
+async def _generate_itinerary_chunked(
+    client: AsyncGroq,
+    destination: str,
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str,
+    travelers: int
+) -> Optional[ItinerarySchema]:
+    """
+    Generate a long itinerary as concurrent day ranges and merge them.
+    
+    Each chunk gets its share of the budget, its own slice of the catalog's
+    activities, and the activities assigned to the other chunks to avoid.
+    Chunks that fail are filled from the fallback itinerary.
+    """
+    ranges = _plan_itinerary_chunks(days)
+    activities = _catalog_activities(destination)
+    focus = [activities[i::len(ranges)] for i in range(len(ranges))]
+    
+    prompts = []
+    for i, (start_day, end_day) in enumerate(ranges):
+        chunk_budget = budget * (end_day - start_day + 1) // days
+        used_elsewhere = [a for j, chunk in enumerate(focus) if j != i for a in chunk]
+        prompts.append(_build_itinerary_chunk_prompt(
+            destination, days, start_day, end_day, chunk_budget,
+            travel_type, interest, travelers, focus[i], used_elsewhere
+        ))
+    
+    results = await asyncio.gather(*[
+        _request_validated_itinerary(
+            client, prompt, f"{destination} days {start_day}-{end_day}",
+            list(range(start_day, end_day + 1)),
+            max_tokens=_itinerary_max_tokens(end_day - start_day + 1, travelers)
+        )
+        for prompt, (start_day, end_day) in zip(prompts, ranges)
+    ])
+    
+    if all(result is None for result in results):
+        return None
+    
+    fallback = _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
+    day_plans: List[Dict[str, Any]] = []
+    travel_tips: List[str] = []
+    cost_breakdown = {key: 0 for key in CostBreakdownSchema.model_fields}
+    
+    for (start_day, end_day), result in zip(ranges, results):
+        span = end_day - start_day + 1
+        if result is None:
+            logger.warning(f"Using fallback days {start_day}-{end_day} for {destination}")
+            day_plans.extend(fallback["day_plans"][start_day - 1:end_day])
+            for key, value in fallback["cost_breakdown"].items():
+                cost_breakdown[key] += value * span // days
+            continue
+        
+        chunk_plans = [plan.model_dump() for plan in result.day_plans[:span]]
+        # Renumber so chunks line up even if the model restarted at day 1
+        for offset, plan in enumerate(chunk_plans):
+            plan["day"] = start_day + offset
+        day_plans.extend(chunk_plans)
+        day_plans.extend(fallback["day_plans"][start_day - 1 + len(chunk_plans):end_day])
+        
+        for key, value in result.cost_breakdown.model_dump().items():
+            cost_breakdown[key] += value
+        travel_tips.extend(tip for tip in result.travel_tips if tip not in travel_tips)
+    
+    return ItinerarySchema.model_validate({
+        "day_plans": day_plans,
+        "travel_tips": travel_tips[:5] or fallback["travel_tips"],
+        "cost_breakdown": cost_breakdown
+    })
+
+
+class DayPlanStreamParser:
+    """
+    Incrementally extract complete objects from the day plans array
+    of a streamed JSON completion.
+    """
+    
+    def __init__(self, array_keys: tuple = (DAY_PLANS_KEY, "day_plans")):
+        # Compact key first; the schema name still works if the model ignores it
+        self._array_keys = [f'"{key}"' for key in array_keys]
+        self._buffer = ""
+        self._pos = 0
+        self._array_found = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._obj_start = -1
+    
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Append streamed text and return any day objects that just closed."""
+        self._buffer += text
+        completed = []
+        
+        if self._done:
+            return completed
+        
+        if not self._array_found:
+            found = [i for i in (self._buffer.find(key) for key in self._array_keys) if i != -1]
+            if not found:
+                return completed
+            key_index = min(found)
+            bracket_index = self._buffer.find("[", key_index)
+            if bracket_index == -1:
+                return completed
+            self._array_found = True
+            self._pos = bracket_index + 1
+        
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._obj_start = i
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._obj_start >= 0:
+                    try:
+                        # Same lenient cleanup as the whole completion (e.g. trailing commas)
+                        completed.append(load_json(buffer[self._obj_start:i + 1])[0])
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping unparseable streamed day")
+                    self._obj_start = -1
+            elif char == "]" and self._depth == 0:
+                self._done = True
+                self._pos = i + 1
+                return completed
+        
+        self._pos = len(buffer)
+        return completed
+    
+    @property
+    def text(self) -> str:
+        """Full text received so far."""
+        return self._buffer
+
+
+async def stream_itinerary(
+    destination: str,
+    days: int,
+    budget: int,
+    travel_type: str,
+    interest: str,
+    travelers: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Generate an itinerary with a streamed completion.
+    
+    Yields {"event": "day", "data": day_plan} as soon as each day closes and
+    validates, then {"event": "complete", "data": itinerary} with the
+    cost breakdown and travel tips. The finished (or broken-off) output is
+    validated and repaired like a non-streamed completion; every day in
+    `complete` is sent as a day event first, with days the stream didn't
+    deliver (repaired, or from the fallback) following in day order.
+    """
+    client = get_groq_client()
+    
+    if not client:
+        logger.info("No Groq client available, streaming fallback itinerary")
+        async for event in _stream_complete_itinerary(
+            _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
+        ):
+            yield event
+        return
+    
+    if days > settings.ITINERARY_CHUNK_DAYS:
+        # Long trips are generated as concurrent chunks; replay the merged result
+        itinerary = await generate_itinerary(destination, days, budget, travel_type, interest, travelers)
+        async for event in _stream_complete_itinerary(itinerary):
+            yield event
+        return
+    
+    cache_key = _itinerary_cache_key(destination, days, budget, travel_type, interest, travelers)
+    if settings.ITINERARY_CACHE_ENABLED:
+        cached = _itinerary_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Itinerary cache hit for {destination} ({days} days, streaming)")
+            async for event in _stream_complete_itinerary(_rescale_itinerary(cached, destination, budget)):
+                yield event
+            return
+    
+    if _breaker_is_open():
+        logger.info("Circuit open, streaming fallback itinerary")
+        async for event in _stream_complete_itinerary(
+            _generate_fallback_itinerary(destination, days, budget, travel_type, interest)
+        ):
+            yield event
+        return
+    
+    parser = DayPlanStreamParser()
+    day_plans: List[Dict[str, Any]] = []
+    sent_days = set()
+    expected_days = list(range(1, days + 1))
+    tokens = 0
+    usage = None
+    stream_error: Optional[Exception] = None
+    max_tokens = _itinerary_max_tokens(days, travelers)
+    model = _current_model(CallType.ITINERARY)
+    prompt = _build_itinerary_prompt(destination, days, budget, travel_type, interest, travelers)
+    start_time = time.time()
+    
+    try:
+        messages = [
+            {"role": "system", "content": ITINERARY_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        async with _stream_completion(
+            client,
+            CallType.ITINERARY,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=settings.AI_TEMPERATURE_STRUCTURED
+        ) as (stream, ticket, model):
+            async for chunk in stream:
+                x_groq = getattr(chunk, "x_groq", None)
+                if x_groq is not None and getattr(x_groq, "usage", None):
+                    usage = x_groq.usage
+                    tokens = usage.total_tokens
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+            
+                for raw_day in parser.feed(delta):
+                    try:
+                        plan = DayPlanSchema.model_validate(expand_day_plan(raw_day)).model_dump()
+                    except Exception as e:
+                        logger.warning(f"Skipping invalid streamed day: {e}")
+                        continue
+                    if plan["day"] not in expected_days or plan["day"] in sent_days:
+                        logger.warning(f"Skipping out-of-range or repeated streamed day {plan['day']}")
+                        continue
+                    if len(day_plans) == 0:
+                        ttfd_ms = (time.time() - start_time) * 1000
+                        logger.info("First itinerary day streamed", extra={"duration_ms": ttfd_ms})
+                    day_plans.append(plan)
+                    sent_days.add(plan["day"])
+                    yield {"event": "day", "data": plan}
+            ticket.used_tokens = tokens or None
+            _record_itinerary_usage(usage, max_tokens)
+    except Exception as e:
+        stream_error = e
+        logger.warning(f"Itinerary stream broke off after {len(day_plans)} days: {e}")
+    
+    duration_ms = (time.time() - start_time) * 1000
+    if stream_error is None:
+        log_ai_call(
+            model, tokens, duration_ms, success=True,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None
+        )
+    else:
+        log_ai_call(model, tokens, duration_ms, success=False, error=str(stream_error))
+    
+    try:
+        # Same validation and repair as the non-streaming path; a broken-off stream keeps its closed days
+        validated = await _validate_itinerary_output(client, prompt, parser.text, expected_days, destination)
+    except Exception as e:
+        logger.warning(f"Streamed itinerary incomplete after {len(day_plans)} days: {e}")
+        itinerary = _merge_fallback_days(
+            _generate_fallback_itinerary(destination, days, budget, travel_type, interest),
+            day_plans
+        )
+        # Keep the days already sent and fill only the missing day numbers, in order, from the fallback
+        for plan in itinerary["day_plans"]:
+            if plan["day"] not in sent_days:
+                yield {"event": "day", "data": plan}
+    else:
+        itinerary = _build_itinerary_result(destination, days, validated)
+        if settings.ITINERARY_CACHE_ENABLED:
+            _itinerary_cache.set(cache_key, {"budget": budget, "itinerary": copy.deepcopy(itinerary)})
+        # Days the stream couldn't deliver on their own (unparseable, or added by the repair)
+        for plan in itinerary["day_plans"]:
+            if plan["day"] not in sent_days:
+                yield {"event": "day", "data": plan}
+    
+    yield {"event": "complete", "data": itinerary}
+
+
+async def _stream_complete_itinerary(itinerary: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Replay an already complete itinerary as stream events."""
+    for plan in itinerary["day_plans"]:
+        yield {"event": "day", "data": plan}
+    yield {"event": "complete", "data": itinerary}
+
+
+def _merge_fallback_days(fallback: Dict[str, Any], day_plans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fill a fallback itinerary with the LLM days already produced, and rescale
+    its cost breakdown (same split) to what the merged days cost.
+    """
+    generated = {plan["day"]: plan for plan in day_plans}
+    fallback["day_plans"] = [generated.get(plan["day"], plan) for plan in fallback["day_plans"]]
+    total = sum(plan["estimated_cost"] for plan in fallback["day_plans"])
+    fallback_total = sum(fallback["cost_breakdown"].values())
+    if generated and fallback_total > 0:
+        fallback["cost_breakdown"] = {
+            key: round(value * total / fallback_total) for key, value in fallback["cost_breakdown"].items()
+        }
+        fallback["total_cost"] = sum(fallback["cost_breakdown"].values())
+    return fallback
 
 
 def _generate_fallback_itinerary(destination: str, days: int, budget: int, travel_type: str, interest: str) -> Dict[str, Any]:
@@ -285,16 +1318,7 @@ def _generate_fallback_itinerary(destination: str, days: int, budget: int, trave
     }
 
 
-async def generate_chat_response(message: str) -> str:
-    """Generate a chat response for the travel assistant."""
-    client = get_groq_client()
-    
-    if not client:
-        return _get_fallback_chat_response(message)
-    
-    start_time = time.time()
-    try:
-        system_prompt = """You are TripIT, a friendly and knowledgeable AI travel assistant for Indian destinations.
+CHAT_SYSTEM_PROMPT = """You are TripIT, a friendly and knowledgeable AI travel assistant for Indian destinations.
 
 Your role:
 - Help users discover destinations in India
@@ -315,31 +1339,330 @@ Popular destinations you know well:
 
 Always encourage users to try the Trip Planner feature for personalized itineraries!"""
 
-        response = await client.chat.completions.create(
-            model=settings.AI_MODEL,
+CHAT_SUMMARY_PROMPT = "Summarize this travel-planning conversation in under {words} words. Keep the traveler's destinations, dates, budget, group size and preferences. Plain text only."
+
+# Server-side chat history (summary + recent turns) per session id
+_chat_sessions = create_session_store(
+    settings.CHAT_SESSION_STORE,
+    max_sessions=settings.CHAT_SESSION_MAX_SESSIONS,
+    ttl_seconds=settings.CHAT_SESSION_TTL_SECONDS,
+    max_session_bytes=settings.CHAT_SESSION_MAX_BYTES
+)
+
+_chat_metrics = {
+    "summarizations": 0,
+    "summary_fallbacks": 0
+}
+
+# Streamed chat replies: time to first token and client cancellations
+_chat_stream_metrics = {
+    "streams": 0,
+    "cancelled": 0,
+    "first_tokens": 0,
+    "ttft_ms_total": 0.0
+}
+
+
+def _chat_messages(session: ChatSession, message: str) -> List[Dict[str, str]]:
+    """Prompt for the next turn: system prompt, rolling summary, recent turns."""
+    messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
+    if session.summary:
+        messages.append({"role": "system", "content": f"Conversation so far: {session.summary}"})
+    messages.extend(session.turns)
+    messages.append({"role": "user", "content": message})
+    return messages
+
+
+def _extractive_summary(summary: str, turns: List[Dict[str, str]]) -> str:
+    """Summary without the LLM: keep what the user said, newest last, within the size limit."""
+    said = [turn["content"] for turn in turns if turn["role"] == "user"]
+    text = " | ".join(([summary] if summary else []) + said)
+    max_chars = settings.CHAT_SUMMARY_MAX_TOKENS * 4
+    return text[-max_chars:]
+
+
+async def _summarize_turns(client: Optional[AsyncGroq], summary: str, turns: List[Dict[str, str]]) -> str:
+    """Fold turns into the running summary, falling back to an extractive summary."""
+    _chat_metrics["summarizations"] += 1
+    if client is None:
+        _chat_metrics["summary_fallbacks"] += 1
+        return _extractive_summary(summary, turns)
+    
+    transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+    if summary:
+        transcript = f"Earlier summary: {summary}\n{transcript}"
+    
+    start_time = time.time()
+    try:
+        response = await _create_completion(
+            client,
+            CallType.CHAT,
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": message}
+                {"role": "system", "content": CHAT_SUMMARY_PROMPT.format(words=settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4)},
+                {"role": "user", "content": transcript}
             ],
+            max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+            temperature=settings.AI_TEMPERATURE_STRUCTURED
+        )
+        
+        duration_ms = (time.time() - start_time) * 1000
+        tokens = response.usage.total_tokens if response.usage else 0
+        log_ai_call(response.model, tokens, duration_ms, success=True)
+        
+        return response.choices[0].message.content.strip()
+        
+    except Exception as e:
+        if not isinstance(e, AIUnavailableError):
+            duration_ms = (time.time() - start_time) * 1000
+            log_ai_call(_current_model(CallType.CHAT), 0, duration_ms, success=False, error=str(e))
+        logger.warning(f"Chat summarization failed, keeping extractive summary: {e}")
+        _chat_metrics["summary_fallbacks"] += 1
+        return _extractive_summary(summary, turns)
+
+
+async def _compact_chat_session(client: Optional[AsyncGroq], session: ChatSession, message: str) -> None:
+    """
+    Keep the next prompt under CHAT_CONTEXT_TOKEN_BUDGET by folding the
+    oldest turns into the summary. Recent turns that fit in half the budget
+    are kept verbatim.
+    """
+    budget = settings.CHAT_CONTEXT_TOKEN_BUDGET
+    if _estimate_tokens(_chat_messages(session, message), 0) <= budget:
+        return
+    
+    keep: List[Dict[str, str]] = []
+    kept_tokens = 0
+    for turn in reversed(session.turns):
+        turn_tokens = len(turn["content"]) // 4
+        if kept_tokens + turn_tokens > budget // 2:
+            break
+        keep.insert(0, turn)
+        kept_tokens += turn_tokens
+    # Start the kept window on a user turn
+    while keep and keep[0]["role"] != "user":
+        keep.pop(0)
+    
+    old_turns = session.turns[:len(session.turns) - len(keep)]
+    if old_turns:
+        session.summary = await _summarize_turns(client, session.summary, old_turns)
+        session.turns = keep
+    
+    # Hard guarantee: drop turns, then shorten the summary
+    while session.turns and _estimate_tokens(_chat_messages(session, message), 0) > budget:
+        session.turns.pop(0)
+    overflow = _estimate_tokens(_chat_messages(session, message), 0) - budget
+    if overflow > 0 and session.summary:
+        session.summary = session.summary[overflow * 4:]
+
+
+async def generate_chat_response(message: str, session_id: Optional[str] = None) -> str:
+    """
+    Generate a chat response for the travel assistant.
+    With a session id, earlier turns of the conversation are included.
+    """
+    client = get_groq_client()
+    
+    session = None
+    if session_id:
+        session = await _chat_sessions.get(session_id) or ChatSession(session_id=session_id)
+    
+    reply = _local_chat_answer(message)
+    if reply is None:
+        if session is not None:
+            await _compact_chat_session(client, session, message)
+        reply = await _chat_completion(client, session, message)
+    
+    if session is not None:
+        session.turns.append({"role": "user", "content": message})
+        session.turns.append({"role": "assistant", "content": reply})
+        await _chat_sessions.save(session)
+    
+    return reply
+
+
+async def stream_chat_response(message: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Stream a chat reply as text deltas.
+    Closing the generator early (client disconnect) closes the upstream
+    request; the turn is added to the session only if the reply finished.
+    """
+    client = get_groq_client()
+    
+    session = None
+    if session_id:
+        session = await _chat_sessions.get(session_id) or ChatSession(session_id=session_id)
+    
+    local = _local_chat_answer(message)
+    if local is not None:
+        deltas = _single_delta(local)
+    else:
+        if session is not None:
+            await _compact_chat_session(client, session, message)
+        deltas = _chat_stream_deltas(client, session, message)
+    
+    parts: List[str] = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield delta
+    finally:
+        # Close the upstream stream now rather than when the generator is collected
+        await deltas.aclose()
+    
+    if session is not None:
+        session.turns.append({"role": "user", "content": message})
+        session.turns.append({"role": "assistant", "content": "".join(parts).strip()})
+        await _chat_sessions.save(session)
+
+
+async def _chat_stream_deltas(
+    client: Optional[AsyncGroq],
+    session: Optional[ChatSession],
+    message: str
+) -> AsyncIterator[str]:
+    if not client:
+        yield _get_fallback_chat_response(message)
+        return
+    
+    if session is not None:
+        messages = _chat_messages(session, message)
+    else:
+        messages = [
+            {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+            {"role": "user", "content": message}
+        ]
+    
+    tokens = 0
+    ttft_ms = None
+    model = _current_model(CallType.CHAT)
+    start_time = time.time()
+    _chat_stream_metrics["streams"] += 1
+    
+    try:
+        async with _stream_completion(
+            client,
+            CallType.CHAT,
+            messages=messages,
+            max_tokens=200,
+            temperature=settings.AI_TEMPERATURE_CREATIVE
+        ) as (stream, ticket, model):
+            async for chunk in stream:
+                x_groq = getattr(chunk, "x_groq", None)
+                if x_groq is not None and getattr(x_groq, "usage", None):
+                    tokens = x_groq.usage.total_tokens
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if ttft_ms is None:
+                    ttft_ms = (time.time() - start_time) * 1000
+                    _chat_stream_metrics["ttft_ms_total"] += ttft_ms
+                    _chat_stream_metrics["first_tokens"] += 1
+                yield delta
+            ticket.used_tokens = tokens or None
+        
+    except AIUnavailableError:
+        if ttft_ms is None:
+            yield _get_fallback_chat_response(message)
+        return
+        
+    except (asyncio.CancelledError, GeneratorExit):
+        _chat_stream_metrics["cancelled"] += 1
+        logger.info("Chat stream cancelled by client", extra={"duration_ms": (time.time() - start_time) * 1000})
+        raise
+        
+    except Exception as e:
+        duration_ms = (time.time() - start_time) * 1000
+        log_ai_call(model, tokens, duration_ms, success=False, error=str(e), ttft_ms=ttft_ms)
+        logger.error(f"Chat stream error: {e}")
+        if ttft_ms is None:
+            yield "I'd love to help you plan your trip! Try our Trip Planner above for personalized AI recommendations based on your budget and interests."
+        return
+    
+    duration_ms = (time.time() - start_time) * 1000
+    log_ai_call(model, tokens, duration_ms, success=True, ttft_ms=ttft_ms)
+
+
+def _chat_stream_stats() -> Dict[str, Any]:
+    first_tokens = _chat_stream_metrics["first_tokens"]
+    return {
+        "streams": _chat_stream_metrics["streams"],
+        "cancelled": _chat_stream_metrics["cancelled"],
+        "avg_ttft_ms": round(_chat_stream_metrics["ttft_ms_total"] / first_tokens, 1) if first_tokens else 0.0
+    }
+
+
+def _local_chat_answer(message: str) -> Optional[str]:
+    """Answer common catalog questions from the intent index (None = ask the LLM)."""
+    if not settings.CHAT_LOCAL_ANSWERS:
+        return None
+    return get_intent_index().answer(message, settings.CHAT_LOCAL_MIN_CONFIDENCE)
+
+
+async def _single_delta(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def resolve_chat_session(session_id: Optional[str]) -> str:
+    """
+    The session id to continue: the client's if the server issued it and it
+    is still live, otherwise a freshly issued one (a client can't pick an id).
+    """
+    if session_id and await _chat_sessions.get(session_id) is not None:
+        return session_id
+    return new_session_id()
+
+
+async def end_chat_session(session_id: str) -> None:
+    """Forget a chat session's history."""
+    await _chat_sessions.delete(session_id)
+
+
+async def _chat_completion(client: Optional[AsyncGroq], session: Optional[ChatSession], message: str) -> str:
+    if not client:
+        return _get_fallback_chat_response(message)
+    
+    if session is not None:
+        messages = _chat_messages(session, message)
+    else:
+        messages = [
+            {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+            {"role": "user", "content": message}
+        ]
+    
+    start_time = time.time()
+    try:
+        response = await _create_completion(
+            client,
+            CallType.CHAT,
+            messages=messages,
             max_tokens=200,
             temperature=settings.AI_TEMPERATURE_CREATIVE
         )
         
         duration_ms = (time.time() - start_time) * 1000
         tokens = response.usage.total_tokens if response.usage else 0
-        log_ai_call(settings.AI_MODEL, tokens, duration_ms, success=True)
+        log_ai_call(response.model, tokens, duration_ms, success=True)
         
         return response.choices[0].message.content.strip()
         
+    except AIUnavailableError:
+        return _get_fallback_chat_response(message)
+        
     except Exception as e:
         duration_ms = (time.time() - start_time) * 1000
-        log_ai_call(settings.AI_MODEL, 0, duration_ms, success=False, error=str(e))
+        log_ai_call(_current_model(CallType.CHAT), 0, duration_ms, success=False, error=str(e))
         logger.error(f"Chat error: {e}")
         return "I'd love to help you plan your trip! Try our Trip Planner above for personalized AI recommendations based on your budget and interests."
 
 
 def _get_fallback_chat_response(message: str) -> str:
-    """Fallback responses based on keywords."""
+    """Fallback responses from the intent index, then keywords."""
+    local = get_intent_index().lookup(message)
+    if local is not None:
+        return local
+    
     message_lower = message.lower()
     
     if any(word in message_lower for word in ['beach', 'goa', 'sea', 'ocean']):
@@ -356,16 +1679,15 @@ def _get_fallback_chat_response(message: str) -> str:
         return "I'd love to help you plan your perfect trip! Tell me what kind of experience you're looking for - beaches, mountains, heritage, adventure, or something else? Also let me know your approximate budget and duration!"
 
 
-async def generate_contextual_suggestions(
+def _suggestion_context(
     trip_type: str = None,
     terrain: str = None,
     budget: str = None,
     duration: str = None,
     location_pref: str = None,
     specific_location: str = None
-) -> list:
-    """Generate contextual suggestions based on user's current selections."""
-    
+) -> tuple:
+    """Build the (context, allowed destinations) strings for a suggestion prompt."""
     # Get relevant allowed destinations
     allowed_list = get_filtered_destinations(
         location_pref=location_pref,
@@ -389,15 +1711,65 @@ async def generate_contextual_suggestions(
     if specific_location:
         context_parts.append(f"specific destination: {specific_location}")
     
-    if not context_parts:
+    return ", ".join(context_parts), allowed_str
+
+
+async def generate_contextual_suggestions(
+    trip_type: str = None,
+    terrain: str = None,
+    budget: str = None,
+    duration: str = None,
+    location_pref: str = None,
+    specific_location: str = None
+) -> list:
+    """
+    Generate contextual suggestions based on user's current selections.
+    Planner selections are served from the precomputed table; only a free-text
+    specific location needs a live LLM call.
+    """
+    if not any([trip_type, terrain, budget, duration, location_pref, specific_location]):
         return ["✨ Select your preferences and I'll give you personalized tips!"]
     
-    context = ", ".join(context_parts)
+    if settings.SUGGESTION_TABLE_ENABLED and not specific_location:
+        key = suggestion_key(trip_type, terrain, budget, duration, location_pref)
+        if key is not None:
+            suggestions = _suggestion_table.get(key)
+            if suggestions is not None:
+                return list(suggestions)
+    
+    context, allowed_str = _suggestion_context(
+        trip_type, terrain, budget, duration, location_pref, specific_location
+    )
     client = get_groq_client()
     
     if not client:
         return _get_rule_based_suggestions(trip_type, terrain, budget, duration)
     
+    suggestions, _ = await _inflight.do(
+        ("suggestions", context.lower(), allowed_str),
+        lambda: _generate_suggestions_llm(client, context, allowed_str, trip_type, terrain, budget, duration)
+    )
+    return list(suggestions)
+
+
+async def _generate_suggestions_llm(
+    client: AsyncGroq,
+    context: str,
+    allowed_str: str,
+    trip_type: str = None,
+    terrain: str = None,
+    budget: str = None,
+    duration: str = None
+) -> list:
+    """Call Groq for contextual suggestions, falling back to rule-based tips."""
+    suggestions = await _request_suggestions(client, context, allowed_str)
+    if suggestions is None:
+        return _get_rule_based_suggestions(trip_type, terrain, budget, duration)
+    return suggestions
+
+
+async def _request_suggestions(client: AsyncGroq, context: str, allowed_str: str) -> Optional[list]:
+    """Call Groq for contextual suggestions; None if the call or its output fails."""
     start_time = time.time()
     try:
         prompt = f"""User's travel preferences: {context}
@@ -418,8 +1790,9 @@ Generate exactly 2-3 PRACTICAL travel suggestions. Follow these rules strictly:
 Return ONLY a JSON array of strings. Example:
 ["🏔️ Manali in May-June: Perfect for paragliding, budget ₹3000/day", "💡 Book hotels 2 weeks ahead for 30% savings"]"""
 
-        response = await client.chat.completions.create(
-            model=settings.AI_MODEL,
+        response = await _create_completion(
+            client,
+            CallType.SUGGESTION,
             messages=[
                 {"role": "system", "content": """You are an experienced Indian travel planner with 10+ years of expertise. 
 You give ONLY realistic, practical advice based on actual destinations, real costs, and genuine travel insights.
@@ -432,27 +1805,59 @@ Never make up destinations or unrealistic prices. Return ONLY a valid JSON array
         
         duration_ms = (time.time() - start_time) * 1000
         tokens = response.usage.total_tokens if response.usage else 0
-        log_ai_call(settings.AI_MODEL, tokens, duration_ms, success=True)
-        
-        content = response.choices[0].message.content.strip()
-        content = clean_json_response(content)
+        log_ai_call(response.model, tokens, duration_ms, success=True)
         
-        # Parse JSON array
-        if content.startswith("["):
-            suggestions = json.loads(content)
+        suggestions, _ = load_json(response.choices[0].message.content.strip())
+        if isinstance(suggestions, list):
             return suggestions[:3]
-        else:
-            return _get_rule_based_suggestions(trip_type, terrain, budget, duration)
+        return None
             
+    except AIUnavailableError:
+        return None
+        
     except Exception as e:
         duration_ms = (time.time() - start_time) * 1000
-        log_ai_call(settings.AI_MODEL, 0, duration_ms, success=False, error=str(e))
+        log_ai_call(_current_model(CallType.SUGGESTION), 0, duration_ms, success=False, error=str(e))
         logger.error(f"Suggestions error: {e}")
-        return _get_rule_based_suggestions(trip_type, terrain, budget, duration)
+        return None
+
+
+async def _refresh_suggestion_entry(key: tuple) -> Optional[list]:
+    """Regenerate one suggestion table entry (None keeps the stale entry)."""
+    client = get_groq_client()
+    if not client:
+        return None
+    context, allowed_str = _suggestion_context(*key)
+    return await _request_suggestions(client, context, allowed_str)
+
+
+# Precomputed suggestions for every planner selection (stale-while-revalidate)
+_suggestion_table = SuggestionTable(
+    path=settings.SUGGESTION_TABLE_PATH,
+    ttl_seconds=settings.SUGGESTION_TABLE_TTL_SECONDS,
+    seed=lambda key: _get_rule_based_suggestions(key[0], key[1], key[2], key[3]),
+    refresh=_refresh_suggestion_entry,
+    refresh_interval=settings.SUGGESTION_TABLE_REFRESH_INTERVAL
+)
+
+# Seeds are built from the catalog; rebuild them when it reloads
+DestinationCache().add_reload_listener(_suggestion_table.reseed)
+
+
+async def start_background_tasks() -> None:
+    """Load the suggestion table and start its refresh worker (app startup)."""
+    if settings.SUGGESTION_TABLE_ENABLED:
+        await asyncio.to_thread(_suggestion_table.load)
+        _suggestion_table.start(prewarm=settings.SUGGESTION_TABLE_PREWARM)
+
+
+async def stop_background_tasks() -> None:
+    """Stop background workers and persist their state (app shutdown)."""
+    await _suggestion_table.stop()
 
 
 def _get_rule_based_suggestions(trip_type=None, terrain=None, budget=None, duration=None) -> list:
-    """Fallback rule-based suggestions using curated data."""
+    """Fallback rule-based suggestions using the destination filter index."""
     import random
     
     suggestions = []
@@ -474,11 +1879,13 @@ def _get_rule_based_suggestions(trip_type=None, terrain=None, budget=None, durat
         else:
             return f"✨ {name}: A top recommendation for your trip"
 
-    # Get destinations matching criteria
+    # Get destinations matching criteria (best matches first), ignoring budget if nothing fits it
     candidates = get_filtered_destinations(
         location_pref=None,
-        interest_pref=terrain or trip_type
-    )
+        interest_pref=terrain or trip_type,
+        budget_pref=budget
+    ) or get_filtered_destinations(location_pref=None, interest_pref=terrain or trip_type)
+    candidates = candidates[:5]
     
     if candidates:
         picks = random.sample(candidates, min(2, len(candidates)))
@@ -0,0 +1,96 @@
+"""
+TripIT Itinerary Prompt
+
+Compact itinerary prompt templates. The model answers with short JSON keys
+(fewer input and output tokens than the pretty-printed schema example);
+expand_itinerary maps them back to ItinerarySchema field names.
+"""
+
+from typing import Any, Dict
+
+# Short key -> ItinerarySchema field
+ITINERARY_KEYS = {"dp": "day_plans", "tt": "travel_tips", "cb": "cost_breakdown"}
+DAY_PLAN_KEYS = {
+    "d": "day",
+    "t": "title",
+    "a": "activities",
+    "m": "meals",
+    "h": "accommodation",
+    "c": "estimated_cost",
+    "tip": "tips"
+}
+COST_KEYS = {"acc": "accommodation", "food": "food", "act": "activities", "tr": "transport"}
+
+# Key of the day plans array in compact output (used by the stream parser)
+DAY_PLANS_KEY = "dp"
+
+# Single line, so the model answers minified rather than pretty-printed
+ITINERARY_JSON_FORMAT = (
+    '{"dp":[{"d":1,"t":"day title","a":["activity","activity","activity"],'
+    '"m":["breakfast","lunch","dinner"],"h":"hotel","c":5000,"tip":"tip"}],'
+    '"tt":["tip","tip","tip"],"cb":{"acc":10000,"food":8000,"act":5000,"tr":3000}}'
+)
+
+# Marker that separates the trip context from the format instructions
+FORMAT_MARKER = "Return ONLY valid JSON"
+
+_FORMAT_INSTRUCTIONS = (
+    FORMAT_MARKER + ", minified, using these short keys "
+    "(d=day, t=title, a=activities, m=meals, h=hotel, c=day cost in INR, "
+    "tt=trip tips, cb=cost breakdown in INR):\n" + ITINERARY_JSON_FORMAT
+)
+
+
+def _compile(template: str) -> str:
+    """Escape the JSON example once so templates only need str.format."""
+    return template.replace(
+        "{format}", _FORMAT_INSTRUCTIONS.replace("{", "{{").replace("}", "}}")
+    )
+
+
+ITINERARY_PROMPT = _compile(
+    "Create a realistic {days}-day itinerary for {destination}.\n"
+    "Budget: ₹{budget:,} total for {travelers} travelers. "
+    "Style: {travel_type}. Interest: {interest}.\n"
+    "{format}"
+)
+
+ITINERARY_CHUNK_PROMPT = _compile(
+    "Create days {start_day}-{end_day} of a realistic {days}-day itinerary for {destination}.\n"
+    "Budget for these {span} days: ₹{budget:,} total for {travelers} travelers. "
+    "Style: {travel_type}. Interest: {interest}.{focus}{avoid}\n"
+    "Number the days {start_day}-{end_day}; cb covers only these days.\n"
+    "{format}"
+)
+
+FRAGMENT_PROMPT = _compile(
+    "{context}\n\n"
+    "Part of this itinerary is already done. Provide ONLY: {wanted}.\n"
+    "{format}"
+)
+
+
+def _expand_keys(data: Any, keys: Dict[str, str]) -> Any:
+    if not isinstance(data, dict):
+        return data
+    return {keys.get(key, key): value for key, value in data.items()}
+
+
+def expand_day_plan(data: Any) -> Any:
+    """Map a compact day plan to DayPlanSchema field names."""
+    return _expand_keys(data, DAY_PLAN_KEYS)
+
+
+def expand_itinerary(data: Any) -> Any:
+    """
+    Map compact itinerary output to ItinerarySchema field names.
+    Long-form keys pass through unchanged.
+    """
+    data = _expand_keys(data, ITINERARY_KEYS)
+    if not isinstance(data, dict):
+        return data
+    if isinstance(data.get("day_plans"), list):
+        data["day_plans"] = [expand_day_plan(plan) for plan in data["day_plans"]]
+    if "cost_breakdown" in data:
+        data["cost_breakdown"] = _expand_keys(data["cost_breakdown"], COST_KEYS)
+    return data
@@ -0,0 +1,231 @@
+"""
+TripIT JSON Extraction
+
+Linear-time extraction of a JSON value from LLM output.
+
+Handles markdown fences, prose around (or containing) braces, trailing
+commas and completions that were cut off mid-object.
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Start of a candidate JSON value (searched only between values)
+_OPENER = re.compile(r"[{\[]")
+
+# Structural tokens inside a value. Strings are matched whole in C so
+# braces inside them are skipped; an unterminated string runs to the end
+# and has no closing-quote group.
+_SCAN_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(")?|[{}\[\]]', re.DOTALL)
+_NORM_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(")?|[{}\[\],:]', re.DOTALL)
+
+# Cheap pre-check: only unparseable values that might hold a trailing comma get normalized
+_TRAILING_COMMA = re.compile(r",\s*[}\]]")
+
+# Splits text into outside / string body / outside / ... (only needed when strings hold escaped quotes)
+_STRING_SPLIT = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+_COMMA_BEFORE_CLOSER = re.compile(r",(?=\s*[}\]])")
+
+# Marks a value the fast path did not parse
+_UNPARSED = object()
+
+
+def _find_json_span(content: str) -> Tuple[int, int, bool]:
+    """
+    Locate the most likely JSON value in one linear pass.
+
+    Braces are only balanced inside a candidate value, and strings are only
+    tokenized there, so apostrophes or stray braces in surrounding prose
+    don't throw the scan off. The longest balanced top-level span wins; an
+    unclosed span that is longer still is returned as truncated.
+    Returns (start, end, truncated); start is -1 if nothing was found.
+    """
+    best_start, best_end = -1, -1
+    pos = 0
+
+    while True:
+        opener = _OPENER.search(content, pos)
+        if opener is None:
+            return best_start, best_end, False
+
+        start = opener.start()
+        depth = 0
+        for token in _SCAN_TOKEN.finditer(content, start):
+            char = token.group()[0]
+            if char == '"':
+                continue
+            if char == "{" or char == "[":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                if token.end() - start > best_end - best_start:
+                    best_start, best_end = start, token.end()
+                pos = token.end()
+                break
+        else:
+            # Ran out of input with the value still open
+            if len(content) - start > best_end - best_start:
+                return start, len(content), True
+            return best_start, best_end, False
+
+
+def _normalize_json(text: str, truncated: bool) -> str:
+    """Drop trailing commas and, if truncated, close the open structure."""
+    out: List[str] = []
+    stack: List[str] = []
+    expect_key = False
+    key_start: Optional[int] = None
+    last = 0
+
+    for token in _NORM_TOKEN.finditer(text):
+        out.append(text[last:token.start()])
+        last = token.end()
+        value = token.group()
+        char = value[0]
+
+        if char == '"':
+            if stack and stack[-1] == "}" and expect_key:
+                key_start = len(out)
+            out.append(value)
+            if token.group(1) is None:
+                # Unterminated string: close it and ignore anything after
+                out.append('"')
+                last = len(text)
+                break
+            continue
+
+        if char == "{" or char == "[":
+            stack.append(_CLOSERS[char])
+            expect_key = char == "{"
+            key_start = None
+        elif char == "}" or char == "]":
+            # Trailing comma before a closer
+            while out and not out[-1].strip():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+            expect_key = False
+            key_start = None
+        elif char == ",":
+            expect_key = bool(stack) and stack[-1] == "}"
+            key_start = None
+        else:  # ":"
+            expect_key = False
+            key_start = None
+        out.append(value)
+
+    out.append(text[last:])
+
+    if not truncated and not stack:
+        return "".join(out)
+
+    # A key with no value yet can't be completed; drop it
+    if stack and stack[-1] == "}" and expect_key and key_start is not None:
+        del out[key_start:]
+
+    result = "".join(out).rstrip()
+    while result.endswith(","):
+        result = result[:-1].rstrip()
+    if result.endswith(":"):
+        result += "null"
+
+    return result + "".join(reversed(stack))
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """
+    Drop commas before a closer outside strings. Splits out the strings and
+    substitutes once over the rest, so no per-token Python loop runs.
+    """
+    if "\0" in text:
+        return text
+    parts = _STRING_SPLIT.split(text) if '\\"' in text else text.split('"')
+    parts[::2] = _COMMA_BEFORE_CLOSER.sub("", "\0".join(parts[::2])).split("\0")
+    return '"'.join(parts)
+
+
+def _loads_lenient(span: str) -> Tuple[Any, Optional[str]]:
+    """
+    Parse a span strictly, then once more with trailing commas dropped (both
+    in C). Returns (value, text that parsed), or (None, None) if neither did.
+    """
+    try:
+        return json.loads(span), span
+    except ValueError:
+        pass
+    if _TRAILING_COMMA.search(span):
+        fixed = _strip_trailing_commas(span)
+        try:
+            return json.loads(fixed), fixed
+        except ValueError:
+            pass
+    return None, None
+
+
+def _extract(content: str) -> Tuple[str, bool, Any]:
+    """extract_json, plus the parsed value when a fast path already parsed it (else _UNPARSED)."""
+    content = content.strip()
+
+    # Prefer the contents of a markdown code block, even after leading prose
+    # (checked for a backtick first; the substring search is slow next to a clean parse)
+    fence = content.find("```") if "`" in content else -1
+    if fence != -1:
+        body_start = content.find("\n", fence)
+        if body_start != -1:
+            body_end = content.find("```", body_start)
+            content = content[body_start + 1:body_end if body_end != -1 else len(content)]
+
+    opener = _OPENER.search(content)
+    if opener is None:
+        return content.strip(), False, _UNPARSED
+
+    # Fast path: the span from the first opener to the last closer parses as is
+    # (or without trailing commas); only other completions pay for the token scan
+    end = max(content.rfind("}"), content.rfind("]")) + 1
+    if end > opener.start():
+        value, text = _loads_lenient(content[opener.start():end])
+        if text is not None:
+            return text, False, value
+
+    start, end, truncated = _find_json_span(content)
+    if start == -1:
+        return content.strip(), False, _UNPARSED
+
+    span = content[start:end]
+    if not truncated:
+        value, text = _loads_lenient(span)
+        if text is not None:
+            return text, False, value
+        if not _TRAILING_COMMA.search(span):
+            return span, False, _UNPARSED
+    return _normalize_json(span, truncated), truncated, _UNPARSED
+
+
+def extract_json(content: str) -> Tuple[str, bool]:
+    """
+    Extract the JSON value from an LLM completion.
+    Returns (json_text, truncated). If no JSON value is found, the stripped
+    content is returned unchanged so json.loads reports the error.
+    """
+    text, truncated, _ = _extract(content)
+    return text, truncated
+
+
+def load_json(content: str) -> Tuple[Any, bool]:
+    """
+    Extract and parse the JSON value from an LLM completion in one go (the
+    common clean completion is parsed once, not once here and again by the
+    caller). Returns (value, truncated); raises json.JSONDecodeError if no
+    value could be recovered.
+    """
+    text, truncated, value = _extract(content)
+    if value is _UNPARSED:
+        value = json.loads(text)
+    return value, truncated
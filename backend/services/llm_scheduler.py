@@ -0,0 +1,209 @@
+"""
+TripIT LLM Scheduler
+
+Owns all outbound Groq calls: token buckets for the provider's RPM/TPM
+limits, bounded concurrency, and priority queues so bursty low-value
+traffic (suggestions) can't starve itinerary generation. Low-priority
+calls that wait past their deadline are shed to the rule-based fallbacks.
+While the head of the queue waits for token budget, smaller calls the
+bucket can already afford go ahead of it, up to the head's own size.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from core.exceptions import AIOverloadedError
+from core.logging_config import get_logger
+
+logger = get_logger("scheduler")
+
+
+class CallType(IntEnum):
+    """LLM call types; lower value = higher priority."""
+    ITINERARY = 0
+    CHAT = 1
+    EXPLANATION = 2
+    SUGGESTION = 3
+
+
+class TokenBucket:
+    """Continuously refilling token bucket."""
+
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.tokens = capacity
+        self._last = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def take(self, amount: float) -> None:
+        if self.capacity > 0:
+            self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        if self.capacity > 0:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class Ticket:
+    """A granted scheduler slot. Set used_tokens to refund over-estimates."""
+
+    def __init__(self, call_type: CallType, estimated_tokens: int):
+        self.call_type = call_type
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: Optional[int] = None
+
+
+class _Waiter:
+    __slots__ = ("call_type", "tokens", "future", "passed_by")
+
+    def __init__(self, call_type: CallType, tokens: int, future: asyncio.Future):
+        self.call_type = call_type
+        self.tokens = tokens
+        self.future = future
+        # Tokens granted to calls that went ahead of this one while it waited at the head
+        self.passed_by = 0
+
+
+class LLMScheduler:
+    """Priority scheduler for LLM calls with rate limits and load shedding."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        deadlines: Dict[CallType, float]
+    ):
+        self.max_concurrency = max_concurrency
+        self.deadlines = deadlines
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute)
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._granted = {call_type: 0 for call_type in CallType}
+        self._shed = {call_type: 0 for call_type in CallType}
+
+    @asynccontextmanager
+    async def slot(self, call_type: CallType, estimated_tokens: int) -> AsyncIterator[Ticket]:
+        """
+        Wait for capacity, then hold a concurrency slot for the block.
+        Raises AIOverloadedError if the call type's queue deadline passes.
+        """
+        await self._acquire(call_type, estimated_tokens)
+        ticket = Ticket(call_type, estimated_tokens)
+        try:
+            yield ticket
+        finally:
+            if ticket.used_tokens is not None and ticket.used_tokens < estimated_tokens:
+                self._tokens.refund(estimated_tokens - ticket.used_tokens)
+            self._active -= 1
+            self._dispatch()
+
+    async def _acquire(self, call_type: CallType, estimated_tokens: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(call_type, estimated_tokens, future)
+        heapq.heappush(self._queue, (int(call_type), next(self._seq), waiter))
+        self._dispatch()
+
+        deadline = self.deadlines.get(call_type) or None
+        try:
+            await asyncio.wait_for(future, timeout=deadline)
+        except asyncio.TimeoutError:
+            self._shed[call_type] += 1
+            logger.warning(f"Shedding {call_type.name.lower()} call after {deadline:.1f}s in queue")
+            raise AIOverloadedError(f"LLM queue deadline exceeded for {call_type.name.lower()}")
+        except asyncio.CancelledError:
+            # Caller went away; give back a slot granted in the meantime
+            if future.done() and not future.cancelled():
+                self._active -= 1
+                self._dispatch()
+            raise
+
+    def _dispatch(self) -> None:
+        """Grant queued waiters in priority order while capacity allows."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue and self._active < self.max_concurrency:
+            _, _, waiter = self._queue[0]
+            if waiter.future.done():
+                # Timed out or cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+
+            request_wait = self._requests.wait_time(1)
+            token_wait = self._tokens.wait_time(waiter.tokens)
+            if request_wait == 0 and token_wait == 0:
+                heapq.heappop(self._queue)
+                self._grant(waiter)
+                continue
+
+            if request_wait == 0 and self._grant_smaller(waiter):
+                continue
+
+            # Head of line waits for the buckets; everything else waits behind it
+            self._timer = asyncio.get_running_loop().call_later(max(request_wait, token_wait), self._dispatch)
+            return
+
+    def _grant_smaller(self, head: _Waiter) -> bool:
+        """
+        Grant the first queued call (in priority order) that the token bucket
+        can afford now while the head waits for more. Calls passing the head
+        may take at most its own token count in total, so the head's wait grows
+        by at most the time to refill that much.
+        """
+        for entry in sorted(self._queue)[1:]:
+            waiter = entry[2]
+            if waiter.future.done() or head.passed_by + waiter.tokens > head.tokens:
+                continue
+            if self._tokens.wait_time(waiter.tokens) == 0:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                head.passed_by += waiter.tokens
+                self._grant(waiter)
+                return True
+        return False
+
+    def _grant(self, waiter: _Waiter) -> None:
+        self._requests.take(1)
+        self._tokens.take(waiter.tokens)
+        self._active += 1
+        self._granted[waiter.call_type] += 1
+        waiter.future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, active calls and per-type grant/shed counters."""
+        queued = {call_type.name.lower(): 0 for call_type in CallType}
+        for _, _, waiter in self._queue:
+            if not waiter.future.done():
+                queued[waiter.call_type.name.lower()] += 1
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queued": queued,
+            "granted": {call_type.name.lower(): n for call_type, n in self._granted.items()},
+            "shed": {call_type.name.lower(): n for call_type, n in self._shed.items()}
+        }
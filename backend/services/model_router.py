@@ -0,0 +1,121 @@
+"""
+TripIT Model Router
+
+Picks the Groq model for each call type from the routing table in
+settings, switching to the fallback model while the primary breaches its
+latency or failure-rate SLO.
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import ModelRoute
+from core.logging_config import get_logger
+from services.llm_scheduler import CallType
+
+logger = get_logger("router")
+
+
+class ModelStats:
+    """Rolling latency and failure samples for one model."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        # (timestamp, latency_ms, ok)
+        self._samples: deque = deque()
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        self._samples.append((time.monotonic(), latency_ms, ok))
+        self._expire()
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def summary(self) -> Dict[str, Any]:
+        self._expire()
+        latencies = sorted(latency for _, latency, ok in self._samples if ok)
+        total = len(self._samples)
+        failures = sum(1 for _, _, ok in self._samples if not ok)
+        return {
+            "calls": total,
+            "p50_ms": round(_percentile(latencies, 0.50), 1),
+            "p95_ms": round(_percentile(latencies, 0.95), 1),
+            "failure_rate": round(failures / total, 3) if total else 0.0
+        }
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+class ModelRouter:
+    """Route each call type to its primary or fallback model."""
+
+    def __init__(
+        self,
+        routes: Dict[str, ModelRoute],
+        default_model: str,
+        window_seconds: float = 120,
+        min_samples: int = 5
+    ):
+        self.routes = routes
+        self.default_model = default_model
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self._stats: Dict[str, ModelStats] = {}
+        self._using_fallback: Dict[str, bool] = {}
+
+    def _route(self, call_type: CallType) -> ModelRoute:
+        route = self.routes.get(call_type.name.lower())
+        if route is None:
+            route = ModelRoute(primary=self.default_model, fallback=self.default_model)
+        return route
+
+    def _stats_for(self, model: str) -> ModelStats:
+        if model not in self._stats:
+            self._stats[model] = ModelStats(self.window_seconds)
+        return self._stats[model]
+
+    def _breaches_slo(self, model: str, route: ModelRoute) -> bool:
+        summary = self._stats_for(model).summary()
+        if summary["calls"] < self.min_samples:
+            return False
+        return summary["p95_ms"] > route.slo_p95_ms or summary["failure_rate"] > route.max_failure_rate
+
+    def select(self, call_type: CallType) -> Tuple[str, float]:
+        """
+        Return (model, timeout_seconds) for a call type.
+        The primary's samples age out of the window while it is bypassed,
+        so traffic returns to it once the window has passed.
+        """
+        route = self._route(call_type)
+        use_fallback = self._breaches_slo(route.primary, route)
+
+        name = call_type.name.lower()
+        if use_fallback != self._using_fallback.get(name, False):
+            self._using_fallback[name] = use_fallback
+            target = route.fallback if use_fallback else route.primary
+            logger.warning(f"Routing {name} calls to {target}")
+
+        return (route.fallback if use_fallback else route.primary), route.timeout_seconds
+
+    def record(self, model: str, latency_ms: float, ok: bool) -> None:
+        self._stats_for(model).record(latency_ms, ok)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model rolling latency/failure stats and the active model per call type."""
+        active: Dict[str, Optional[str]] = {}
+        for call_type in CallType:
+            route = self._route(call_type)
+            fallback = self._using_fallback.get(call_type.name.lower(), False)
+            active[call_type.name.lower()] = route.fallback if fallback else route.primary
+        return {
+            "active": active,
+            "models": {model: stats.summary() for model, stats in self._stats.items()}
+        }
@@ -0,0 +1,96 @@
+"""
+TripIT Recommendation Cache
+
+Ranked top-N destinations and their explanations, memoized per preference
+bucket: normalized travel type and interest, trip length and a log-scale
+total-budget band. Cleared whenever the destination catalog reloads.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+from core.config import get_settings
+from core.logging_config import get_logger
+from services.destination_cache import get_destination_cache
+from services.single_flight import SingleFlight
+from services.ttl_cache import TTLCache
+
+logger = get_logger("recommendation_cache")
+
+# (top destinations, explanations)
+Recommendations = Tuple[List[Dict[str, Any]], List[str]]
+
+
+class RecommendationCache:
+    """
+    TTL/LRU cache of (top destinations, explanations) per preference bucket.
+
+    Concurrent misses for the same bucket share one computation. Results
+    computed against a catalog that has since been reloaded are not stored.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, budget_step: float):
+        self.budget_step = budget_step
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._inflight = SingleFlight()
+        self.generation = 0
+        self.invalidations = 0
+
+    def key(self, travel_type: str, interest: str, budget: int, days: int) -> Hashable:
+        """
+        Bucket key: same trip length, total budgets within ~budget_step of each
+        other share a band (the daily budget used for ranking follows from
+        both). Explanations quote the days; the budget is filled in per request.
+        """
+        band = round(math.log(max(1, budget)) / math.log1p(self.budget_step)) if self.budget_step > 0 else budget
+        return (" ".join(travel_type.lower().split()), " ".join(interest.lower().split()), days, band)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Tuple[List[Dict[str, Any]], List[str], bool]]]
+    ) -> Recommendations:
+        """
+        Cached recommendations for a bucket, else `compute()`, which returns
+        (destinations, explanations, cacheable). Uncacheable results (e.g.
+        rule-based explanations while the LLM is down) are returned but not stored.
+        """
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self.generation
+
+        async def compute_and_store() -> Recommendations:
+            destinations, explanations, cacheable = await compute()
+            if cacheable and generation == self.generation:
+                self._cache.set(key, (destinations, explanations))
+            return destinations, explanations
+
+        result, _ = await self._inflight.do((generation, key), compute_and_store)
+        return result
+
+    def invalidate(self) -> None:
+        """Drop every entry (called when the destination catalog reloads)."""
+        self.generation += 1
+        self.invalidations += 1
+        self._cache.clear()
+        logger.info("Recommendation cache invalidated after catalog reload")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for /health."""
+        return {**self._cache.stats(), "invalidations": self.invalidations, "single_flight": self._inflight.stats()}
+
+
+@lru_cache()
+def get_recommendation_cache() -> RecommendationCache:
+    """Get the recommendation cache, registered for catalog reloads."""
+    settings = get_settings()
+    cache = RecommendationCache(
+        max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+        budget_step=settings.RECOMMENDATION_CACHE_BUDGET_STEP
+    )
+    get_destination_cache().add_reload_listener(cache.invalidate)
+    return cache
@@ -3,126 +3,237 @@ TripIT Destination Scoring
 
 Improved scoring algorithm that heavily weights user preferences
 to ensure destinations matching user choices rank highest.
+
+The catalog is compiled once into columnar arrays (tags and best-for
+groups as bitmasks, costs as a float array) so scoring is a few vectorized
+operations plus a top-k partition instead of a per-destination loop.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
 from core.logging_config import get_logger
 
 logger = get_logger("scoring")
 
+# Travel type → tags (what type of experience)
+TRAVEL_TYPE_TAGS = {
+    "adventure": {"adventure", "mountains", "offbeat", "trekking", "rafting"},
+    "relaxation": {"relaxation", "nature", "backwaters", "lakes", "beach", "spa", "scenic"},
+    "culture": {"heritage", "culture", "spiritual", "temples", "history", "museums"},
+    "party": {"party", "beach", "nightlife", "urban"},
+    "romantic": {"romantic", "lakes", "nature", "scenic", "honeymoon", "luxury"},
+    "family": {"family", "heritage", "nature", "kid-friendly", "safe"},
+    "spiritual": {"spiritual", "temples", "pilgrimage", "yoga", "meditation"},
+    "foodie": {"food", "culture", "heritage", "markets", "urban"}
+}
+
+# Interest → tags (what terrain/environment)
+INTEREST_TAGS = {
+    "mountains": {"mountains", "hills", "trekking", "snow", "adventure", "scenic"},
+    "beach": {"beach", "coastal", "sea", "island", "water", "relaxation"},
+    "heritage": {"heritage", "culture", "history", "monuments", "forts", "museums"},
+    "nature": {"nature", "backwaters", "wildlife", "forests", "scenic", "lakes"},
+    "spiritual": {"spiritual", "temples", "pilgrimage", "religious", "yoga"},
+    "adventure": {"adventure", "offbeat", "trekking", "rafting", "sports"},
+    "city": {"city", "urban", "nightlife", "shopping", "food"}
+}
+
+
+class _BitVocabulary:
+    """Maps labels to bit positions; masks are (n, words) uint64 arrays."""
+
+    def __init__(self, rows: List[List[str]]):
+        self.bits: Dict[str, int] = {}
+        for labels in rows:
+            for label in labels:
+                self.bits.setdefault(label, len(self.bits))
+        self.words = max(1, (len(self.bits) + 63) // 64)
+        self.masks = np.zeros((len(rows), self.words), dtype=np.uint64)
+        for row, labels in enumerate(rows):
+            for label in labels:
+                bit = self.bits[label]
+                self.masks[row, bit // 64] |= np.uint64(1 << (bit % 64))
+
+    def query(self, labels) -> np.ndarray:
+        """Mask for a label set (labels outside the catalog are dropped)."""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for label in labels:
+            bit = self.bits.get(label)
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1 << (bit % 64))
+        return mask
+
+    def overlap(self, query: np.ndarray) -> np.ndarray:
+        """Number of query labels each row has, shape (1, rows)."""
+        return np.bitwise_count(self.masks & query).sum(axis=1, dtype=np.int64)[None, :]
+
+
+def _per_value(values: List[str], compute) -> np.ndarray:
+    """Stack compute(value) rows for each value, computing each distinct value once."""
+    rows = {value: compute(value)[0] for value in dict.fromkeys(values)}
+    return np.stack([rows[value] for value in values])
+
+
+class ScoringIndex:
+    """Columnar view of a destination list, compiled once per catalog load."""
+
+    def __init__(self, destinations: List[Dict[str, Any]]):
+        self.source = destinations
+        # One pass over the catalog (a disk-backed catalog decodes each document once)
+        columns = [
+            (
+                [tag.lower() for tag in dest.get("tags", [])],
+                [bf.lower() for bf in dest.get("best_for", [])],
+                dest.get("base_cost_per_day", 3000)
+            )
+            for dest in destinations
+        ]
+        self.tags = _BitVocabulary([tags for tags, _, _ in columns])
+        self.best_for = _BitVocabulary([best_for for _, best_for, _ in columns])
+        self.costs = np.array([cost for _, _, cost in columns], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def scores(self, daily_budget: float, travel_type: str, interest: str) -> np.ndarray:
+        """Score every destination for one query."""
+        return self.score_matrix([daily_budget], [travel_type], [interest])[0]
+
+    def score_matrix(self, daily_budgets: List[float], travel_types: List[str], interests: List[str]) -> np.ndarray:
+        """
+        Score every destination for many queries at once, shape (queries,
+        destinations). See score_destinations for the weights.
+        """
+        tags, best_for = self.tags, self.best_for
+        interest_overlap = _per_value(interests, lambda i: tags.overlap(tags.query(INTEREST_TAGS.get(i, set()))))
+        exact_interest = _per_value(interests, lambda i: tags.overlap(tags.query([i])))
+        type_overlap = _per_value(travel_types, lambda t: tags.overlap(tags.query(TRAVEL_TYPE_TAGS.get(t, set()))))
+        best_for_match = _per_value(travel_types, lambda t: best_for.overlap(best_for.query([t])))
+
+        score = np.minimum(40, interest_overlap * 20) + 15 * exact_interest
+        score += np.minimum(35, type_overlap * 15) + 10 * best_for_match
+
+        daily = np.asarray(daily_budgets, dtype=np.float64)[:, None]
+        ratio = self.costs[None, :] / daily
+        affordable = self.costs[None, :] <= daily
+        budget_points = np.select(
+            [
+                affordable & (ratio >= 0.5) & (ratio <= 0.8),
+                affordable & (ratio < 0.5),
+                affordable,
+                ratio <= 1.2
+            ],
+            [25, 15, 20, 5],
+            default=0
+        )
+        return np.clip(score + budget_points, 0, 100).astype(np.float64)
+
+
+_index: Optional[ScoringIndex] = None
+
+# Score-matrix cells per block in score_destinations_batch
+_BATCH_BLOCK_CELLS = 1 << 16
+
+
+def get_scoring_index(destinations: List[Dict[str, Any]]) -> ScoringIndex:
+    """Compiled index for a destination list (rebuilt when the cache reloads)."""
+    global _index
+    if _index is None or _index.source is not destinations:
+        _index = ScoringIndex(destinations)
+        logger.info(
+            f"Compiled scoring index: {len(_index)} destinations, "
+            f"{len(_index.tags.bits)} tags, {len(_index.best_for.bits)} best-for groups"
+        )
+    return _index
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, highest first, ties in catalog order
+    (the same order a stable descending sort gives).
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(len(scores))
+    # lexsort: last key is primary; indices break ties
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
 
 def score_destinations(
     destinations: List[Dict[str, Any]],
     budget: int,
     days: int,
     travel_type: str,
-    interest: str
+    interest: str,
+    limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Score destinations based on user preferences using weighted scoring.
-    Returns sorted list with scores (highest first).
-    
+    Returns the top `limit` destinations (all if None) with scores, highest first.
+
     Scoring weights:
     - Interest match: 40 points (highest priority - terrain preference)
     - Travel type match: 35 points
     - Budget fit: 25 points
     """
-    scored = []
+    if not destinations:
+        return []
     daily_budget = budget / days
     travel_type_lower = travel_type.lower()
     interest_lower = interest.lower()
-    
+
     logger.info(f"Scoring with: travel_type={travel_type_lower}, interest={interest_lower}, daily_budget={daily_budget:.0f}")
-    
-    # Travel type → tags (what type of experience)
-    travel_type_tags = {
-        "adventure": {"adventure", "mountains", "offbeat", "trekking", "rafting"},
-        "relaxation": {"relaxation", "nature", "backwaters", "lakes", "beach", "spa", "scenic"},
-        "culture": {"heritage", "culture", "spiritual", "temples", "history", "museums"},
-        "party": {"party", "beach", "nightlife", "urban"},
-        "romantic": {"romantic", "lakes", "nature", "scenic", "honeymoon", "luxury"},
-        "family": {"family", "heritage", "nature", "kid-friendly", "safe"},
-        "spiritual": {"spiritual", "temples", "pilgrimage", "yoga", "meditation"},
-        "foodie": {"food", "culture", "heritage", "markets", "urban"}
-    }
-    
-    # Interest → tags (what terrain/environment)
-    interest_tags = {
-        "mountains": {"mountains", "hills", "trekking", "snow", "adventure", "scenic"},
-        "beach": {"beach", "coastal", "sea", "island", "water", "relaxation"},
-        "heritage": {"heritage", "culture", "history", "monuments", "forts", "museums"},
-        "nature": {"nature", "backwaters", "wildlife", "forests", "scenic", "lakes"},
-        "spiritual": {"spiritual", "temples", "pilgrimage", "religious", "yoga"},
-        "adventure": {"adventure", "offbeat", "trekking", "rafting", "sports"},
-        "city": {"city", "urban", "nightlife", "shopping", "food"}
-    }
-    
-    # Get user preference tags
-    user_type_tags = travel_type_tags.get(travel_type_lower, set())
-    user_interest_tags = interest_tags.get(interest_lower, set())
-    
-    for dest in destinations:
-        score = 0.0
-        dest_tags = set(tag.lower() for tag in dest.get("tags", []))
-        dest_best_for = set(bf.lower() for bf in dest.get("best_for", []))
-        base_cost = dest.get("base_cost_per_day", 3000)
-        
-        # ========================================
-        # INTEREST MATCH (40 points max) - HIGHEST PRIORITY
-        # ========================================
-        # Direct terrain tag match (e.g., user wants "beach", dest has "beach")
-        interest_overlap = len(dest_tags.intersection(user_interest_tags))
-        if interest_overlap > 0:
-            score += min(40, interest_overlap * 20)  # 20 points per match, max 40
-        
-        # Direct interest keyword match
-        if interest_lower in dest_tags:
-            score += 15  # Bonus for exact match
-        
-        # ========================================  
-        # TRAVEL TYPE MATCH (35 points max)
-        # ========================================
-        type_overlap = len(dest_tags.intersection(user_type_tags))
-        if type_overlap > 0:
-            score += min(35, type_overlap * 15)  # 15 points per match, max 35
-        
-        # Best-for match bonus
-        if travel_type_lower in dest_best_for:
-            score += 10
-        
-        # ========================================
-        # BUDGET FIT (25 points max)
-        # ========================================
-        if base_cost <= daily_budget:
-            # Perfect fit: cost is 50-80% of daily budget
-            ratio = base_cost / daily_budget
-            if 0.5 <= ratio <= 0.8:
-                score += 25  # Sweet spot
-            elif ratio < 0.5:
-                score += 15  # Under budget (good but might be too cheap)
-            else:
-                score += 20  # Slightly over 80% but still affordable
-        else:
-            # Over budget penalty
-            over_ratio = base_cost / daily_budget
-            if over_ratio <= 1.2:
-                score += 5  # Slightly over, might stretch
-            # else: no points (too expensive)
-        
-        # ========================================
-        # NORMALIZE & CAP
-        # ========================================
-        score = max(0, min(100, score))
-        
-        scored.append({
-            **dest,
-            "score": round(score, 1)
-        })
-    
-    # Sort by score descending
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    
+
+    index = get_scoring_index(destinations)
+    scores = index.scores(daily_budget, travel_type_lower, interest_lower)
+    top = _top_k(scores, len(destinations) if limit is None else max(0, limit))
+
+    # Only the returned destinations are copied
+    scored = [{**destinations[i], "score": round(float(scores[i]), 1)} for i in top]
+
     # Log for debugging
     logger.info(f"Top scores: {[(d['name'], d['score'], d['tags']) for d in scored[:5]]}")
-    
+
     return scored
+
+
+def score_destinations_batch(
+    destinations: List[Dict[str, Any]],
+    queries: List[Dict[str, Any]],
+    limit: Optional[int] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    score_destinations for many preference sets in one matrix pass.
+    Each query has budget, days, travel_type and interest; results are in
+    query order and identical to scoring each query separately.
+    """
+    if not destinations or not queries:
+        return [[] for _ in queries]
+
+    index = get_scoring_index(destinations)
+    daily_budgets = [query["budget"] / query["days"] for query in queries]
+    travel_types = [query["travel_type"].lower() for query in queries]
+    interests = [query["interest"].lower() for query in queries]
+    k = len(destinations) if limit is None else max(0, limit)
+
+    # Score in row blocks that stay cache-sized on large catalogs
+    block = max(1, _BATCH_BLOCK_CELLS // len(destinations))
+    results = []
+    for start in range(0, len(queries), block):
+        end = start + block
+        scores = index.score_matrix(daily_budgets[start:end], travel_types[start:end], interests[start:end])
+        results.extend(
+            [{**destinations[i], "score": round(float(row[i]), 1)} for i in _top_k(row, k)]
+            for row in scores
+        )
+
+    logger.info(f"Batch-scored {len(queries)} queries against {len(destinations)} destinations")
+    return results
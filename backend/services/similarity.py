@@ -0,0 +1,156 @@
+"""
+TripIT Destination Similarity
+
+Nearest-neighbour index over destination tags, activities, best_for groups
+and daily cost. Built with each catalog snapshot (on first use for the
+SQLite backend); each destination's neighbours are computed once (up front
+for small catalogs, on first lookup for large ones), so lookups return a
+stored list. Cost-filtered lookups the stored list can't fill are scored
+against the whole catalog.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.logging_config import get_logger
+
+logger = get_logger("similarity")
+
+# Feature groups and their weight in the similarity
+FEATURE_WEIGHTS = {
+    "tags": 1.0,
+    "activities": 0.7,
+    "best_for": 0.5
+}
+
+
+class SimilarityIndex:
+    """
+    Sparse IDF-weighted feature vectors (inverted postings) plus log daily
+    cost. Similarity = (1 - cost_weight) * cosine(features) +
+    cost_weight * exp(-|log cost ratio|).
+
+    Memory and neighbour computation are linear in the catalog's total
+    feature count; no dense destination x feature matrix is built.
+    """
+
+    def __init__(
+        self,
+        destinations: List[Dict[str, Any]],
+        neighbours: int = 20,
+        cost_weight: float = 0.2,
+        precompute_limit: int = 2000
+    ):
+        self.destinations = destinations
+        self.neighbours = neighbours
+        self.cost_weight = cost_weight
+        self._positions: Dict[str, int] = {}
+        self._neighbours: Dict[int, List[Tuple[int, float]]] = {}
+
+        # Row features: (group, lowercased label), and daily costs, in one pass over the catalog
+        rows = []
+        costs = []
+        for dest in destinations:
+            rows.append({(group, str(label).lower()) for group in FEATURE_WEIGHTS for label in dest.get(group, [])})
+            costs.append(max(1, dest.get("base_cost_per_day", 3000)))
+            if dest.get("id"):
+                self._positions.setdefault(dest["id"], len(rows) - 1)
+        document_frequency: Dict[Tuple[str, str], int] = {}
+        for features in rows:
+            for feature in features:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+
+        count = len(destinations)
+        self._weights = {
+            feature: FEATURE_WEIGHTS[feature[0]] * (math.log((1 + count) / (1 + df)) + 1)
+            for feature, df in document_frequency.items()
+        }
+        postings: Dict[Tuple[str, str], List[int]] = {}
+        for row, features in enumerate(rows):
+            for feature in features:
+                postings.setdefault(feature, []).append(row)
+        self._postings = {feature: np.array(ids, dtype=np.int64) for feature, ids in postings.items()}
+        self._row_features = [sorted(features) for features in rows]
+        self._norms = np.array(
+            [math.sqrt(sum(self._weights[f] ** 2 for f in features)) or 1.0 for features in rows],
+            dtype=np.float64
+        )
+        self._costs = np.array(costs, dtype=np.float64)
+        self._log_costs = np.log(self._costs)
+
+        if count <= precompute_limit:
+            for row in range(count):
+                self._neighbours[row] = self._compute(row)
+
+    def __len__(self) -> int:
+        return len(self.destinations)
+
+    def _scores(self, row: int) -> np.ndarray:
+        """Similarity of every destination to one destination (itself excluded as -inf)."""
+        count = len(self.destinations)
+        features = self._row_features[row]
+        dot = np.zeros(count, dtype=np.float64)
+        if features:
+            rows = np.concatenate([self._postings[f] for f in features])
+            weights = np.concatenate([np.full(len(self._postings[f]), self._weights[f] ** 2) for f in features])
+            dot = np.bincount(rows, weights=weights, minlength=count)
+        cosine = dot / (self._norms * self._norms[row])
+        cost = np.exp(-np.abs(self._log_costs - self._log_costs[row]))
+        similarity = (1 - self.cost_weight) * cosine + self.cost_weight * cost
+        similarity[row] = -np.inf
+        return similarity
+
+    def _top(self, similarity: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """The k most similar candidates (finite scores only), best first, ties by position."""
+        k = min(k, int(np.isfinite(similarity).sum()))
+        if k <= 0:
+            return []
+        # Everything tied with the k-th score competes, so ties always go to the earlier position
+        kth = similarity[np.argpartition(-similarity, k - 1)[k - 1]]
+        top = np.flatnonzero(similarity >= kth)
+        top = top[np.lexsort((top, -similarity[top]))][:k]
+        return [(int(i), round(float(similarity[i]), 3)) for i in top]
+
+    def _compute(self, row: int) -> List[Tuple[int, float]]:
+        """Top neighbours of one destination, most similar first."""
+        return self._top(self._scores(row), self.neighbours)
+
+    def similar(
+        self,
+        destination_id: str,
+        limit: int = 5,
+        max_cost_per_day: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Most similar destinations (with a `similarity` score), or None if the
+        id is unknown. With a cost cap, the stored neighbours are used when
+        enough of them qualify; otherwise every destination within the cap
+        is scored.
+        """
+        row = self._positions.get(destination_id)
+        if row is None:
+            return None
+        neighbours = self._neighbours.get(row)
+        if neighbours is None:
+            neighbours = self._neighbours[row] = self._compute(row)
+
+        if max_cost_per_day is not None:
+            within = [(i, similarity) for i, similarity in neighbours if self._costs[i] <= max_cost_per_day]
+            if len(within) >= limit or len(neighbours) < self.neighbours:
+                # The stored list is the global top, so its qualifying prefix is the filtered top
+                neighbours = within
+            else:
+                similarity = self._scores(row)
+                similarity[self._costs > max_cost_per_day] = -np.inf
+                neighbours = self._top(similarity, limit)
+
+        return [{**self.destinations[i], "similarity": similarity} for i, similarity in neighbours[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "destinations": len(self.destinations),
+            "features": len(self._postings),
+            "computed": len(self._neighbours)
+        }
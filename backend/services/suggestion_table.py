@@ -0,0 +1,217 @@
+"""
+TripIT Suggestion Table
+
+Planner suggestions precomputed for every combination of the planner's
+enumerated selections. Lookups are a dict hit; stale entries are served
+immediately and refreshed in the background (stale-while-revalidate), and
+LLM-generated entries are persisted so they survive restarts.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.logging_config import get_logger
+
+logger = get_logger("suggestion_table")
+
+# Planner options (AITripPlanner.jsx); None = not selected yet
+SUGGESTION_OPTIONS: Dict[str, Tuple[Optional[str], ...]] = {
+    "trip_type": (None, "spiritual", "adventure", "relaxation", "cultural"),
+    "terrain": (None, "mountain", "beach", "city", "countryside"),
+    "budget": (None, "budget", "moderate", "luxury"),
+    "duration": (None, "weekend", "week", "twoweeks"),
+    "location_pref": (None, "domestic", "nearby", "international"),
+}
+
+SuggestionKey = Tuple[Optional[str], ...]
+
+_FORMAT_VERSION = 1
+
+
+def suggestion_key(
+    trip_type: Optional[str] = None,
+    terrain: Optional[str] = None,
+    budget: Optional[str] = None,
+    duration: Optional[str] = None,
+    location_pref: Optional[str] = None
+) -> Optional[SuggestionKey]:
+    """Table key for a selection, or None if any value is outside the planner's options."""
+    values = (trip_type, terrain, budget, duration, location_pref)
+    key = tuple(value.strip().lower() or None if value else None for value in values)
+    for value, options in zip(key, SUGGESTION_OPTIONS.values()):
+        if value not in options:
+            return None
+    return key
+
+
+def all_suggestion_keys() -> List[SuggestionKey]:
+    """Every combination with at least one selection."""
+    return [key for key in itertools.product(*SUGGESTION_OPTIONS.values()) if any(key)]
+
+
+class SuggestionTable:
+    """
+    In-memory suggestion table with background revalidation.
+
+    `seed(key)` builds a cheap placeholder (rule-based) for keys without a
+    generated entry; `refresh(key)` generates the real entry and returns
+    None on failure, leaving the stale entry in place.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        seed: Callable[[SuggestionKey], List[str]],
+        refresh: Callable[[SuggestionKey], Awaitable[Optional[List[str]]]],
+        refresh_interval: float = 2.0,
+        save_every: int = 10
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._seed = seed
+        self._refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.save_every = save_every
+        # key -> (suggestions, generated_at); generated_at 0 = seeded placeholder
+        self._entries: Dict[SuggestionKey, Tuple[List[str], float]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: set = set()
+        self._worker: Optional[asyncio.Task] = None
+        self._unsaved = 0
+        self.hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def load(self) -> None:
+        """Load persisted entries and seed every other combination."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == _FORMAT_VERSION:
+                for entry in data.get("entries", []):
+                    self._entries[tuple(entry["key"])] = (entry["suggestions"], entry["generated_at"])
+            logger.info(f"Loaded {len(self._entries)} persisted suggestion entries")
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable suggestion table {self.path}: {e}")
+
+        for key in all_suggestion_keys():
+            if key not in self._entries:
+                self._entries[key] = (self._seed(key), 0.0)
+
+    def reseed(self) -> None:
+        """Rebuild the seeded placeholders (e.g. after the destination catalog reloads)."""
+        seeded = [key for key, (_, generated_at) in self._entries.items() if generated_at == 0]
+        for key in seeded:
+            self._entries[key] = (self._seed(key), 0.0)
+        if seeded:
+            logger.info(f"Reseeded {len(seeded)} suggestion entries")
+
+    def save(self) -> None:
+        """Persist generated entries (seeds are rebuilt on load)."""
+        self._write(self._snapshot())
+
+    def _snapshot(self) -> Dict[str, Any]:
+        self._unsaved = 0
+        return {
+            "version": _FORMAT_VERSION,
+            "entries": [
+                {"key": list(key), "suggestions": suggestions, "generated_at": generated_at}
+                for key, (suggestions, generated_at) in self._entries.items()
+                if generated_at > 0
+            ]
+        }
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist suggestion table: {e}")
+
+    def get(self, key: SuggestionKey) -> Optional[List[str]]:
+        """Return the entry for a key, scheduling a refresh if it is stale."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        suggestions, generated_at = entry
+        if time.time() - generated_at > self.ttl_seconds:
+            self._schedule(key)
+        return suggestions
+
+    def _schedule(self, key: SuggestionKey) -> None:
+        if self._queue is None or key in self._queued:
+            return
+        self._queued.add(key)
+        self._queue.put_nowait(key)
+
+    def start(self, prewarm: bool = False) -> None:
+        """Start the background refresh worker (optionally queueing every stale key)."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        if prewarm:
+            now = time.time()
+            for key, (_, generated_at) in self._entries.items():
+                if now - generated_at > self.ttl_seconds:
+                    self._schedule(key)
+
+    async def stop(self) -> None:
+        """Stop the worker and persist pending updates."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._unsaved:
+            self.save()
+
+    async def _run(self) -> None:
+        while True:
+            key = await self._queue.get()
+            try:
+                suggestions = await self._refresh(key)
+            except Exception as e:
+                logger.warning(f"Suggestion refresh failed for {key}: {e}")
+                suggestions = None
+            finally:
+                self._queued.discard(key)
+
+            if suggestions:
+                self._entries[key] = (suggestions, time.time())
+                self.refreshes += 1
+                self._unsaved += 1
+                if self._unsaved >= self.save_every or self._queue.empty():
+                    await asyncio.to_thread(self._write, self._snapshot())
+            else:
+                self.refresh_failures += 1
+
+            # Pace background calls so they don't compete with user traffic
+            await asyncio.sleep(self.refresh_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return table coverage and refresh counters for /health."""
+        now = time.time()
+        generated = sum(1 for _, at in self._entries.values() if at > 0)
+        fresh = sum(1 for _, at in self._entries.values() if now - at <= self.ttl_seconds)
+        return {
+            "size": len(self._entries),
+            "generated": generated,
+            "fresh": fresh,
+            "hits": self.hits,
+            "queued": len(self._queued),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures
+        }
@@ -0,0 +1,75 @@
+"""Shared pytest setup: run from backend/ (python -m pytest) or anywhere via this path insert."""
+
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class FakeCompletions:
+    """Stand-in for AsyncGroq's chat.completions; `responder(kwargs)` returns the text or raises."""
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self.responder(kwargs)
+        usage = types.SimpleNamespace(total_tokens=100, prompt_tokens=60, completion_tokens=40)
+        if kwargs.get("stream"):
+            return FakeStream(content)
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=message)], usage=usage, model=kwargs["model"]
+        )
+
+
+class FakeStream:
+    """Streams text in small deltas; an Exception item in the content list is raised at that point."""
+
+    def __init__(self, content, size=7):
+        parts = content if isinstance(content, list) else [content]
+        self._items = []
+        for part in parts:
+            if isinstance(part, Exception):
+                self._items.append(part)
+            else:
+                self._items.extend(part[i:i + size] for i in range(0, len(part), size))
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for item in self._items:
+            if isinstance(item, Exception):
+                raise item
+            delta = types.SimpleNamespace(content=item)
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)], x_groq=None)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+    """
+    Route groq_client through a fake client with its own unlimited scheduler,
+    fresh breaker and no itinerary cache. Set `.responder` on the returned
+    FakeCompletions to script replies.
+    """
+    from services import groq_client
+    from services.circuit_breaker import CircuitBreaker
+    from services.llm_scheduler import LLMScheduler
+
+    completions = FakeCompletions(lambda kwargs: "")
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    monkeypatch.setattr(groq_client, "get_groq_client", lambda: client)
+    monkeypatch.setattr(groq_client, "_scheduler", LLMScheduler(8, 0, 0, {}))
+    monkeypatch.setattr(groq_client, "_breaker", CircuitBreaker())
+    monkeypatch.setattr(groq_client.settings, "ITINERARY_CACHE_ENABLED", False)
+    return completions
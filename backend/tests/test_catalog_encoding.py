@@ -0,0 +1,115 @@
+"""Tests for services.catalog_encoding and the /destinations endpoint."""
+
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.catalog_encoding import EncodedCatalog, negotiate_encoding, view_key
+
+DESTINATIONS = [
+    {"id": f"dest-{i}", "name": f"Destination {i}", "tags": ["beach"], "description": "Sun and sand " * 20}
+    for i in range(250)
+]
+
+
+@pytest.fixture
+def catalog():
+    return EncodedCatalog(DESTINATIONS, max_views=4, page_sizes=(20, 50), max_adhoc_views=2)
+
+
+def decoded(view, coding="gzip"):
+    coding, body = view.select(coding)
+    return json.loads(gzip.decompress(body) if coding == "gzip" else body)
+
+
+def test_view_key_normalizes_fields():
+    assert view_key(" name, id,name ,, ") == (("id", "name"), 0, None)
+    assert view_key(None, 40, 20) == ((), 40, 20)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0, identity", "identity"),
+    ("*", "gzip"),
+    ("", "identity"),
+    ("deflate;q=bad", "identity"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.parametrize("key, canonical", [
+    (((), 0, None), True),
+    (((), 40, 20), True),
+    (((), 100, 50), True),
+    (((), 30, 20), False),
+    (((), 0, 21), False),
+    (((), 260, 20), False),
+    (((), 20, None), False),
+    ((("name",), 0, None), False),
+])
+def test_only_whole_catalog_and_aligned_pages_are_canonical(catalog, key, canonical):
+    assert catalog.is_canonical(key) is canonical
+
+
+def test_views_round_trip(catalog):
+    assert decoded(catalog.view(((), 0, None))) == DESTINATIONS
+    assert decoded(catalog.view(((), 40, 20))) == DESTINATIONS[40:60]
+    assert decoded(catalog.view((("id",), 245, 10))) == [{"id": dest["id"]} for dest in DESTINATIONS[245:]]
+
+
+def test_adhoc_views_use_a_separate_small_cache(catalog):
+    canonical = catalog.view(((), 0, None))
+    for offset in range(5):
+        catalog.view((("name",), offset, 7))
+    assert catalog.stats()["adhoc_views"] == 2
+    assert catalog.stats()["adhoc_builds"] == 5
+    # Ad-hoc churn never evicts canonical views
+    assert catalog.cached(((), 0, None)) is canonical
+    assert catalog.stats()["builds"] == 1
+
+
+def test_adhoc_views_are_compressed_cheaply(catalog):
+    canonical = catalog.view(((), 0, None))
+    adhoc = catalog.view((("description", "id", "name", "tags"), 0, None))
+    assert decoded(adhoc) == decoded(canonical)
+    assert len(adhoc.variants["gzip"]) >= len(canonical.variants["gzip"])
+    assert "br" not in adhoc.variants
+
+
+def test_etags_differ_per_coding_and_match_if_none_match(catalog):
+    view = catalog.view(((), 0, 20))
+    assert view.etags["identity"] != view.etags["gzip"]
+    assert view.not_modified(view.etags["gzip"])
+    assert view.not_modified(f'"other", W/{view.etags["identity"]}')
+    assert view.not_modified("*")
+    assert not view.not_modified('"other"')
+    assert not view.not_modified(None)
+
+
+def test_tiny_bodies_are_not_compressed():
+    view = EncodedCatalog([{"id": "a"}]).view(((), 0, None))
+    assert view.select("gzip")[0] == "identity"
+
+
+def test_destinations_endpoint_revalidates():
+    from main import app
+
+    with TestClient(app) as client:
+        first = client.get("/api/destinations", headers={"Accept-Encoding": "gzip"})
+        assert first.status_code == 200
+        assert first.headers["content-encoding"] == "gzip"
+        assert int(first.headers["x-total-count"]) == len(first.json())
+
+        again = client.get(
+            "/api/destinations",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]}
+        )
+        assert again.status_code == 304
+        assert again.headers["etag"] == first.headers["etag"]
+
+        projected = client.get("/api/destinations?fields=name,id&limit=3")
+        assert projected.status_code == 200
+        assert [set(dest) for dest in projected.json()] == [{"id", "name"}] * 3
@@ -0,0 +1,162 @@
+"""Tests for services.catalog_store: the SQLite backend must behave like the JSON one."""
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from services.catalog_store import SQLiteCatalog, convert_json_catalog
+from services.destination_cache import DestinationSnapshot
+
+CATALOG = [
+    {"id": "goa", "name": "Goa", "tags": ["Beach", "nightlife"], "best_for": ["friends", "couples"],
+     "base_cost_per_day": 3500, "country": "India"},
+    {"id": "manali", "name": "Manali", "tags": ["mountains", "adventure"], "best_for": ["Adventure"],
+     "base_cost_per_day": 2500},
+    {"id": "jaipur", "name": "Jaipur  City", "tags": ["culture"], "best_for": ["family"],
+     "base_cost_per_day": 2500},
+    {"id": "kerala", "name": "Kerala", "tags": ["beach", "nature"], "base_cost_per_day": 4000,
+     "note": "Unicode ✓"},
+    {"name": "No Id Town", "tags": ["beach"], "base_cost_per_day": 1000},
+    {"id": "goa", "name": "Duplicate Goa", "tags": [], "base_cost_per_day": 9000},
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    json_path = tmp_path / "destinations.json"
+    db_path = tmp_path / "destinations.db"
+    json_path.write_text(json.dumps(CATALOG, ensure_ascii=False), encoding="utf-8")
+    assert convert_json_catalog(str(json_path), str(db_path)) == len(CATALOG)
+    return json_path, db_path
+
+
+@pytest.fixture
+def snapshots(paths):
+    json_path, db_path = paths
+    return (
+        DestinationSnapshot(json.loads(json_path.read_text(encoding="utf-8")), version=1),
+        DestinationSnapshot(SQLiteCatalog(str(db_path)), version=1),
+    )
+
+
+def test_sequence_behaviour(paths):
+    catalog = SQLiteCatalog(str(paths[1]), cache_size=2)
+    assert len(catalog) == len(CATALOG)
+    assert list(catalog) == CATALOG
+    assert catalog[-1] == CATALOG[-1]
+    assert catalog[np.int64(3)] == CATALOG[3]
+    assert catalog[1:4] == CATALOG[1:4]
+    assert catalog[::-2] == CATALOG[::-2]
+    with pytest.raises(IndexError):
+        catalog[len(CATALOG)]
+
+
+def test_cached_document_is_reused(paths):
+    catalog = SQLiteCatalog(str(paths[1]), cache_size=2)
+    assert catalog[0] is catalog[0]
+    catalog[1]
+    catalog[2]
+    assert len(catalog._docs) == 2
+
+
+@pytest.mark.parametrize("lookup", [
+    lambda s: s.get("goa"),
+    lambda s: s.get("missing"),
+    lambda s: s.find("Goa"),
+    lambda s: s.find("  jaipur   CITY "),
+    lambda s: s.find("kerala"),
+    lambda s: s.find("no id town"),
+    lambda s: s.find("nowhere"),
+    lambda s: s.with_tag("BEACH"),
+    lambda s: s.with_tag("unknown"),
+    lambda s: s.best_for("adventure"),
+    lambda s: s.in_cost_range(max_cost=2500),
+    lambda s: s.in_cost_range(min_cost=2500, max_cost=4000),
+    lambda s: s.in_cost_range(min_cost=5000),
+    lambda s: sorted(s.directory()),
+])
+def test_snapshot_lookups_match_json_backend(snapshots, lookup):
+    json_snapshot, sqlite_snapshot = snapshots
+    assert lookup(sqlite_snapshot) == lookup(json_snapshot)
+
+
+def test_first_id_occurrence_wins(snapshots):
+    for snapshot in snapshots:
+        assert snapshot.get("goa")["name"] == "Goa"
+
+
+def test_similarity_matches_json_backend(snapshots):
+    json_snapshot, sqlite_snapshot = snapshots
+    assert sqlite_snapshot.similarity.similar("goa") == json_snapshot.similarity.similar("goa")
+
+
+def test_concurrent_reads_share_the_document_cache(paths):
+    catalog = SQLiteCatalog(str(paths[1]), cache_size=3)
+    positions = [i % len(CATALOG) for i in range(3000)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        docs = list(pool.map(catalog.__getitem__, positions))
+    assert docs == [CATALOG[pos] for pos in positions]
+    assert len(catalog._docs) == 3
+
+
+def test_rejects_other_schema_versions(paths):
+    conn = sqlite3.connect(str(paths[1]))
+    conn.execute("UPDATE meta SET value = '1' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+    with pytest.raises(ValueError):
+        SQLiteCatalog(str(paths[1]))
+
+
+def test_close_closes_every_thread_connection(paths):
+    catalog = SQLiteCatalog(str(paths[1]))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(catalog.__getitem__, range(len(CATALOG))))
+    conns = list(catalog._conns)
+    assert len(conns) >= 2
+    catalog.close()
+    for conn in conns:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    # A reader still holding the catalog keeps working on one-off connections
+    assert catalog[len(CATALOG) - 1] == CATALOG[-1]
+    assert catalog.names()[0] == ("Goa", 0)
+    assert catalog._conns == []
+
+
+def test_reload_closes_replaced_and_discarded_catalogs(paths, monkeypatch):
+    from services import destination_cache
+
+    opened = []
+
+    class RecordingCatalog(SQLiteCatalog):
+        def __init__(self, path):
+            super().__init__(path)
+            opened.append(self)
+
+    settings = destination_cache.get_settings()
+    monkeypatch.setattr(settings, "DESTINATION_CATALOG_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "DESTINATION_CATALOG_DB_PATH", str(paths[1]))
+    monkeypatch.setattr(destination_cache, "SQLiteCatalog", RecordingCatalog)
+    cache = destination_cache.DestinationCache()
+    previous = cache._snapshot
+    try:
+        assert cache._reload_from_disk() is True
+        first = cache._snapshot.destinations
+        assert first is opened[0] and not first._closed
+
+        # Unchanged checksum: the catalog opened to check it is discarded
+        assert cache._reload_from_disk() is False
+        assert opened[1]._closed and not first._closed
+
+        # Changed catalog: the replaced one is closed after the swap
+        json_path, db_path = paths
+        json_path.write_text(json.dumps(CATALOG[:3]), encoding="utf-8")
+        convert_json_catalog(str(json_path), str(db_path))
+        assert cache._reload_from_disk() is True
+        assert cache._snapshot.destinations is opened[2] and first._closed
+    finally:
+        cache._publish(previous)
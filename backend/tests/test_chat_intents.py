@@ -0,0 +1,97 @@
+"""Tests for services.chat_intents.IntentIndex."""
+
+import pytest
+
+from services.chat_intents import IntentIndex
+
+DIRECTORY = [("goa", "goa"), ("manali", "manali"), ("jaipur", "jaipur"), ("nameless", None)]
+
+FAQ = {
+    "destinations": {"goa": {"aliases": ["panjim", "north goa"]}},
+    "faq": [{"id": "visa", "answer": "Indian citizens need no visa.", "patterns": ["visa", "need a visa"]}],
+}
+
+
+@pytest.fixture
+def index():
+    return IntentIndex(DIRECTORY, FAQ)
+
+
+@pytest.mark.parametrize("message, intent, destination", [
+    ("Best time to visit Goa?", "best_time", "goa"),
+    ("When should I go to Manali", "best_time", "manali"),
+    ("What's the budget for Jaipur?", "budget", "jaipur"),
+    ("things to do in panjim", "activities", "goa"),
+    ("how much does nameless cost", "budget", "nameless"),
+])
+def test_destination_questions_match_confidently(index, message, intent, destination):
+    match = index.match(message)
+    assert (match.intent, match.destination_id) == (intent, destination)
+    assert match.confidence == 1.0
+
+
+def test_multi_word_alias(index):
+    match = index.match("weather in north goa")
+    assert (match.destination_id, match.confidence) == ("goa", 1.0)
+
+
+def test_no_intent_returns_none(index):
+    assert index.match("Goa") is None
+    assert index.match("") is None
+
+
+def test_destination_intent_without_destination_has_zero_confidence(index):
+    match = index.match("best time to visit")
+    assert (match.intent, match.destination_id, match.confidence) == ("best_time", None, 0.0)
+
+
+@pytest.mark.parametrize("message", [
+    "flight to Goa cost",
+    "how much is a taxi from the airport in Goa",
+    "weather in Manali in July",
+])
+def test_unexplained_content_lowers_confidence(index, message):
+    assert index.match(message).confidence < 0.8
+
+
+def test_several_intents_or_destinations_lower_confidence(index):
+    assert index.match("best time and budget for Goa").confidence < 0.8
+    assert index.match("best time for Goa or Manali").confidence < 0.8
+
+
+def test_long_message_lowers_confidence(index):
+    message = "best time to visit goa " + "please " * 20
+    assert index.match(message).confidence < 0.8
+
+
+def test_faq_match(index):
+    match = index.match("Do I need a visa?")
+    assert (match.intent, match.destination_id, match.confidence) == ("faq:visa", None, 1.0)
+    assert index.answer("Do I need a visa?", min_confidence=0.8) == "Indian citizens need no visa."
+
+
+def test_faq_with_destination_goes_to_llm(index):
+    assert index.match("visa for Goa").confidence < 0.8
+    assert index.answer("visa for Goa", min_confidence=0.8) is None
+
+
+def test_catalog_reload_rebuilds_the_index_but_keeps_its_counters():
+    from services.chat_intents import get_intent_index
+    from services.destination_cache import DestinationCache
+
+    before = get_intent_index()
+    before.answer("best time to visit goa", min_confidence=0.8)
+    counts = {key: before.stats()[key] for key in ("queries", "local_answers")}
+    assert counts["queries"] >= 1
+
+    assert get_intent_index.cache_clear in DestinationCache()._reload_listeners
+    get_intent_index.cache_clear()
+    after = get_intent_index()
+    assert after is not before
+    assert {key: after.stats()[key] for key in ("queries", "local_answers")} == counts
+
+
+def test_standalone_indexes_count_separately():
+    first, second = IntentIndex(DIRECTORY, FAQ), IntentIndex(DIRECTORY, FAQ)
+    first.answer("Do I need a visa?", min_confidence=0.8)
+    assert (first.stats()["local_answers"], second.stats()["queries"]) == (1, 0)
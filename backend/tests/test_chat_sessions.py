@@ -0,0 +1,92 @@
+"""Tests for services.chat_sessions and how the chat endpoints issue and continue sessions."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.chat_sessions import ChatSession, InMemorySessionStore, new_session_id
+
+
+@pytest.fixture
+def store(monkeypatch):
+    from services import groq_client
+
+    store = InMemorySessionStore(max_sessions=100, ttl_seconds=60, max_session_bytes=4096)
+    monkeypatch.setattr(groq_client, "_chat_sessions", store)
+    monkeypatch.setattr(groq_client.settings, "CHAT_LOCAL_ANSWERS", False)
+    return store
+
+
+def test_store_hands_out_copies(store):
+    async def run():
+        await store.save(ChatSession(session_id="s", turns=[{"role": "user", "content": "hi"}]))
+        first = await store.get("s")
+        first.turns.append({"role": "assistant", "content": "hello"})
+        first.summary = "changed"
+        assert (await store.get("s")).turns == [{"role": "user", "content": "hi"}]
+        assert (await store.get("s")).summary == ""
+
+        # Mutating a session after saving it doesn't reach the stored copy either
+        first.turns.clear()
+        await store.save(first)
+        first.turns.append({"role": "user", "content": "late"})
+        assert (await store.get("s")).turns == []
+
+    asyncio.run(run())
+
+
+def test_concurrent_turns_on_one_session_stay_well_formed(store, monkeypatch):
+    from services import groq_client
+
+    async def slow_completion(client, session, message):
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return f"reply to {message}"
+
+    monkeypatch.setattr(groq_client, "_chat_completion", slow_completion)
+
+    async def run():
+        await store.save(ChatSession(session_id="s"))
+        replies = await asyncio.gather(*(
+            groq_client.generate_chat_response(f"message {i}", "s") for i in range(5)
+        ))
+        assert replies == [f"reply to message {i}" for i in range(5)]
+        turns = (await store.get("s")).turns
+        # Last save wins: one whole turn, never interleaved halves of several
+        assert len(turns) == 2
+        assert turns[1]["content"] == f"reply to {turns[0]['content']}"
+
+    asyncio.run(run())
+
+
+def test_session_ids_are_unguessable():
+    ids = {new_session_id() for _ in range(1000)}
+    assert len(ids) == 1000
+    assert all(len(session_id) >= 32 for session_id in ids)
+
+
+def test_unknown_session_id_is_replaced_by_an_issued_one(store, fake_groq):
+    from main import app
+
+    fake_groq.responder = lambda kwargs: "Try Goa."
+    with TestClient(app) as client:
+        first = client.post("/api/v1/chat", json={"message": "plan a beach trip"}).json()
+        issued = first["session_id"]
+        assert first["response"] == "Try Goa."
+
+        # The issued id continues the conversation
+        assert client.post("/api/v1/chat", json={"message": "and food?", "session_id": issued}).json()["session_id"] == issued
+        assert len(asyncio.run(store.get(issued)).turns) == 4
+
+        # A made-up id is not adopted, so it can't be used to reach anyone's history
+        made_up = client.post("/api/v1/chat", json={"message": "hello", "session_id": "victim"}).json()
+        assert made_up["session_id"] not in ("victim", issued)
+        assert asyncio.run(store.get("victim")) is None
+
+        stream = client.post("/api/v1/chat/stream", json={"message": "hi", "session_id": "victim"}).text
+        assert '"session_id": "victim"' not in stream
+        assert asyncio.run(store.get("victim")) is None
+
+        assert client.delete(f"/api/v1/chat/{issued}").status_code == 204
+        assert asyncio.run(store.get(issued)) is None
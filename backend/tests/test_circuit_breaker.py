@@ -0,0 +1,120 @@
+"""Tests for services.circuit_breaker state transitions."""
+
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def make_breaker(**overrides):
+    options = dict(
+        window_seconds=60, min_calls=4, error_rate=0.5, slow_call_seconds=10,
+        slow_call_rate=0.75, open_seconds=30, half_open_calls=2
+    )
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_opens_on_error_rate(clock):
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_opens_on_slow_call_rate(clock):
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    for _ in range(3):
+        breaker.record_success(12)
+    assert breaker.state == OPEN
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 61
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_admits_limited_probes(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_probes_close(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == HALF_OPEN
+    breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+@pytest.mark.parametrize("report", [
+    lambda breaker: breaker.record_failure(),
+    lambda breaker: breaker.record_success(12),
+])
+def test_failed_or_slow_probe_reopens(clock, report):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.allow_request()
+    report(breaker)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+
+
+def test_probes_that_never_report_are_replaced(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request() and breaker.allow_request()
+    assert not breaker.allow_request()
+    clock.now += 30
+    assert breaker.allow_request()
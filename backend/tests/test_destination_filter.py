@@ -0,0 +1,118 @@
+"""Tests for services.destination_filter: indexed queries match a plain filter over the catalog."""
+
+import itertools
+import json
+import os
+import random
+
+import pytest
+
+from services.destination_filter import (
+    BUDGET_TIERS,
+    INTEREST_ALIASES,
+    REGIONS,
+    DestinationFilterIndex,
+    budget_tier,
+    destination_region,
+    get_filter_index,
+    get_filtered_destinations,
+    interest_tags
+)
+from services.scoring import INTEREST_TAGS, TRAVEL_TYPE_TAGS
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "destinations.json")
+COUNTRIES = ["India", "Nepal", "Thailand", "France", "Japan", "UAE"]
+TAGS = sorted(set().union(*INTEREST_TAGS.values(), *TRAVEL_TYPE_TAGS.values()))
+
+
+def plain_filter(destinations, location=None, interest=None, budget=None):
+    """Reference: one pass over the catalog, ranked by matching interest tags, catalog order within ties."""
+    known_locations = set(REGIONS) | {destination_region(d) for d in destinations}
+    known_locations |= {str(d["country"]).lower() for d in destinations if d.get("country")}
+    wanted = interest_tags(interest) if interest else frozenset()
+    if not any(wanted & {t.lower() for t in d.get("tags", [])} for d in destinations):
+        wanted = frozenset()
+
+    matches = []
+    for dest in destinations:
+        if location in known_locations and location not in (
+            destination_region(dest), str(dest.get("country", "")).lower()
+        ):
+            continue
+        if budget in BUDGET_TIERS and budget_tier(dest.get("base_cost_per_day", 3000)) != budget:
+            continue
+        overlap = len(wanted & {t.lower() for t in dest.get("tags", [])})
+        if wanted and not overlap:
+            continue
+        matches.append((overlap, dest["name"]))
+    return tuple(name for _, name in sorted(matches, key=lambda item: -item[0]))
+
+
+def make_catalog(size, rng):
+    return [
+        {
+            "id": f"dest-{i}",
+            "name": f"Destination {i}",
+            "country": rng.choice(COUNTRIES),
+            "tags": [tag.title() if rng.random() < 0.2 else tag for tag in rng.sample(TAGS, rng.randint(1, 5))],
+            "base_cost_per_day": rng.randrange(1000, 9000, 250),
+        }
+        for i in range(size)
+    ]
+
+
+QUERIES = list(itertools.product(
+    [None, "domestic", "nearby", "international", "nepal", "atlantis"],
+    [None, "beach", "mountain", "cultural", "adventure", "volcano"],
+    [None, "budget", "moderate", "luxury", "lavish"]
+))
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return make_catalog(400, random.Random(9))
+
+
+def test_queries_match_a_plain_filter(catalog):
+    index = DestinationFilterIndex(catalog)
+    for query in QUERIES:
+        assert index.query(*query) == plain_filter(catalog, *query), query
+
+
+def test_real_catalog_queries_match_a_plain_filter():
+    with open(DATA_PATH, encoding="utf-8") as f:
+        destinations = json.load(f)
+    index = DestinationFilterIndex(destinations)
+    for query in QUERIES:
+        assert index.query(*query) == plain_filter(destinations, *query), query
+
+
+def test_region_field_overrides_country():
+    index = DestinationFilterIndex([
+        {"name": "Kathmandu", "country": "Nepal", "region": "Domestic"},
+        {"name": "Goa", "country": "India"},
+        {"name": "Paris", "country": "France"}
+    ])
+    assert index.query("domestic") == ("Kathmandu", "Goa")
+    assert index.query("nearby") == ()
+    assert index.query("nepal") == ("Kathmandu",)
+
+
+def test_interest_aliases_and_budget_tiers():
+    assert interest_tags("mountain") == interest_tags(INTEREST_ALIASES["mountain"])
+    assert interest_tags("volcano") == frozenset({"volcano"})
+    assert [budget_tier(cost) for cost in (0, 2499, 2500, 4499, 4500, 10 ** 6)] == [
+        "budget", "budget", "moderate", "moderate", "luxury", "luxury"
+    ]
+
+
+def test_results_are_memoized_per_index(catalog):
+    index = get_filter_index(catalog)
+    assert get_filter_index(catalog) is index
+    assert index.query("nearby", "beach") is index.query("nearby", "beach")
+    assert get_filter_index(list(catalog)) is not index
+
+
+def test_planner_values_are_normalized():
+    assert get_filtered_destinations(" Domestic ", "Beach", "BUDGET") == get_filtered_destinations("domestic", "beach", "budget")
+    assert get_filtered_destinations("", "", "") == get_filtered_destinations()
@@ -0,0 +1,120 @@
+"""Tests for the streamed itinerary: day parser, repair and fallback."""
+
+import asyncio
+import json
+
+from services import groq_client
+from services.groq_client import DayPlanStreamParser
+
+COST_BREAKDOWN = {"accommodation": 4000, "food": 2000, "activities": 1500, "transport": 500}
+
+
+def day(number, cost=1000):
+    return {
+        "day": number, "title": f"Day {number} in Goa", "activities": ["Beach walk", "Fort visit"],
+        "meals": ["Thali"], "accommodation": "Beach hut", "estimated_cost": cost, "tips": "Start early"
+    }
+
+
+def itinerary_text(days, **extra):
+    return json.dumps({"day_plans": [day(n) for n in days], "travel_tips": ["Carry cash"],
+                       "cost_breakdown": COST_BREAKDOWN, **extra})
+
+
+def run_stream(days=3, budget=9000):
+    async def collect():
+        return [event async for event in groq_client.stream_itinerary("Goa", days, budget, "Couples", "beach", 2)]
+    events = asyncio.run(collect())
+    assert events[-1]["event"] == "complete"
+    return [event["data"]["day"] for event in events[:-1]], events[-1]["data"]
+
+
+def test_parser_reads_days_split_across_deltas():
+    parser = DayPlanStreamParser()
+    text = itinerary_text([1, 2])
+    days = [plan["day"] for i in range(0, len(text), 5) for plan in parser.feed(text[i:i + 5])]
+    assert days == [1, 2]
+
+
+def test_parser_accepts_trailing_commas_in_a_day():
+    parser = DayPlanStreamParser()
+    text = itinerary_text([1, 2]).replace('"Start early"}', '"Start early",}', 1).replace('"Fort visit"]', '"Fort visit",]')
+    assert [plan["day"] for plan in parser.feed(text)] == [1, 2]
+
+
+def test_parser_compact_keys_and_nested_braces():
+    parser = DayPlanStreamParser()
+    text = 'Plan {draft}: {"dp": [{"d": 1, "t": "Day {1} \\"fun\\"", "a": ["x"], "c": 1}]}'
+    assert parser.feed(text) == [{"d": 1, "t": 'Day {1} "fun"', "a": ["x"], "c": 1}]
+
+
+def test_trailing_comma_stream_sends_every_day(fake_groq):
+    fake_groq.responder = lambda kwargs: itinerary_text([1, 2, 3]).replace('"Start early"}', '"Start early",}', 1)
+    sent, complete = run_stream()
+    assert sent == [1, 2, 3]
+    assert [plan["day"] for plan in complete["day_plans"]] == [1, 2, 3]
+    assert complete["cost_breakdown"] == COST_BREAKDOWN
+
+
+def test_repeated_and_out_of_range_days_are_not_sent(fake_groq):
+    text = json.dumps({"day_plans": [day(1), day(1), day(7), day(2), day(3)], "cost_breakdown": COST_BREAKDOWN})
+    fake_groq.responder = lambda kwargs: text
+    sent, complete = run_stream()
+    assert sent == [1, 2, 3]
+    assert [plan["day"] for plan in complete["day_plans"]] == [1, 2, 3]
+    # Repaired locally: no second LLM call
+    assert len(fake_groq.calls) == 1
+
+
+def test_broken_off_stream_is_repaired(fake_groq):
+    text = itinerary_text([1, 2, 3])
+    cut = text.index('{"day": 2')
+
+    def responder(kwargs):
+        if kwargs.get("stream"):
+            return [text[:cut + 20], ConnectionError("upstream reset")]
+        return json.dumps({"dp": [day(2), day(3)], "cb": COST_BREAKDOWN})
+
+    fake_groq.responder = responder
+    sent, complete = run_stream()
+    assert sent == [1, 2, 3]
+    assert complete["cost_breakdown"] == COST_BREAKDOWN
+    assert "ONLY days 2, 3" in fake_groq.calls[1]["messages"][1]["content"]
+    assert groq_client._breaker.stats()["window_error_rate"] == 0.5
+
+
+def test_unrepairable_stream_falls_back_for_missing_days_only(fake_groq):
+    text = itinerary_text([1, 2, 3])
+    cut = text.index('{"day": 2')
+
+    def responder(kwargs):
+        if kwargs.get("stream"):
+            return [text[:cut], ConnectionError("upstream reset")]
+        raise ConnectionError("still down")
+
+    fake_groq.responder = responder
+    sent, complete = run_stream(budget=9000)
+    assert sent == [1, 2, 3]
+    assert complete["day_plans"][0]["title"] == "Day 1 in Goa"
+    assert complete["day_plans"][1]["title"] != "Day 2 in Goa"
+    # 1000 (LLM day) + 2 x 3000 (fallback days), split like the fallback
+    assert complete["total_cost"] == sum(complete["cost_breakdown"].values()) == 7000
+
+
+def test_breaker_counts_a_stream_only_when_it_finishes(fake_groq):
+    fake_groq.responder = lambda kwargs: [itinerary_text([1])[:40], ConnectionError("reset")]
+    run_stream(days=1)
+    stats = groq_client._breaker.stats()
+    assert stats["window_calls"] >= 1 and stats["window_error_rate"] > 0
+
+
+def test_chunk_numbered_from_day_one_is_shifted_before_repair(fake_groq):
+    # A days 5-8 chunk that restarted at day 1 and lost its last day
+    fake_groq.responder = lambda kwargs: json.dumps({"dp": [day(8)], "cb": COST_BREAKDOWN})
+    validated = asyncio.run(groq_client._validate_itinerary_output(
+        groq_client.get_groq_client(), "chunk prompt", itinerary_text([1, 2, 3]), [5, 6, 7, 8], "Goa days 5-8"
+    ))
+    assert [plan.day for plan in validated.day_plans] == [5, 6, 7, 8]
+    assert [plan.title for plan in validated.day_plans[:3]] == ["Day 1 in Goa", "Day 2 in Goa", "Day 3 in Goa"]
+    assert len(fake_groq.calls) == 1
+    assert "ONLY days 8" in fake_groq.calls[0]["messages"][1]["content"]
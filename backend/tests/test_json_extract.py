@@ -0,0 +1,89 @@
+"""Tests for services.json_extract."""
+
+import json
+
+import pytest
+
+from services.json_extract import extract_json, load_json
+
+
+def parse(content):
+    text, truncated = extract_json(content)
+    return json.loads(text), truncated
+
+
+def test_plain_object():
+    assert parse('{"a": 1}') == ({"a": 1}, False)
+
+
+def test_fenced_block_after_prose():
+    content = 'Sure! Here you go {as asked}:\n```json\n{"a": [1, 2]}\n```\nEnjoy {it}!'
+    assert parse(content) == ({"a": [1, 2]}, False)
+
+
+def test_unterminated_fence():
+    assert parse('```json\n{"a": 1}') == ({"a": 1}, False)
+
+
+def test_braces_and_quotes_in_surrounding_prose():
+    content = "Don't {worry}: " + '{"title": "Day {1}", "tips": "it\'s \\"fine\\""}' + " that's {all}"
+    assert parse(content) == ({"title": "Day {1}", "tips": "it's \"fine\""}, False)
+
+
+def test_longest_value_wins():
+    content = 'Options {a} then {"day_plans": [{"day": 1}, {"day": 2}]}'
+    assert parse(content) == ({"day_plans": [{"day": 1}, {"day": 2}]}, False)
+
+
+def test_top_level_array():
+    assert parse('Here: [{"a": 1}, {"a": 2}] done') == ([{"a": 1}, {"a": 2}], False)
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}),
+    ('{"a": [1, 2 ,\n ] }', {"a": [1, 2]}),
+    ('x {"a": {"b": 1,},}', {"a": {"b": 1}}),
+])
+def test_trailing_commas_removed(content, expected):
+    assert parse(content) == (expected, False)
+
+
+def test_trailing_comma_text_inside_strings_kept():
+    content = 'Plan {draft}: {"tips": "cash, ] and cards, }", "n": 1}'
+    assert parse(content) == ({"tips": "cash, ] and cards, }", "n": 1}, False)
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"a": [1, 2', {"a": [1, 2]}),
+    ('{"a": {"b": "unfinished str', {"a": {"b": "unfinished str"}}),
+    ('{"a": 1, "b":', {"a": 1, "b": None}),
+    ('{"a": 1, "dangling', {"a": 1}),
+    ('{"a": [{"day": 1}, {"day": 2},', {"a": [{"day": 1}, {"day": 2}]}),
+])
+def test_truncated_values_closed(content, expected):
+    assert parse(content) == (expected, True)
+
+
+def test_no_json_returns_stripped_content():
+    assert extract_json("  no json here  ") == ("no json here", False)
+
+
+def test_trailing_commas_next_to_escaped_quotes():
+    content = '{"tips": "say \\"hi,]\\"", "path": "C:\\\\", "n": [1, 2,],}'
+    assert parse(content) == ({"tips": 'say "hi,]"', "path": "C:\\", "n": [1, 2]}, False)
+
+
+@pytest.mark.parametrize("content", [
+    '{"a": 1}',
+    'Sure:\n```json\n{"a": [1, 2,],}\n```',
+    'Plan {draft}: {"tips": "cash, ]", "n": 1}',
+    '{"a": [{"day": 1}, {"day": 2},',
+    '[1, 2] and then [3, 4, 5]',
+])
+def test_load_json_matches_extract_then_parse(content):
+    assert load_json(content) == parse(content)
+
+
+def test_load_json_raises_when_nothing_parses():
+    with pytest.raises(json.JSONDecodeError):
+        load_json("no json here")
@@ -0,0 +1,142 @@
+"""Tests for services.llm_scheduler priority and shedding."""
+
+import asyncio
+
+import pytest
+
+from core.exceptions import AIOverloadedError
+from services.llm_scheduler import CallType, LLMScheduler
+
+
+def make_scheduler(max_concurrency=1, rpm=0, tpm=0, deadlines=None):
+    return LLMScheduler(
+        max_concurrency=max_concurrency,
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        deadlines=deadlines or {}
+    )
+
+
+async def hold(scheduler, call_type, order, release, tokens=10):
+    async with scheduler.slot(call_type, tokens):
+        order.append(call_type)
+        await release.wait()
+
+
+def test_waiters_are_granted_by_priority():
+    async def run():
+        scheduler = make_scheduler()
+        order = []
+        release = asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, CallType.SUGGESTION, order, release))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(hold(scheduler, call_type, order, release))
+            for call_type in (CallType.SUGGESTION, CallType.EXPLANATION, CallType.ITINERARY, CallType.CHAT)
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"]["itinerary"] == 1
+        release.set()
+        await asyncio.gather(first, *waiting)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == [
+        CallType.SUGGESTION, CallType.ITINERARY, CallType.CHAT, CallType.EXPLANATION, CallType.SUGGESTION
+    ]
+    assert stats["active"] == 0
+    assert stats["granted"]["suggestion"] == 2
+
+
+def test_call_past_its_deadline_is_shed():
+    async def run():
+        scheduler = make_scheduler(deadlines={CallType.SUGGESTION: 0.05})
+        order = []
+        release = asyncio.Event()
+        busy = asyncio.create_task(hold(scheduler, CallType.ITINERARY, order, release))
+        await asyncio.sleep(0)
+        with pytest.raises(AIOverloadedError):
+            async with scheduler.slot(CallType.SUGGESTION, 10):
+                pass
+        release.set()
+        await busy
+        # The shed waiter must not hold or block capacity
+        async with scheduler.slot(CallType.CHAT, 10):
+            pass
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert stats["shed"]["suggestion"] == 1
+    assert stats["granted"] == {"itinerary": 1, "chat": 1, "explanation": 0, "suggestion": 0}
+    assert stats["active"] == 0
+
+
+def test_token_budget_delays_calls_and_refunds_unused():
+    async def run():
+        loop = asyncio.get_running_loop()
+        # 600 TPM refills 10 tokens a second
+        scheduler = make_scheduler(max_concurrency=4, tpm=600, deadlines={CallType.CHAT: 0.2})
+        async with scheduler.slot(CallType.CHAT, 600) as ticket:
+            ticket.used_tokens = 100
+        start = loop.time()
+        async with scheduler.slot(CallType.CHAT, 500):
+            pass
+        refunded_wait = loop.time() - start
+        with pytest.raises(AIOverloadedError):
+            async with scheduler.slot(CallType.CHAT, 100):
+                pass
+        return refunded_wait
+
+    assert asyncio.run(run()) < 0.1
+
+
+def test_cancelled_waiter_releases_nothing():
+    async def run():
+        scheduler = make_scheduler()
+        order = []
+        release = asyncio.Event()
+        busy = asyncio.create_task(hold(scheduler, CallType.ITINERARY, order, release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(scheduler, CallType.CHAT, order, release))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await busy
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == [CallType.ITINERARY]
+    assert stats["active"] == 0
+    assert stats["queued"]["chat"] == 0
+
+
+def test_smaller_call_goes_ahead_of_a_head_waiting_for_tokens():
+    async def run():
+        # 600 TPM refills 10 tokens a second, far slower than the test
+        scheduler = make_scheduler(max_concurrency=4, tpm=600)
+        async with scheduler.slot(CallType.CHAT, 580):
+            pass
+        head = asyncio.create_task(scheduler._acquire(CallType.ITINERARY, 30))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"]["itinerary"] == 1
+
+        # Lower priority but affordable: granted while the itinerary keeps waiting
+        async with scheduler.slot(CallType.SUGGESTION, 15) as ticket:
+            ticket.used_tokens = 0
+        assert not head.done()
+
+        # The bucket could afford 20 more, but that would pass the head by more than its own 30 tokens
+        blocked = asyncio.create_task(scheduler._acquire(CallType.SUGGESTION, 20))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        stats = scheduler.stats()
+        head.cancel()
+        blocked.cancel()
+        await asyncio.gather(head, blocked, return_exceptions=True)
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["granted"] == {"itinerary": 0, "chat": 1, "explanation": 0, "suggestion": 1}
+    assert stats["queued"] == {"itinerary": 1, "chat": 0, "explanation": 0, "suggestion": 1}
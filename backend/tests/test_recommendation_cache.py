@@ -0,0 +1,121 @@
+"""Tests for services.recommendation_cache."""
+
+import asyncio
+
+from services.recommendation_cache import RecommendationCache
+
+
+def make_cache(budget_step=0.15):
+    return RecommendationCache(max_entries=16, ttl_seconds=60, budget_step=budget_step)
+
+
+def test_key_normalizes_preferences():
+    cache = make_cache()
+    assert cache.key("  Couples ", "Beach", 30000, 5) == cache.key("couples", "  beach", 30000, 5)
+    assert cache.key("Solo  Female", "beach", 30000, 5) == cache.key("solo female", "beach", 30000, 5)
+
+
+def test_key_separates_trip_lengths():
+    cache = make_cache()
+    assert cache.key("couples", "beach", 30000, 5) != cache.key("couples", "beach", 30000, 6)
+
+
+def test_key_bands_close_budgets_together():
+    cache = make_cache()
+    assert cache.key("couples", "beach", 30000, 5) == cache.key("couples", "beach", 30500, 5)
+    assert cache.key("couples", "beach", 30000, 5) != cache.key("couples", "beach", 45000, 5)
+    assert cache.key("couples", "beach", 0, 5) == cache.key("couples", "beach", 1, 5)
+
+
+def test_key_without_banding_uses_exact_budget():
+    cache = make_cache(budget_step=0)
+    assert cache.key("couples", "beach", 30000, 5) != cache.key("couples", "beach", 30001, 5)
+
+
+def test_only_cacheable_results_are_stored():
+    cache = make_cache()
+    calls = []
+
+    async def compute(cacheable):
+        calls.append(cacheable)
+        return [{"id": "goa"}], ["Sunny"], cacheable
+
+    async def run():
+        key = cache.key("couples", "beach", 30000, 5)
+        await cache.get_or_compute(key, lambda: compute(False))
+        await cache.get_or_compute(key, lambda: compute(True))
+        return await cache.get_or_compute(key, lambda: compute(True))
+
+    assert asyncio.run(run()) == ([{"id": "goa"}], ["Sunny"])
+    assert calls == [False, True]
+
+
+def test_result_computed_across_invalidation_is_not_stored():
+    cache = make_cache()
+    key = cache.key("couples", "beach", 30000, 5)
+
+    async def compute():
+        cache.invalidate()
+        return [{"id": "goa"}], ["Sunny"], True
+
+    async def run():
+        await cache.get_or_compute(key, compute)
+        return cache._cache.get(key)
+
+    assert asyncio.run(run()) is None
+    assert cache.invalidations == 1
+
+
+def test_cached_explanations_quote_each_requests_budget(fake_groq):
+    import json
+    import re
+
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from services.recommendation_cache import get_recommendation_cache
+
+    def responder(kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        ids = re.findall(r"^- ([^:]+):", prompt, re.MULTILINE)
+        return json.dumps({dest_id: "Fits your [BUDGET] budget." for dest_id in ids})
+
+    fake_groq.responder = responder
+    get_recommendation_cache().invalidate()
+    query = {"days": 5, "travel_type": "couples", "interest": "beach"}
+    with TestClient(app) as client:
+        first = client.post("/api/v1/recommendations", json={**query, "budget": 30000}).json()
+        second = client.post("/api/v1/recommendations", json={**query, "budget": 30500}).json()
+
+    # Same band: one completion, each response quoting its own budget
+    assert len(fake_groq.calls) == 1
+    assert "30,000" not in fake_groq.calls[0]["messages"][-1]["content"]
+    assert {dest["reason"] for dest in first["destinations"]} == {"Fits your ₹30,000 budget."}
+    assert {dest["reason"] for dest in second["destinations"]} == {"Fits your ₹30,500 budget."}
+
+
+def test_batch_explains_a_query_once_when_the_cached_ranking_differs(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from routers import recommendations
+    from services.recommendation_cache import get_recommendation_cache
+
+    calls = []
+
+    async def explain(top, query):
+        calls.append([dest["id"] for dest in top])
+        # Stored under ids the query's own ranking doesn't have
+        return [{**dest, "id": f"{dest['id']}-old"} for dest in top], [f"Why {dest['name']}" for dest in top], True
+
+    monkeypatch.setattr(recommendations, "_explain", explain)
+    get_recommendation_cache().invalidate()
+    with TestClient(app) as client:
+        response = client.post("/api/v1/recommendations/batch", json={
+            "requests": [{"budget": 30000, "days": 5, "travel_type": "couples", "interest": "beach"}]
+        }).json()
+
+    assert len(calls) == 1
+    destinations = response["results"][0]["destinations"]
+    assert [dest["id"] for dest in destinations] == calls[0]
+    assert [dest["reason"] for dest in destinations] == [f"Why {dest['name']}" for dest in destinations]
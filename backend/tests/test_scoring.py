@@ -0,0 +1,73 @@
+"""Tests for services.scoring: the vectorized scorer must rank exactly like the original loop."""
+
+import json
+import os
+import random
+
+import pytest
+
+from benchmarks.bench_scoring import legacy_score_destinations, make_catalog, make_queries
+from services.scoring import get_scoring_index, score_destinations, score_destinations_batch
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "destinations.json")
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    rng = random.Random(11)
+    destinations = make_catalog(300, rng)
+    # Mixed-case labels, missing fields and duplicate scores
+    destinations[0]["tags"] = ["Beach", "NIGHTLIFE"]
+    destinations[1].pop("best_for")
+    destinations[2].pop("base_cost_per_day")
+    destinations.extend({**dest, "id": f"copy-{dest['id']}"} for dest in destinations[:20])
+    return destinations
+
+
+@pytest.fixture(scope="module")
+def queries():
+    return make_queries(120, random.Random(12)) + [
+        {"budget": 1, "days": 30, "travel_type": "Party", "interest": "BEACH"},
+        {"budget": 10 ** 7, "days": 1, "travel_type": "", "interest": ""},
+    ]
+
+
+def ranking(results):
+    return [(dest["id"], dest["score"]) for dest in results]
+
+
+def test_matches_the_loop_scorer(catalog, queries):
+    for query in queries:
+        assert ranking(score_destinations(catalog, **query)) == ranking(legacy_score_destinations(catalog, **query))
+
+
+def test_top_k_is_a_prefix_of_the_full_ranking(catalog, queries):
+    for query in queries[:30]:
+        full = ranking(score_destinations(catalog, **query))
+        for limit in (0, 1, 5, 40):
+            assert ranking(score_destinations(catalog, **query, limit=limit)) == full[:limit]
+
+
+def test_batch_matches_single_queries(catalog, queries):
+    batch = score_destinations_batch(catalog, queries, limit=5)
+    assert [ranking(results) for results in batch] == [
+        ranking(score_destinations(catalog, **query, limit=5)) for query in queries
+    ]
+
+
+def test_real_catalog_matches_the_loop_scorer(queries):
+    with open(DATA_PATH, encoding="utf-8") as f:
+        destinations = json.load(f)
+    for query in queries:
+        assert ranking(score_destinations(destinations, **query)) == ranking(legacy_score_destinations(destinations, **query))
+
+
+def test_index_is_rebuilt_for_a_new_catalog(catalog):
+    index = get_scoring_index(catalog)
+    assert get_scoring_index(catalog) is index
+    assert get_scoring_index(list(catalog)) is not index
+
+
+def test_empty_inputs():
+    assert score_destinations([], budget=1000, days=1, travel_type="party", interest="beach") == []
+    assert score_destinations_batch([], [{"budget": 1, "days": 1, "travel_type": "", "interest": ""}]) == [[]]
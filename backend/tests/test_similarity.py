@@ -0,0 +1,93 @@
+"""Tests for services.similarity: stored and cost-filtered neighbours match a brute-force ranking."""
+
+import json
+import math
+import random
+
+import pytest
+
+from benchmarks.bench_similarity import make_catalog
+from services.similarity import FEATURE_WEIGHTS, SimilarityIndex
+
+
+def brute_force(destinations, destination_id, limit, cost_weight=0.2, max_cost_per_day=None):
+    """Dense reference: score every pair with plain Python, best first, ties by catalog position."""
+    rows = [{(group, str(label).lower()) for group in FEATURE_WEIGHTS for label in dest.get(group, [])} for dest in destinations]
+    costs = [max(1, dest.get("base_cost_per_day", 3000)) for dest in destinations]
+    frequency = {}
+    for features in rows:
+        for feature in features:
+            frequency[feature] = frequency.get(feature, 0) + 1
+    weight = {
+        feature: FEATURE_WEIGHTS[feature[0]] * (math.log((1 + len(rows)) / (1 + df)) + 1)
+        for feature, df in frequency.items()
+    }
+    norms = [math.sqrt(sum(weight[f] ** 2 for f in features)) or 1.0 for features in rows]
+
+    row = next(i for i, dest in enumerate(destinations) if dest["id"] == destination_id)
+    scored = []
+    for i, features in enumerate(rows):
+        if i == row or (max_cost_per_day is not None and costs[i] > max_cost_per_day):
+            continue
+        cosine = sum(weight[f] ** 2 for f in features & rows[row]) / (norms[i] * norms[row])
+        cost = math.exp(-abs(math.log(costs[i]) - math.log(costs[row])))
+        scored.append(((1 - cost_weight) * cosine + cost_weight * cost, i))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [(destinations[i]["id"], round(score, 3)) for score, i in scored[:limit]]
+
+
+def ranking(results):
+    return [(dest["id"], dest["similarity"]) for dest in results]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return make_catalog(150, random.Random(5))
+
+
+@pytest.mark.parametrize("precompute_limit", [0, 2000])
+def test_neighbours_match_brute_force(catalog, precompute_limit):
+    index = SimilarityIndex(catalog, neighbours=10, precompute_limit=precompute_limit)
+    for dest in catalog[:40]:
+        assert ranking(index.similar(dest["id"], limit=10)) == brute_force(catalog, dest["id"], 10)
+
+
+def test_cost_filtered_lookups_match_brute_force(catalog):
+    # A short stored list forces the whole-catalog path for tight caps
+    index = SimilarityIndex(catalog, neighbours=5)
+    for dest in catalog[:40]:
+        for cap in (2000, 4000, 8000, 20000):
+            expected = brute_force(catalog, dest["id"], 5, max_cost_per_day=cap)
+            assert ranking(index.similar(dest["id"], limit=5, max_cost_per_day=cap)) == expected
+
+
+def test_ties_go_to_the_earlier_destination():
+    base = {"tags": ["beach"], "activities": ["surfing"], "best_for": ["friends"], "base_cost_per_day": 3000}
+    catalog = [{"id": "a", **base}] + [{"id": f"twin-{i}", **base} for i in range(6)]
+    index = SimilarityIndex(catalog, neighbours=3)
+    assert [dest["id"] for dest in index.similar("a", limit=3)] == ["twin-0", "twin-1", "twin-2"]
+    assert [dest["id"] for dest in index.similar("a", limit=3, max_cost_per_day=3000)] == ["twin-0", "twin-1", "twin-2"]
+
+
+def test_small_catalogs_and_unknown_ids():
+    assert SimilarityIndex([{"id": "only", "tags": ["beach"]}]).similar("only") == []
+    pair = SimilarityIndex([{"id": "a", "tags": ["beach"]}, {"id": "b"}])
+    assert [dest["id"] for dest in pair.similar("a", limit=5)] == ["b"]
+    assert pair.similar("a", max_cost_per_day=100) == []
+    assert pair.similar("missing") is None
+    assert SimilarityIndex([]).similar("a") is None
+
+
+def test_in_memory_snapshot_is_warmed_before_publish(tmp_path, monkeypatch):
+    from services import destination_cache
+
+    cache = destination_cache.get_destination_cache()
+    path = tmp_path / "destinations.json"
+    path.write_text(json.dumps(make_catalog(20, random.Random(1))), encoding="utf-8")
+    monkeypatch.setattr(destination_cache, "DATA_PATH", str(path))
+
+    # Built off to the side, not published
+    snapshot = cache._build()
+    assert cache.snapshot is not snapshot
+    assert snapshot._similarity is not None
+    assert snapshot.similarity.stats()["computed"] == 20
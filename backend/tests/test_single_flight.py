@@ -0,0 +1,86 @@
+"""Tests for services.single_flight."""
+
+import asyncio
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"answer": 42}
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(run())
+    assert len(calls) == 1
+    assert [shared for _, shared in results] == [False, True, True, True, True]
+    assert all(result is results[0][0] for result, _ in results)
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+def test_different_keys_and_later_calls_run_separately():
+    async def run():
+        flight = SingleFlight()
+        counter = iter(range(10))
+
+        async def fetch():
+            await asyncio.sleep(0)
+            return next(counter)
+
+        together = await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+        later = await flight.do("a", fetch)
+        return together, later
+
+    together, later = asyncio.run(run())
+    assert sorted(result for result, _ in together) == [0, 1]
+    assert later == (2, False)
+
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    async def run():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream")
+
+        outcomes = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        async def succeed():
+            return "ok"
+
+        return outcomes, await flight.do("key", succeed)
+
+    outcomes, retry = asyncio.run(run())
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert retry == ("ok", False)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    async def run():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == ("done", True)
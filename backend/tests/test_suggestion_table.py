@@ -0,0 +1,104 @@
+"""Tests for services.suggestion_table."""
+
+import asyncio
+import json
+
+from services.suggestion_table import SuggestionTable, all_suggestion_keys, suggestion_key
+
+KEY = ("adventure", "beach", None, None, None)
+
+
+def make_table(tmp_path, seed, refresh=None, ttl_seconds=3600):
+    async def no_refresh(key):
+        return None
+
+    return SuggestionTable(
+        path=str(tmp_path / "table.json"),
+        ttl_seconds=ttl_seconds,
+        seed=seed,
+        refresh=refresh or no_refresh,
+        refresh_interval=0
+    )
+
+
+def test_suggestion_key_normalizes_and_rejects_unknown_values():
+    assert suggestion_key("Adventure ", " beach") == KEY
+    assert suggestion_key("adventure", "volcano") is None
+    assert len(all_suggestion_keys()) == 5 * 5 * 4 * 4 * 4 - 1
+
+
+def test_load_seeds_every_key(tmp_path):
+    table = make_table(tmp_path, seed=lambda key: [f"seed {key[0]}"])
+    table.load()
+    assert table.get(KEY) == ["seed adventure"]
+    assert table.stats()["size"] == len(all_suggestion_keys())
+    assert table.stats()["generated"] == 0
+
+
+def test_reseed_rebuilds_placeholders_but_keeps_generated_entries(tmp_path):
+    catalog = {"name": "Goa"}
+    table = make_table(tmp_path, seed=lambda key: [f"Try {catalog['name']}"])
+    other = ("spiritual", None, None, None, None)
+    (tmp_path / "table.json").write_text(json.dumps({
+        "version": 1,
+        "entries": [{"key": list(other), "suggestions": ["Generated"], "generated_at": 1.0}]
+    }))
+    table.load()
+    assert table.get(KEY) == ["Try Goa"]
+
+    catalog["name"] = "Kerala"
+    table.reseed()
+    assert table.get(KEY) == ["Try Kerala"]
+    assert table.get(other) == ["Generated"]
+
+
+def test_catalog_reload_reseeds_the_planner_table(tmp_path, monkeypatch):
+    from services import destination_cache, groq_client
+
+    with open(destination_cache.DATA_PATH, encoding="utf-8") as f:
+        catalog = json.load(f)
+    path = tmp_path / "destinations.json"
+    path.write_text(json.dumps(catalog))
+    cache = destination_cache.get_destination_cache()
+    table = groq_client._suggestion_table
+    monkeypatch.setattr(destination_cache, "DATA_PATH", str(path))
+    monkeypatch.setattr(table, "path", str(tmp_path / "table.json"))
+    monkeypatch.setattr(table, "_entries", {})
+    try:
+        cache.reload()
+        table.load()
+        assert not any("Renamed" in text for text in table.get(KEY))
+
+        for dest in catalog:
+            dest["name"] = f"Renamed {dest['name']}"
+        path.write_text(json.dumps(catalog))
+        cache.reload()
+        assert any("Renamed" in text for text in table.get(KEY))
+    finally:
+        monkeypatch.undo()
+        cache.reload()
+
+
+def test_stale_entries_are_served_then_refreshed_and_persisted(tmp_path):
+    refreshed = []
+
+    async def refresh(key):
+        refreshed.append(key)
+        return ["Generated"]
+
+    async def run():
+        table = make_table(tmp_path, seed=lambda key: ["seed"], refresh=refresh)
+        table.load()
+        table.start()
+        first = table.get(KEY)
+        for _ in range(20):
+            await asyncio.sleep(0)
+        second = table.get(KEY)
+        await table.stop()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert (first, second) == (["seed"], ["Generated"])
+    assert refreshed == [KEY]
+    saved = json.loads((tmp_path / "table.json").read_text())
+    assert saved["entries"][0]["key"] == list(KEY)
@@ -10,7 +10,9 @@ export function TravelChatBot() {
     ])
     const [input, setInput] = useState('')
     const [loading, setLoading] = useState(false)
+    const [streaming, setStreaming] = useState(false)
     const messagesEndRef = useRef(null)
+    const sessionIdRef = useRef(null)
 
     const scrollToBottom = () => {
         messagesEndRef.current?.scrollIntoView({ behavior: "smooth" })
@@ -29,9 +31,18 @@ export function TravelChatBot() {
         setLoading(true)
 
         try {
-            // Use backend API instead of direct Groq call
-            const data = await tripApi.chat(userMsg)
-            setMessages(prev => [...prev, { role: 'assistant', content: data.response }])
+            // Use backend API instead of direct Groq call; the reply renders as it streams
+            let streamed = ''
+            const data = await tripApi.chatStream(userMsg, sessionIdRef.current, (text) => {
+                const first = streamed === ''
+                streamed += text
+                setStreaming(true)
+                setMessages(prev => [
+                    ...(first ? prev : prev.slice(0, -1)),
+                    { role: 'assistant', content: streamed }
+                ])
+            })
+            sessionIdRef.current = data.session_id
         } catch (error) {
             console.error('Chat error:', error)
             // Fallback response when backend is unavailable
@@ -45,6 +56,7 @@ export function TravelChatBot() {
             setMessages(prev => [...prev, { role: 'assistant', content: randomResponse }])
         } finally {
             setLoading(false)
+            setStreaming(false)
         }
     }
 
@@ -107,7 +119,7 @@ export function TravelChatBot() {
                                     </div>
                                 </div>
                             ))}
-                            {loading && (
+                            {loading && !streaming && (
                                 <div className="flex justify-start">
                                     <div className="bg-white/5 px-4 py-3 rounded-2xl rounded-tl-sm flex gap-1">
                                         <span className="w-2 h-2 rounded-full bg-white/40 animate-bounce" style={{ animationDelay: '0s' }} />
@@ -37,6 +37,56 @@ api.interceptors.response.use(
     }
 )
 
+/**
+ * POST JSON and read the Server-Sent Events response
+ * @param {string} path - API path under /api
+ * @param {Object} body - Request body
+ * @param {Function} onEvent - Called with (event, data) for each event; return a value to stop reading
+ * @param {AbortSignal} [signal] - Aborting closes the connection (and the upstream request)
+ */
+async function postEventStream(path, body, onEvent, signal) {
+    const { data: { session } } = await supabase.auth.getSession()
+    const response = await fetch(`${API_URL}/api${path}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            ...(session?.access_token && { Authorization: `Bearer ${session.access_token}` })
+        },
+        body: JSON.stringify(body),
+        signal
+    })
+    if (!response.ok || !response.body) {
+        throw new Error(`Stream ${path} failed: ${response.status}`)
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+
+        let boundary
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary)
+            buffer = buffer.slice(boundary + 2)
+
+            const event = rawEvent.match(/^event: (.*)$/m)?.[1]
+            const data = rawEvent.match(/^data: (.*)$/m)?.[1]
+            if (!event || !data) continue
+
+            const result = onEvent(event, JSON.parse(data))
+            if (result !== undefined) {
+                reader.cancel()
+                return result
+            }
+        }
+    }
+    throw new Error(`Stream ${path} ended before completion`)
+}
+
 export const tripApi = {
     /**
      * Get AI-powered destination recommendations
@@ -58,6 +108,20 @@ export const tripApi = {
         return response.data
     },
 
+    /**
+     * Stream a day-wise itinerary as Server-Sent Events
+     * @param {Object} params - { destination, days, budget, travel_type, interest, travelers }
+     * @param {Function} onDay - Called with each day plan as soon as it is generated
+     * @returns {Promise<Object>} - Complete itinerary (same shape as generateItinerary)
+     */
+    streamItinerary: async (params, onDay = () => {}) => {
+        return postEventStream('/itinerary/generate/stream', params, (event, data) => {
+            if (event === 'day') onDay(data)
+            else if (event === 'complete') return data
+            else if (event === 'error') throw new Error(data.detail)
+        })
+    },
+
     /**
      * Save an itinerary to the database
      * @param {Object} itinerary - Full itinerary object
@@ -94,13 +158,30 @@ export const tripApi = {
     /**
      * Chat with TripIT AI assistant
      * @param {string} message - User message
-     * @returns {Promise<{ response: string }>}
+     * @param {string} [sessionId] - Session id from a previous reply
+     * @returns {Promise<{ response: string, session_id: string }>}
      */
-    chat: async (message) => {
-        const response = await api.post('/chat', { message })
+    chat: async (message, sessionId) => {
+        const response = await api.post('/chat', { message, session_id: sessionId })
         return response.data
     },
 
+    /**
+     * Chat with TripIT AI assistant, streaming the reply
+     * @param {string} message - User message
+     * @param {string} [sessionId] - Session id from a previous reply
+     * @param {Function} onDelta - Called with each chunk of reply text
+     * @param {AbortSignal} [signal] - Abort to stop generation
+     * @returns {Promise<{ session_id: string }>}
+     */
+    chatStream: async (message, sessionId, onDelta = () => {}, signal) => {
+        return postEventStream('/chat/stream', { message, session_id: sessionId }, (event, data) => {
+            if (event === 'delta') onDelta(data.text)
+            else if (event === 'done') return data
+            else if (event === 'error') throw new Error(data.detail)
+        }, signal)
+    },
+
     /**
      * Get AI-powered contextual suggestions based on current selections
      * @param {Object} preferences - Current user preferences